@@ -0,0 +1,3483 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MatterID - Manager v2.5 core
+Firestore data layer shared by the desktop app and the headless command line.
+Imports no Qt widgets: run `python matterid_core.py --help` for the commands.
+"""
+
+import sys
+import csv
+import json
+import threading
+import urllib.request
+import urllib.error
+import ssl
+import certifi
+import re
+import logging
+import logging.handlers
+import atexit
+import traceback
+import os
+import time
+import gzip
+import base64
+import uuid
+import hashlib
+import importlib
+import functools
+import bisect
+import platform
+import enum
+import queue
+import socket
+import hmac
+import secrets
+import ipaddress
+import itertools
+import http.client
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, asdict
+from collections import deque, namedtuple, OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import random
+from array import array
+
+# Optional: vectorises columnar group-bys and filters
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Logging Setup
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_RATE_PER_SECOND = 5  # sustained records per call site once the burst is spent
+LOG_RATE_BURST = 20
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per logging call site, so one chatty loop cannot flood the log.
+    
+    Records below ERROR over budget are dropped and counted; the next record let
+    through from that line says how many were suppressed. Inside batch(name), also
+    usable as a decorator, records below WARNING on that thread are only counted
+    and reported as one summary line when the batch ends.
+    """
+
+    def __init__(self, rate=LOG_RATE_PER_SECOND, burst=LOG_RATE_BURST):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._buckets = {}  # (pathname, lineno) -> [tokens, last refill, suppressed]
+
+    def filter(self, record):
+        batch = getattr(self._local, "batch", None)
+        if batch is not None and record.levelno < logging.WARNING:
+            site = batch.setdefault((record.pathname, record.lineno), [0, record.getMessage()])
+            site[0] += 1
+            return False
+        if record.levelno >= logging.ERROR:
+            return True
+        
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.setdefault((record.pathname, record.lineno), [self.burst, now, 0])
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.msg = f"{record.getMessage()} (+{suppressed} similar messages suppressed)"
+            record.args = ()
+        return True
+
+    def suppressed(self):
+        with self._lock:
+            return sum(bucket[2] for bucket in self._buckets.values())
+
+    def report_suppressed(self):
+        """Log how many records are still held back, e.g. before shutdown"""
+        with self._lock:
+            pending = [bucket[2] for bucket in self._buckets.values() if bucket[2]]
+            for bucket in self._buckets.values():
+                bucket[2] = 0
+        if pending:
+            logging.warning(f"Rate limiting suppressed {sum(pending)} log records from {len(pending)} call site(s)")
+
+    @contextmanager
+    def batch(self, name):
+        previous = getattr(self._local, "batch", None)
+        sites = self._local.batch = {}
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._local.batch = previous
+            if sites:
+                total = sum(count for count, _ in sites.values())
+                busiest = sorted(sites.values(), key=lambda site: site[0], reverse=True)[:3]
+                details = "; ".join(f"{count}× {message[:60]}" for count, message in busiest)
+                logging.info(f"{name}: {total} log records summarised after {time.perf_counter() - start:.1f} s "
+                             f"({details})")
+
+LOG_RATE_LIMITER = RateLimitFilter()
+
+# Handlers run on a listener thread so slow consoles and disks never stall the caller
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+_log_queue = queue.SimpleQueue()
+LOG_LISTENER = logging.handlers.QueueListener(_log_queue, _console_handler, respect_handler_level=True)
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))  # the listener's handlers add the prefix
+_queue_handler.addFilter(LOG_RATE_LIMITER)
+# Attached directly: basicConfig() does nothing once a host (or pytest) has given root a handler
+logging.getLogger().addHandler(_queue_handler)
+logging.getLogger().setLevel(logging.INFO)
+LOG_LISTENER.start()
+atexit.register(LOG_LISTENER.stop)  # drains the queue on exit
+atexit.register(LOG_RATE_LIMITER.report_suppressed)  # atexit runs in reverse, so this is logged first
+
+def enable_log_file(path):
+    """Also write the log to path, rotating at LOG_FILE_MAX_BYTES"""
+    path = os.path.expanduser(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=LOG_FILE_MAX_BYTES,
+                                                        backupCount=LOG_FILE_BACKUPS, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    LOG_LISTENER.handlers = LOG_LISTENER.handlers + (file_handler,)
+    logging.info(f"Logging to {path}")
+
+# Configuration Manager
+class _MemorySettings:
+    """Stand-in for QSettings where PyQt6 is not installed; holds values for this run only"""
+
+    def __init__(self):
+        self._values = {}
+
+    def value(self, key, default_value=None):
+        return self._values.get(key, default_value)
+
+    def setValue(self, key, value):
+        self._values[key] = value
+
+    def sync(self):
+        pass
+
+class ConfigManager:
+    def __init__(self):
+        try:
+            from PyQt6.QtCore import QSettings
+            self.settings = QSettings("MatterID", "Manager")
+        except ImportError:
+            # Headless installs without PyQt6 run on the defaults (and --key / --collection)
+            self.settings = _MemorySettings()
+        self.default_config = {
+            "key_url": "https://api.eliomatters.com/sangammun.json",
+            "collection_name": "registrations",
+            "login_url": "https://eliomatters.com/auth.html",
+            "login_port": 5000,  # 0 = any free port
+            "firestore_budget": 10000,  # operations one action may use before asking for confirmation
+            "log_file": "",  # also log to this file, rotated; empty = console only
+            "dataset_cache_size": DATASET_CACHE_SIZE,  # key_url + collection datasets kept for quick switching
+            "dataset_cache_on_disk": False,  # also keep them in ~/.matterid/datasets between runs
+            "table_columns": [
+                {"display": "Document ID", "field": None, "editable": False},
+                {"display": "First Name", "field": "name", "editable": True},
+                {"display": "Email", "field": "email", "editable": True},
+                {"display": "Phone No.", "field": "phone", "editable": True},
+                {"display": "School", "field": "school", "editable": True},
+                {"display": "School Info : If other than dps", "field": "customSchool", "editable": True},
+                {"display": "Committee Preferences", "field": "committeePreferences", "editable": True},
+                {"display": "Portfolio Preferences", "field": "portfolioPreferences", "editable": True},
+                {"display": "DOB", "field": "dob", "editable": True},
+                {"display": "Final Committee", "field": "finalCommittee", "editable": True},
+                {"display": "Final Portfolio", "field": "finalPortfolio", "editable": True},
+                {"display": "Payment SS URL", "field": "screenshotURL", "editable": True}
+            ],
+            "recent_configs": []
+        }
+    
+    def get_config(self):
+        config = {}
+        for key, default_value in self.default_config.items():
+            if key == "table_columns":
+                saved_columns = self.settings.value(key, default_value)
+                if isinstance(saved_columns, str):
+                    try:
+                        config[key] = json.loads(saved_columns)
+                    except json.JSONDecodeError:
+                        config[key] = default_value
+                else:
+                    config[key] = saved_columns or default_value
+            else:
+                config[key] = self.settings.value(key, default_value)
+        return config
+    
+    def save_config(self, config):
+        for key, value in config.items():
+            if key == "table_columns":
+                self.settings.setValue(key, json.dumps(value))
+            else:
+                self.settings.setValue(key, value)
+        self.settings.sync()
+    
+    def add_recent_config(self, config_name, config):
+        recent = self.get_config().get("recent_configs", [])
+        recent = [r for r in recent if r.get("name") != config_name]
+        recent.insert(0, {"name": config_name, "config": config})
+        recent = recent[:10]
+        
+        current_config = self.get_config()
+        current_config["recent_configs"] = recent
+        self.save_config(current_config)
+    
+    def export_config(self, filepath):
+        config = self.get_config()
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2, ensure_ascii=False)
+    
+    def import_config(self, filepath):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        self.save_config(config)
+        return config
+
+# Demo Data Generator
+class DemoDataGenerator:
+    COMMITTEES = ["UNHRC", "Lok Sabha", "UNGA-Disec", "UNCSW", "Continuous Crisis Committee", "International Press"]
+    COMMITTEE_WEIGHTS = [30, 22, 20, 12, 10, 6]  # popular committees fill first
+    SCHOOLS = ["DPS RK Puram", "DPS Mathura Road", "Ryan International", "Modern School", "Delhi Public School", "Sanskriti School"]
+    SCHOOL_WEIGHTS = [28, 20, 16, 14, 12, 10]
+    COUNTRIES = ['India', 'USA', 'China', 'France', 'UK', 'Germany']
+    SAMPLE_NAMES = [
+        "Arjun Sharma", "Priya Patel", "Rahul Gupta", "Ananya Singh",
+        "Karthik Iyer", "Sneha Reddy", "Vikram Malhotra", "Riya Kapoor",
+        "Aditya Jain", "Kavya Nair"
+    ]
+    FIRST_NAMES = ["Arjun", "Priya", "Rahul", "Ananya", "Karthik", "Sneha", "Vikram", "Riya", "Aditya", "Kavya",
+                   "Ishaan", "Meera", "Rohan", "Diya", "Siddharth", "Aisha", "Dev", "Tara", "Kabir", "Nisha"]
+    LAST_NAMES = ["Sharma", "Patel", "Gupta", "Singh", "Iyer", "Reddy", "Malhotra", "Kapoor", "Jain", "Nair",
+                  "Mehta", "Verma", "Bose", "Chopra", "Das", "Khan", "Menon", "Rao", "Saxena", "Bhatia"]
+    ATTENDANCE_PATTERNS = [
+        [True, True, True],    # Perfect attendance
+        [True, True, False],   # Missed day 3
+        [True, False, True],   # Missed day 2
+        [False, True, True],   # Missed day 1
+        [True, False, False],  # Only day 1
+        [False, False, True],  # Only day 3
+        [False, True, False],  # Only day 2
+        [False, False, False], # No-show
+    ]
+    ATTENDANCE_WEIGHTS = [62, 10, 6, 8, 5, 3, 2, 4]
+    UNRECORDED_ATTENDANCE_RATE = 0.08
+    CUSTOM_SCHOOL_RATE = 0.1
+
+    @staticmethod
+    def doc_id(index, count):
+        return f"demo_{index + 1:0{max(3, len(str(count)))}d}"
+
+    @staticmethod
+    def generate_demo_delegates(count=10, seed=None):
+        """Generate count sample delegates; a seed makes the data reproducible.
+        
+        Up to 10 delegates use the classic sample names; larger sets draw names,
+        committees, schools and registration dates from skewed distributions.
+        """
+        rng = random.Random(seed)
+        now = datetime.now()
+        delegates = {}
+        
+        for i in range(count):
+            if count <= len(DemoDataGenerator.SAMPLE_NAMES):
+                name = DemoDataGenerator.SAMPLE_NAMES[i]
+            else:
+                name = f"{rng.choice(DemoDataGenerator.FIRST_NAMES)} {rng.choice(DemoDataGenerator.LAST_NAMES)}"
+            committee_preference, final_committee = rng.choices(
+                DemoDataGenerator.COMMITTEES, DemoDataGenerator.COMMITTEE_WEIGHTS, k=2)
+            # Most register in the first week or the last few days before the deadline
+            registered_days_ago = int(rng.triangular(0, 28, 27)) if rng.random() < 0.6 else rng.randint(0, 4)
+            created_at = now - timedelta(days=registered_days_ago, minutes=rng.randint(0, 24 * 60))
+            custom = count > 10 and rng.random() < DemoDataGenerator.CUSTOM_SCHOOL_RATE
+            
+            delegates[DemoDataGenerator.doc_id(i, count)] = {
+                "name": name,
+                # The index keeps generated emails unique even when names repeat
+                "email": f"{name.lower().replace(' ', '.')}{'' if count <= 10 else i}@example.com",
+                "phone": f"+91 9{rng.randint(100000000, 999999999)}",
+                "school": "Other" if custom else rng.choices(DemoDataGenerator.SCHOOLS, DemoDataGenerator.SCHOOL_WEIGHTS)[0],
+                "customSchool": f"School #{rng.randint(1, max(10, count // 50))}" if custom else "",
+                "committeePreferences": committee_preference,
+                "portfolioPreferences": f"Delegate of {rng.choice(DemoDataGenerator.COUNTRIES)}",
+                "dob": f"{rng.randint(2005, 2008)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "finalCommittee": final_committee,
+                "finalPortfolio": f"Delegate of {rng.choice(DemoDataGenerator.COUNTRIES)}",
+                "screenshotURL": "https://example.com/payment_screenshot.jpg",
+                "createdAt": created_at,
+                "updatedAt": created_at + timedelta(hours=rng.randint(0, 24 * registered_days_ago))
+            }
+        
+        return delegates
+    
+    @staticmethod
+    def generate_demo_attendance(doc_ids=None, seed=None):
+        """Generate sample attendance for doc_ids (default: the 10 classic demo delegates)"""
+        rng = random.Random(seed)
+        attendance = {}
+        if doc_ids is None:
+            doc_ids = [DemoDataGenerator.doc_id(i, 10) for i in range(10)]
+            unrecorded_rate = 0.0
+        else:
+            unrecorded_rate = DemoDataGenerator.UNRECORDED_ATTENDANCE_RATE
+        
+        for doc_id in doc_ids:
+            if rng.random() < unrecorded_rate:
+                continue
+            pattern = rng.choices(DemoDataGenerator.ATTENDANCE_PATTERNS, DemoDataGenerator.ATTENDANCE_WEIGHTS)[0]
+            attendance[doc_id] = {
+                "day1": pattern[0],
+                "day2": pattern[1],
+                "day3": pattern[2],
+                "updatedAt": datetime.now(),
+                "recordedBy": "demo_user"
+            }
+        
+        return attendance
+
+# Lazy Firebase SDK
+class _LazyModule:
+    """Module proxy that imports the real module on first attribute access.
+    
+    firebase_admin pulls in grpc, google-auth and protobuf, so it is only loaded
+    once Firestore or auth is actually used; demo mode never loads it.
+    """
+
+    def __init__(self, module_name):
+        self._module_name = module_name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._module_name)
+        return getattr(self._module, attr)
+
+firebase_admin = _LazyModule("firebase_admin")
+credentials = _LazyModule("firebase_admin.credentials")
+firestore = _LazyModule("firebase_admin.firestore")
+auth = _LazyModule("firebase_admin.auth")
+
+def firebase_sdk_loaded():
+    return "firebase_admin" in sys.modules
+
+class _FakeServerTimestamp:
+    """SERVER_TIMESTAMP for in-memory clients; FakeFirestore resolves it to its clock"""
+
+    def __repr__(self):
+        return "SERVER_TIMESTAMP"
+
+_FAKE_SERVER_TIMESTAMP = _FakeServerTimestamp()
+_FakeFieldFilter = namedtuple("_FakeFieldFilter", "field_path op_string value")
+
+def is_in_memory_client(client):
+    return isinstance(client._client if isinstance(client, MeteredClient) else client, FakeFirestore)
+
+def server_timestamp(client):
+    """SERVER_TIMESTAMP for writes through client, without loading the SDK for in-memory clients"""
+    return _FAKE_SERVER_TIMESTAMP if is_in_memory_client(client) else firestore.SERVER_TIMESTAMP
+
+def field_filter(client, field_path, op_string, value):
+    """A where(filter=...) argument for client, without loading the SDK for in-memory clients"""
+    if is_in_memory_client(client):
+        return _FakeFieldFilter(field_path, op_string, value)
+    return firestore.FieldFilter(field_path, op_string, value)
+
+# Firestore Metering
+# USD list price per 100k operations; only used for the rough cost shown in the status bar
+FIRESTORE_PRICE_PER_100K = {"reads": 0.06, "writes": 0.18, "deletes": 0.02}
+FIRESTORE_OP_KINDS = ("reads", "writes", "deletes")
+
+class FirestoreMeter:
+    """Counts billed Firestore operations per feature for this session.
+    
+    The feature is whatever `with FIRESTORE_METER.feature(name)` (also usable as a
+    decorator) set on the calling thread, unless the client was bound with
+    MeteredClient.for_feature(), which is how worker threads are attributed.
+    Listeners are called after every change, on the thread that made it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._listeners = []
+        self.by_feature = {}
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    @contextmanager
+    def feature(self, name):
+        previous = getattr(self._local, "feature", None)
+        self._local.feature = name
+        try:
+            yield
+        finally:
+            self._local.feature = previous
+
+    def current_feature(self):
+        return getattr(self._local, "feature", None) or "Other"
+
+    def add(self, feature, kind, count=1):
+        if count <= 0:
+            return
+        with self._lock:
+            counts = self.by_feature.setdefault(feature, dict.fromkeys(FIRESTORE_OP_KINDS, 0))
+            counts[kind] += count
+        for listener in self._listeners:
+            listener()
+
+    def totals(self):
+        with self._lock:
+            totals = dict.fromkeys(FIRESTORE_OP_KINDS, 0)
+            for counts in self.by_feature.values():
+                for kind in FIRESTORE_OP_KINDS:
+                    totals[kind] += counts[kind]
+            return totals
+
+    def breakdown(self):
+        with self._lock:
+            return {feature: dict(counts) for feature, counts in sorted(self.by_feature.items())}
+
+    @staticmethod
+    def estimated_cost(counts):
+        return sum(counts[kind] * FIRESTORE_PRICE_PER_100K[kind] / 100000 for kind in FIRESTORE_OP_KINDS)
+
+FIRESTORE_METER = FirestoreMeter()
+
+class _MeteredDocument:
+    def __init__(self, ref, feature):
+        self._ref = ref
+        self._feature = feature
+
+    def __getattr__(self, attr):
+        return getattr(self._ref, attr)
+
+    def get(self, *args, **kwargs):
+        FIRESTORE_METER.add(self._feature, "reads")
+        return self._ref.get(*args, **kwargs)
+
+    def set(self, *args, **kwargs):
+        result = self._ref.set(*args, **kwargs)
+        FIRESTORE_METER.add(self._feature, "writes")
+        return result
+
+    def update(self, *args, **kwargs):
+        result = self._ref.update(*args, **kwargs)
+        FIRESTORE_METER.add(self._feature, "writes")
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = self._ref.delete(*args, **kwargs)
+        FIRESTORE_METER.add(self._feature, "deletes")
+        return result
+
+class _MeteredQuery:
+    """Collection or query; builder methods stay metered, stream()/get() count documents read"""
+    _BUILDERS = ("where", "order_by", "limit", "limit_to_last", "start_at", "start_after",
+                 "end_at", "end_before", "select", "offset")
+
+    def __init__(self, query, feature):
+        self._query = query
+        self._feature = feature
+
+    def __getattr__(self, attr):
+        value = getattr(self._query, attr)
+        if attr in self._BUILDERS:
+            return lambda *args, **kwargs: _MeteredQuery(value(*args, **kwargs), self._feature)
+        return value
+
+    def document(self, *args):
+        return _MeteredDocument(self._query.document(*args), self._feature)
+
+    def stream(self, *args, **kwargs):
+        read = 0
+        try:
+            for snapshot in self._query.stream(*args, **kwargs):
+                read += 1
+                yield snapshot
+        finally:
+            # A query is billed at least one read even when it matches nothing
+            FIRESTORE_METER.add(self._feature, "reads", max(read, 1))
+
+    def get(self, *args, **kwargs):
+        return list(self.stream(*args, **kwargs))
+
+class _MeteredBatch:
+    def __init__(self, batch, feature):
+        self._batch = batch
+        self._feature = feature
+        self._pending = dict.fromkeys(FIRESTORE_OP_KINDS, 0)
+
+    def __getattr__(self, attr):
+        return getattr(self._batch, attr)
+
+    def set(self, ref, *args, **kwargs):
+        self._pending["writes"] += 1
+        return self._batch.set(getattr(ref, "_ref", ref), *args, **kwargs)
+
+    def update(self, ref, *args, **kwargs):
+        self._pending["writes"] += 1
+        return self._batch.update(getattr(ref, "_ref", ref), *args, **kwargs)
+
+    def delete(self, ref, *args, **kwargs):
+        self._pending["deletes"] += 1
+        return self._batch.delete(getattr(ref, "_ref", ref), *args, **kwargs)
+
+    def commit(self, *args, **kwargs):
+        result = self._batch.commit(*args, **kwargs)
+        for kind, count in self._pending.items():
+            FIRESTORE_METER.add(self._feature, kind, count)
+        return result
+
+class MeteredClient:
+    """Firestore client wrapper that reports every billed operation to FIRESTORE_METER"""
+
+    def __init__(self, client, feature=None):
+        self._client = client
+        self._feature = feature
+
+    def __getattr__(self, attr):
+        return getattr(self._client, attr)
+
+    def for_feature(self, feature):
+        """A client whose operations count towards feature on any thread"""
+        return MeteredClient(self._client, feature)
+
+    @property
+    def feature(self):
+        return self._feature or FIRESTORE_METER.current_feature()
+
+    def collection(self, *args):
+        return _MeteredQuery(self._client.collection(*args), self.feature)
+
+    def document(self, *args):
+        return _MeteredDocument(self._client.document(*args), self.feature)
+
+    def batch(self):
+        return _MeteredBatch(self._client.batch(), self.feature)
+
+    def get_all(self, refs, *args, **kwargs):
+        refs = [getattr(ref, "_ref", ref) for ref in refs]
+        FIRESTORE_METER.add(self.feature, "reads", len(refs))  # missing documents are billed too
+        return self._client.get_all(refs, *args, **kwargs)
+
+# Performance Tracing
+TRACE_BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+TRACE_RECENT_SAMPLES = 1024  # per operation, for percentiles
+
+class OperationStats:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(TRACE_BUCKET_BOUNDS_MS) + 1)  # last bucket is overflow
+        self.recent = deque(maxlen=TRACE_RECENT_SAMPLES)
+
+    def add(self, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.min_ms = elapsed_ms if self.min_ms is None else min(self.min_ms, elapsed_ms)
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(TRACE_BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+        self.recent.append(elapsed_ms)
+
+    def percentile(self, fraction):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min_ms or 0.0, 3),
+            "p50_ms": round(self.percentile(0.50), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "histogram": {**{f"<={bound}ms": n for bound, n in zip(TRACE_BUCKET_BOUNDS_MS, self.buckets)},
+                          f">{TRACE_BUCKET_BOUNDS_MS[-1]}ms": self.buckets[-1]},
+        }
+
+class PerfTracer:
+    """Thread-safe latency counts and histograms per named operation.
+    
+    Use `with PERF.trace("name"):` around a block or `@PERF.traced("name")` on a function.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.operations = {}
+        self.started = datetime.now()
+
+    def record(self, name, seconds):
+        with self._lock:
+            self.operations.setdefault(name, OperationStats()).add(seconds * 1000)
+
+    @contextmanager
+    def trace(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def traced(self, name):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.trace(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self.operations.clear()
+            self.started = datetime.now()
+
+    def snapshot(self):
+        with self._lock:
+            return {name: stats.summary() for name, stats in sorted(self.operations.items())}
+
+    def export_json(self, path):
+        """Write the current stats with enough build context to compare runs"""
+        report = {
+            "app": "MatterID - Manager v2.5",
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "numpy": np is not None,
+            "since": self.started.isoformat(),
+            "exported": datetime.now().isoformat(),
+            "operations": self.snapshot(),
+        }
+        with open(path, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+
+PERF = PerfTracer()
+
+# Helper Functions
+EMAIL_REGEX = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+
+def is_valid_email(email):
+    return re.match(EMAIL_REGEX, email) is not None
+
+def format_timestamp(ts):
+    if isinstance(ts, datetime):
+        try:
+            local_dt = ts.astimezone()
+            return local_dt.strftime("%Y-%m-%d %H:%M:%S")
+        except Exception:
+            return ts.strftime("%Y-%m-%d %H:%M:%S (UTC?)")
+    elif ts:
+        return str(ts)
+    return ""
+
+# Columnar Delegate Store
+CATEGORICAL_FIELDS = (
+    "school", "customSchool", "committeePreferences", "portfolioPreferences",
+    "finalCommittee", "finalPortfolio", "paymentStatus"
+)
+_MISSING = object()
+
+def _category_key(value):
+    if isinstance(value, str):
+        return value
+    return (type(value).__name__, repr(value))
+
+class ColumnarStore:
+    """Column-per-field view of loaded registrations.
+    
+    Categorical fields are dictionary-encoded to integer codes (code 0 marks a
+    document without the field) and repeated strings in the source documents are
+    replaced by one shared instance. Other fields are kept as per-row lists.
+    Columns outside the initial field list are encoded on first use. Code arrays
+    are NumPy arrays when NumPy is installed, array('i') otherwise.
+    """
+    
+    def __init__(self, docs, fields=(), categorical_fields=CATEGORICAL_FIELDS):
+        self.doc_ids = []
+        self._docs = []
+        self.empty_docs = 0  # None documents: not rows, but still registrations
+        for doc_id, data in docs.items():
+            if data is None:
+                self.empty_docs += 1
+                continue
+            self.doc_ids.append(doc_id)
+            self._docs.append(data)
+        self.row_of = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+        self.categorical_fields = set(categorical_fields)
+        self.categories = {}  # field -> [_MISSING, value, ...]
+        self.codes = {}       # field -> code per row
+        self.values = {}      # field -> value per row (_MISSING if absent)
+        for field in fields:
+            if field:
+                self.column(field)
+    
+    def __len__(self):
+        return len(self.doc_ids)
+    
+    def column(self, field):
+        if field in self.categorical_fields:
+            if field not in self.codes:
+                self._encode(field)
+            return self.codes[field]
+        if field not in self.values:
+            self.values[field] = [data.get(field, _MISSING) for data in self._docs]
+        return self.values[field]
+    
+    def derived(self, name, func):
+        """Per-row values of func(document), computed once and cached under name"""
+        if name not in self.values:
+            self.values[name] = [func(data) for data in self._docs]
+        return self.values[name]
+    
+    def _encode(self, field):
+        categories = [_MISSING]
+        index = {}
+        codes = []
+        for data in self._docs:
+            if field not in data:
+                codes.append(0)
+                continue
+            value = data[field]
+            key = _category_key(value)
+            code = index.get(key)
+            if code is None:
+                code = len(categories)
+                index[key] = code
+                categories.append(value)
+            elif isinstance(value, str) and value is not categories[code]:
+                data[field] = categories[code]
+            codes.append(code)
+        
+        self.categories[field] = categories
+        if np is not None:
+            self.codes[field] = np.fromiter(codes, dtype=np.int32, count=len(codes))
+        else:
+            self.codes[field] = array('i', codes)
+    
+    def group_counts(self, field, missing_label):
+        """{value: row count} for a categorical field, like data.get(field, missing_label)"""
+        codes = self.column(field)
+        categories = self.categories[field]
+        if np is not None:
+            counts = np.bincount(codes, minlength=len(categories)).tolist()
+        else:
+            counts = [0] * len(categories)
+            for code in codes:
+                counts[code] += 1
+        
+        result = {}
+        for code, count in enumerate(counts):
+            if count:
+                value = missing_label if code == 0 else categories[code]
+                result[value] = result.get(value, 0) + count
+        return result
+    
+    def distinct_present(self, field):
+        """Number of distinct truthy values of a categorical field"""
+        self.column(field)
+        return sum(1 for value in self.categories[field][1:] if value)
+    
+    def decoded(self, field, missing=""):
+        """Plain per-row values of a field, with missing fields as missing"""
+        if field is None:
+            return list(self.doc_ids)
+        column = self.column(field)
+        if field in self.categorical_fields:
+            lookup = [missing] + self.categories[field][1:]
+            codes = column.tolist() if np is not None else column
+            return [lookup[code] for code in codes]
+        return [missing if value is _MISSING else value for value in column]
+    
+    def match_rows(self, field, predicate, rows=None):
+        """Row indices whose str(value).lower() satisfies predicate.
+        
+        field None matches on document IDs; missing values test as "".
+        Categorical fields test each distinct value once.
+        """
+        if field in self.categorical_fields:
+            codes = self.column(field)
+            categories = self.categories[field]
+            matched = [code for code, value in enumerate(categories)
+                       if predicate("" if code == 0 else str(value).lower())]
+            if np is not None:
+                hits = np.flatnonzero(np.isin(codes, matched)).tolist()
+            else:
+                matched = set(matched)
+                hits = [i for i, code in enumerate(codes) if code in matched]
+        else:
+            if field is None:
+                texts = (doc_id.lower() for doc_id in self.doc_ids)
+            else:
+                texts = ("" if value is _MISSING else str(value).lower() for value in self.column(field))
+            hits = [i for i, text in enumerate(texts) if predicate(text)]
+        
+        if rows is not None:
+            hits_set = set(hits)
+            return [i for i in rows if i in hits_set]
+        return hits
+
+# Batched Firestore Writes
+FIRESTORE_BATCH_LIMIT = 500  # Firestore's maximum operations per WriteBatch
+
+def commit_batched_writes(client, operations):
+    """Commit (op, doc_ref, data) tuples with as few WriteBatch commits as possible.
+    
+    op is "set", "merge", "update" or "delete". Returns the number of commits.
+    """
+    commits = 0
+    for start in range(0, len(operations), FIRESTORE_BATCH_LIMIT):
+        batch = client.batch()
+        for op, ref, data in operations[start:start + FIRESTORE_BATCH_LIMIT]:
+            if op == "set":
+                batch.set(ref, data)
+            elif op == "merge":
+                batch.set(ref, data, merge=True)
+            elif op == "update":
+                batch.update(ref, data)
+            elif op == "delete":
+                batch.delete(ref)
+            else:
+                raise ValueError(f"Unknown batch operation: {op}")
+        batch.commit()
+        commits += 1
+    return commits
+
+def write_attendance(client, doc_id, day, present, recorded_by="matterid_user"):
+    """Record one day's attendance the way every check-in station does; merge leaves other days alone"""
+    return client.collection("attendance").document(doc_id).set({
+        day: present,
+        "updatedAt": server_timestamp(client),
+        "recordedBy": recorded_by
+    }, merge=True)
+
+# Duplicate Detection
+def normalize_email(value):
+    email = str(value or "").strip().lower()
+    return email if "@" in email else ""
+
+def normalize_phone(value):
+    digits = re.sub(r"\D", "", str(value or ""))
+    # Compare national numbers so "+91 98…" and "098…" match
+    return digits[-10:] if len(digits) >= 7 else ""
+
+def normalize_name(value):
+    return " ".join(re.sub(r"[^\w\s]", " ", str(value or "").lower()).split())
+
+def duplicate_keys(data):
+    """Blocking keys for one registration; any shared key links two records"""
+    keys = []
+    email = normalize_email(data.get("email"))
+    if email:
+        keys.append(("email", email))
+    phone = normalize_phone(data.get("phone"))
+    if phone:
+        keys.append(("phone", phone))
+    name = normalize_name(data.get("name"))
+    dob = re.sub(r"\D", "", str(data.get("dob") or ""))
+    if name and dob:
+        keys.append(("name+dob", f"{name}|{dob}"))
+    return keys
+
+def find_duplicate_clusters(docs):
+    """Group registrations sharing a normalized email, phone or name+DOB.
+    
+    Hashes each record into blocks by key and unions the members of every
+    block, so the cost is linear in the number of records. Returns a list of
+    (doc_ids, reasons) tuples, largest clusters first.
+    """
+    blocks = {}
+    for doc_id, data in docs.items():
+        if data is None:
+            continue
+        for key in duplicate_keys(data):
+            blocks.setdefault(key, []).append(doc_id)
+    
+    parent = {}
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    
+    for members in blocks.values():
+        if len(members) > 1:
+            root = find(members[0])
+            for other in members[1:]:
+                other_root = find(other)
+                if other_root != root:
+                    parent[other_root] = root
+    
+    clusters = {}
+    reasons = {}
+    for (kind, _), members in blocks.items():
+        if len(members) > 1:
+            root = find(members[0])
+            reasons.setdefault(root, set()).add(kind)
+    for doc_id in parent:
+        clusters.setdefault(find(doc_id), []).append(doc_id)
+    
+    result = [(tuple(members), tuple(sorted(reasons.get(root, ()))))
+              for root, members in clusters.items() if len(members) > 1]
+    result.sort(key=lambda c: len(c[0]), reverse=True)
+    return result
+
+def merge_registrations(keep, others):
+    """Fields from others that fill gaps (missing or empty) in keep"""
+    filled = {}
+    for data in others:
+        for field, value in data.items():
+            if field == "updatedAt" or value in (None, "", [], {}):
+                continue
+            if keep.get(field) in (None, "", [], {}) and field not in filled:
+                filled[field] = value
+    return filled
+
+def merge_attendance(keep, others):
+    """Days others were checked in on that keep lacks, as {day: True}"""
+    keep = keep or {}
+    return {day: True for day in ATTENDANCE_DAYS
+            if not keep.get(day) and any((data or {}).get(day) for data in others)}
+
+# Streaming CSV Export
+EXPORT_CHUNK_ROWS = 1000
+
+def iter_table_export_rows(store, table_columns, rows=None):
+    """Yield one CSV row per store row (or per index in rows) for table_columns.
+    
+    Every column of the store must already be encoded (see prepare_table_export).
+    """
+    columns = []
+    for column_config in table_columns:
+        field_name = column_config.get("field")
+        formatter = format_timestamp if field_name == "updatedAt" else None
+        columns.append((store.decoded(field_name), formatter))
+    
+    indices = range(len(store)) if rows is None else rows
+    for i in indices:
+        yield [formatter(values[i]) if formatter else values[i] for values, formatter in columns]
+
+def prepare_table_export(store, table_columns):
+    """Encode the exported columns up front so the export thread only reads the store"""
+    for column_config in table_columns:
+        if column_config.get("field"):
+            store.column(column_config["field"])
+
+def iter_attendance_export_rows(snapshot):
+    """Yield attendance CSV rows from (doc_id, name, committee, attendance) tuples"""
+    for doc_id, name, committee, attendance in snapshot:
+        present = [bool(attendance.get(day, False)) for day in ATTENDANCE_DAYS]
+        yield ([doc_id, name, committee]
+               + ["✅" if p else "❌" for p in present]
+               + ["".join("P" if p else "A" for p in present), sum(present)])
+
+def table_row_builder(table_columns):
+    """Per-column accessors, resolved once, that turn (doc_id, data) into a CSV row"""
+    getters = []
+    for column_config in table_columns:
+        field_name = column_config.get("field")
+        if field_name is None:
+            getters.append(lambda doc_id, data: doc_id)
+        elif field_name == "updatedAt":
+            getters.append(lambda doc_id, data, f=field_name: format_timestamp(data.get(f)))
+        else:
+            getters.append(lambda doc_id, data, f=field_name: data.get(f, ""))
+    return lambda doc_id, data: [getter(doc_id, data) for getter in getters]
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def write_export_chunk(out_file, writer, chunk, fmt):
+    if fmt == "ndjson":
+        out_file.write("".join(json.dumps(record, default=json_default, ensure_ascii=False) + "\n"
+                               for record in chunk))
+    else:
+        writer.writerows(chunk)
+
+@PERF.traced("export.stream")
+def write_export_file(file_path, header, rows, total=0, fmt="csv", progress=None, cancel_event=None):
+    """Stream rows to file_path a chunk at a time; returns the number of rows written.
+    
+    progress(written, total) is called after each chunk. Once cancel_event is set
+    the export stops at the next chunk boundary and the partial file is removed.
+    """
+    written = 0
+    with open(file_path, mode="w", newline="", encoding="utf-8") as out_file:
+        writer = csv.writer(out_file)
+        if fmt == "csv":
+            writer.writerow(header)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= EXPORT_CHUNK_ROWS:
+                write_export_chunk(out_file, writer, chunk, fmt)
+                written += len(chunk)
+                chunk = []
+                if progress:
+                    progress(written, total)
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+        else:
+            write_export_chunk(out_file, writer, chunk, fmt)
+            written += len(chunk)
+    
+    if cancel_event is not None and cancel_event.is_set():
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+        return written
+    if progress:
+        progress(written, total)
+    return written
+
+# Server-side Firestore Export
+FIRESTORE_EXPORT_PAGE_SIZE = 500
+
+def iter_firestore_pages(client, collection_name, page_size=FIRESTORE_EXPORT_PAGE_SIZE):
+    """Yield lists of document snapshots ordered by ID, paging with start_after cursors"""
+    # "__name__" orders by document ID, which is always indexed
+    query = client.collection(collection_name).order_by("__name__").limit(page_size)
+    cursor = None
+    while True:
+        page = list((query.start_after(cursor) if cursor is not None else query).stream())
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        cursor = page[-1]
+
+def fetch_attendance_for(client, doc_ids):
+    """Attendance records for doc_ids in a single batched get"""
+    if not doc_ids:
+        return {}
+    refs = [client.collection("attendance").document(doc_id) for doc_id in doc_ids]
+    return {snap.id: snap.to_dict() for snap in client.get_all(refs) if snap.exists}
+
+def iter_firestore_export_records(client, collection_name, page_size=FIRESTORE_EXPORT_PAGE_SIZE):
+    """Yield (doc_id, data, attendance) for a whole collection, one page in memory at a time"""
+    for page in iter_firestore_pages(client, collection_name, page_size):
+        attendance = fetch_attendance_for(client, [snap.id for snap in page])
+        for snap in page:
+            yield snap.id, snap.to_dict() or {}, attendance.get(snap.id, {})
+
+def iter_firestore_export_rows(client, collection_name, table_columns, fmt):
+    """CSV rows (table columns + days) or NDJSON records for a server-side export"""
+    build_row = table_row_builder(table_columns)
+    for doc_id, data, attendance in iter_firestore_export_records(client, collection_name):
+        if fmt == "ndjson":
+            yield {"id": doc_id, "data": data, "attendance": attendance}
+        else:
+            yield build_row(doc_id, data) + [bool(attendance.get(day, False)) for day in ATTENDANCE_DAYS]
+
+# Differential Export
+CHANGE_ADDED, CHANGE_CHANGED, CHANGE_REMOVED = "added", "changed", "removed"
+
+def matterid_data_dir(*parts):
+    """Per-user directory for MatterID state files, created on demand"""
+    path = os.path.join(os.path.expanduser("~"), ".matterid", *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def private_data_dir(*parts):
+    """matterid_data_dir() readable by this user only, for credentials and delegates' personal data"""
+    path = matterid_data_dir(*parts)
+    os.chmod(path, 0o700)
+    return path
+
+def open_private_file(path, mode="w", **kwargs):
+    """Open path for writing as a file only this user can read (0600, whatever the umask)"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    if hasattr(os, "fchmod"):
+        os.fchmod(fd, 0o600)  # a leftover file keeps its old mode through O_CREAT
+    return os.fdopen(fd, mode, **kwargs)
+
+def export_state_path(collection_name, destination):
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{collection_name}-{destination}").strip("_")
+    return os.path.join(matterid_data_dir("exports"), f"{slug}.json")
+
+def list_export_destinations(collection_name):
+    prefix = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{collection_name}-")
+    names = []
+    for file_name in sorted(os.listdir(matterid_data_dir("exports"))):
+        if file_name.startswith(prefix) and file_name.endswith(".json"):
+            try:
+                with open(os.path.join(matterid_data_dir("exports"), file_name), encoding="utf-8") as state_file:
+                    names.append(json.load(state_file)["destination"])
+            except (OSError, ValueError, KeyError):
+                continue
+    return names
+
+def load_export_state(collection_name, destination):
+    """The watermark, known doc IDs and IDs exported at the watermark from the last export, or None"""
+    try:
+        with open(export_state_path(collection_name, destination), encoding="utf-8") as state_file:
+            state = json.load(state_file)
+    except FileNotFoundError:
+        return None
+    return {"watermark": datetime.fromisoformat(state["watermark"]) if state.get("watermark") else None,
+            "ids": set(state.get("ids", [])), "boundary_ids": set(state.get("boundary_ids", []))}
+
+def save_export_state(collection_name, destination, watermark, ids, boundary_ids=()):
+    path = export_state_path(collection_name, destination)
+    with open(path + ".tmp", "w", encoding="utf-8") as state_file:
+        json.dump({"destination": destination, "collection": collection_name,
+                   "watermark": watermark.isoformat() if watermark else None,
+                   "exported": datetime.now().isoformat(), "ids": sorted(ids),
+                   "boundary_ids": sorted(boundary_ids)}, state_file)
+    os.replace(path + ".tmp", path)
+
+def as_utc(ts):
+    """Comparable UTC datetime; naive values (demo data, local edits) are taken as local time"""
+    if not isinstance(ts, datetime):
+        return None
+    return ts.astimezone(timezone.utc)
+
+def ids_updated_at(docs, watermark):
+    """IDs of docs whose updatedAt is exactly watermark"""
+    if watermark is None:
+        return set()
+    watermark = as_utc(watermark)
+    return {doc_id for doc_id, data in docs.items() if data and as_utc(data.get("updatedAt")) == watermark}
+
+def compute_export_delta(candidates, current_ids, state):
+    """Work out what changed since the last export.
+    
+    candidates maps doc ID to data for every document that may have changed (at least
+    those with updatedAt at or after the watermark); current_ids is every ID that still exists.
+    Several writes can share one server timestamp, so documents at the watermark count as
+    changed unless their ID is in the state's boundary_ids (already sent at that time).
+    Returns (changes, new_watermark) where changes is a list of (change, doc_id, data).
+    """
+    watermark = as_utc(state["watermark"]) if state else None
+    known_ids = state["ids"] if state else set()
+    boundary_ids = state.get("boundary_ids", set()) if state else set()
+    new_watermark = watermark
+    changes = []
+    for doc_id, data in candidates.items():
+        updated = as_utc(data.get("updatedAt"))
+        if updated is not None and (new_watermark is None or updated > new_watermark):
+            new_watermark = updated
+        if doc_id not in known_ids:
+            changes.append((CHANGE_ADDED, doc_id, data))
+        elif updated is not None and (watermark is None or updated > watermark
+                                      or (updated == watermark and doc_id not in boundary_ids)):
+            changes.append((CHANGE_CHANGED, doc_id, data))
+    changes.extend((CHANGE_REMOVED, doc_id, {}) for doc_id in sorted(known_ids - set(current_ids)))
+    return changes, new_watermark
+
+def fetch_export_delta_source(client, collection_name, state):
+    """Documents updated at or after the watermark plus every current ID, read from Firestore.
+    
+    IDs come from an empty projection, so unchanged documents are not downloaded.
+    """
+    collection_ref = client.collection(collection_name)
+    current_ids = {snap.id for snap in collection_ref.select([]).stream()}
+    if state and state["watermark"] is not None:
+        query = collection_ref.where(filter=field_filter(client, "updatedAt", ">=", state["watermark"]))
+        candidates = {snap.id: snap.to_dict() or {} for snap in query.stream()}
+        # New documents without an updatedAt never match the range query
+        missing = [doc_id for doc_id in current_ids - state["ids"] if doc_id not in candidates]
+        if missing:
+            refs = [collection_ref.document(doc_id) for doc_id in missing]
+            candidates.update({snap.id: snap.to_dict() or {} for snap in client.get_all(refs) if snap.exists})
+    else:
+        candidates = {snap.id: snap.to_dict() or {} for snap in collection_ref.stream()}
+    return candidates, current_ids
+
+def iter_change_export_rows(changes, table_columns):
+    """CSV rows with a leading change-type column; removed rows carry only the ID"""
+    build_row = table_row_builder(table_columns)
+    for change, doc_id, data in changes:
+        yield [change] + build_row(doc_id, data)
+
+# CSV Import
+IMPORT_REQUIRED_FIELDS = ("name", "email")
+IMPORT_ID_HEADERS = ("document id", "doc id", "id")
+IMPORT_COMMIT_WORKERS = 4  # concurrent WriteBatch commits in flight
+
+def map_import_headers(headers, table_columns):
+    """Map CSV headers to (doc ID header, {header: field}) using table_columns.
+    
+    Headers match a column's display name or field name, case-insensitively.
+    Raises ValueError if a required field has no matching header.
+    """
+    lookup = {}
+    for column_config in table_columns:
+        field_name = column_config.get("field")
+        if not field_name or field_name == "updatedAt" or not column_config.get("editable", True):
+            continue
+        lookup[column_config.get("display", field_name).strip().lower()] = field_name
+        lookup[field_name.lower()] = field_name
+    
+    id_header = None
+    mapping = {}
+    for header in headers:
+        key = (header or "").strip().lower()
+        if key in IMPORT_ID_HEADERS and id_header is None:
+            id_header = header
+        elif key in lookup and lookup[key] not in mapping.values():
+            mapping[header] = lookup[key]
+    
+    missing = [field for field in IMPORT_REQUIRED_FIELDS if field not in mapping.values()]
+    if missing:
+        raise ValueError(f"No column found for required field(s): {', '.join(missing)}")
+    return id_header, mapping
+
+def validate_import_row(doc_id, fields, seen_ids):
+    """Return a reject reason for the row, or None if it can be imported"""
+    for field_name in IMPORT_REQUIRED_FIELDS:
+        if not fields.get(field_name):
+            return f"Missing required field '{field_name}'"
+    if not is_valid_email(fields["email"]):
+        return f"Invalid email '{fields['email']}'"
+    if "/" in doc_id:
+        return f"Invalid document ID '{doc_id}'"
+    if doc_id:
+        if doc_id in seen_ids:
+            return f"Duplicate document ID '{doc_id}' in file"
+        seen_ids.add(doc_id)
+    return None
+
+def commit_import_chunk(client, collection_name, chunk):
+    """Upsert one chunk of (line, row, doc_id, fields) records in a single WriteBatch"""
+    collection_ref = client.collection(collection_name)
+    operations = [
+        ("merge", collection_ref.document(doc_id), dict(fields, updatedAt=server_timestamp(client)))
+        for _, _, doc_id, fields in chunk
+    ]
+    return commit_batched_writes(client, operations)
+
+class CsvImporter:
+    """Validate a CSV file and upsert its good rows with concurrent WriteBatch commits.
+    
+    Rejected rows go to reject_path with their line number and reason. progress(read, 0)
+    is called every EXPORT_CHUNK_ROWS rows, where a set cancel_event stops reading.
+    """
+
+    def __init__(self, file_path, client, collection_name, table_columns, reject_path, progress=None):
+        self.file_path = file_path
+        self.client = client
+        self.collection_name = collection_name
+        self.table_columns = table_columns
+        self.reject_path = reject_path
+        self.progress = progress
+        self.cancel_event = threading.Event()
+        self._reject_file = None
+        self._reject_writer = None
+
+    def report_progress(self, read, total):
+        if self.progress:
+            self.progress(read, total)
+
+    def reject(self, headers, line, row, reason):
+        if self._reject_writer is None:
+            self._reject_file = open(self.reject_path, mode="w", newline="", encoding="utf-8")
+            self._reject_writer = csv.writer(self._reject_file)
+            self._reject_writer.writerow(list(headers) + ["Line", "Reason"])
+        self._reject_writer.writerow([row.get(header, "") for header in headers] + [line, reason])
+
+    @PERF.traced("import.csv")
+    def run(self):
+        """Import the whole file; returns the summary dict"""
+        summary = {"read": 0, "imported": {}, "rejected": 0, "commits": 0,
+                   "reject_path": None, "cancelled": False}
+        try:
+            self.import_rows(summary)
+        finally:
+            if self._reject_file is not None:
+                self._reject_file.close()
+        
+        if self._reject_writer is not None:
+            summary["reject_path"] = self.reject_path
+        summary["cancelled"] = self.cancel_event.is_set()
+        self.report_progress(summary["read"], 0)
+        return summary
+
+    def import_rows(self, summary):
+        collection_ref = self.client.collection(self.collection_name) if self.client else None
+        
+        def settle(future, chunk):
+            # Runs on this thread, so rejects and results need no locking
+            try:
+                summary["commits"] += future.result() if future else 0
+            except Exception as e:
+                logging.error(f"Import batch commit failed: {e}")
+                for line, row, _, _ in chunk:
+                    self.reject(headers, line, row, f"Commit failed: {e}")
+                summary["rejected"] += len(chunk)
+                return
+            for _, _, doc_id, fields in chunk:
+                summary["imported"][doc_id] = fields
+        
+        with open(self.file_path, mode="r", newline="", encoding="utf-8-sig") as in_file, \
+                ThreadPoolExecutor(max_workers=IMPORT_COMMIT_WORKERS) as executor:
+            reader = csv.DictReader(in_file)
+            headers = reader.fieldnames or []
+            id_header, mapping = map_import_headers(headers, self.table_columns)
+            
+            seen_ids = set()
+            pending = deque()
+            chunk = []
+            
+            def submit(chunk):
+                if collection_ref is None:  # demo mode: nothing to commit
+                    pending.append((None, chunk))
+                else:
+                    pending.append((executor.submit(commit_import_chunk, self.client, self.collection_name, chunk), chunk))
+                while len(pending) > IMPORT_COMMIT_WORKERS * 2:
+                    settle(*pending.popleft())
+            
+            for line, row in enumerate(reader, start=2):
+                if None in row:
+                    reason = "More values than headers"
+                    fields = {}
+                else:
+                    fields = {field: (row.get(header) or "").strip() for header, field in mapping.items()}
+                    fields = {field: value for field, value in fields.items() if value}
+                    reason = None
+                doc_id = (row.get(id_header) or "").strip() if id_header else ""
+                reason = reason or validate_import_row(doc_id, fields, seen_ids)
+                summary["read"] += 1
+                
+                if reason:
+                    self.reject(headers, line, row, reason)
+                    summary["rejected"] += 1
+                else:
+                    if not doc_id:
+                        # Auto IDs are generated client-side, so they are known before commit
+                        doc_id = collection_ref.document().id if collection_ref else f"import-{uuid.uuid4().hex[:12]}"
+                    chunk.append((line, row, doc_id, fields))
+                    if len(chunk) >= FIRESTORE_BATCH_LIMIT:
+                        submit(chunk)
+                        chunk = []
+                
+                if summary["read"] % EXPORT_CHUNK_ROWS == 0:
+                    self.report_progress(summary["read"], 0)
+                    if self.cancel_event.is_set():
+                        chunk = []  # rows already submitted still land
+                        break
+            
+            if chunk:
+                submit(chunk)
+            while pending:
+                settle(*pending.popleft())
+
+# Conference Backup / Restore
+BACKUP_FORMAT_VERSION = 1
+RESTORE_COMMIT_WORKERS = 4
+
+def encode_backup_value(value):
+    """JSON-safe encoding of a Firestore value that keeps its type on restore"""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {key: encode_backup_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_backup_value(item) for item in value]
+    if isinstance(value, datetime):
+        return {"__type__": "timestamp", "value": value.isoformat()}
+    if isinstance(value, bytes):
+        return {"__type__": "bytes", "value": base64.b64encode(value).decode("ascii")}
+    if firebase_sdk_loaded():  # without the SDK there are no GeoPoints or references to encode
+        if isinstance(value, firestore.GeoPoint):
+            return {"__type__": "geopoint", "value": [value.latitude, value.longitude]}
+        if isinstance(value, firestore.DocumentReference):
+            return {"__type__": "reference", "value": value.path}
+    return value
+
+def decode_backup_value(value, client=None):
+    """Inverse of encode_backup_value; references need a client to be rebuilt"""
+    if isinstance(value, dict):
+        kind = value.get("__type__")
+        if kind == "timestamp":
+            return datetime.fromisoformat(value["value"])
+        if kind == "bytes":
+            return base64.b64decode(value["value"])
+        if kind == "geopoint":
+            return firestore.GeoPoint(*value["value"])
+        if kind == "reference":
+            return client.document(value["value"]) if client else value["value"]
+        return {key: decode_backup_value(item, client) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_backup_value(item, client) for item in value]
+    return value
+
+def backup_collections(collection_name=None):
+    """Default backup set: the registrations collection (from the saved configuration unless given) and attendance"""
+    if collection_name is None:
+        collection_name = ConfigManager().get_config().get("collection_name", "registrations")
+    return [collection_name, "attendance"]
+
+def write_backup(client, path, collections=None, progress=None):
+    """Stream collections into a gzip NDJSON archive; returns {collection: documents}.
+    
+    The first line is a header record, then one {"collection", "id", "data"} line per
+    document. Without collections, backup_collections() are archived. The archive is
+    written to a .partial file and renamed when complete.
+    """
+    collections = collections or backup_collections()
+    counts = {}
+    partial_path = path + ".partial"
+    with gzip.open(partial_path, mode="wt", encoding="utf-8") as out_file:
+        out_file.write(json.dumps({"format": "matterid-backup", "version": BACKUP_FORMAT_VERSION,
+                                   "created": datetime.now().isoformat(),
+                                   "collections": list(collections)}) + "\n")
+        for collection_name in collections:
+            counts[collection_name] = 0
+            for page in iter_firestore_pages(client, collection_name):
+                out_file.write("".join(
+                    json.dumps({"collection": collection_name, "id": snap.id,
+                                "data": encode_backup_value(snap.to_dict() or {})}, ensure_ascii=False) + "\n"
+                    for snap in page))
+                counts[collection_name] += len(page)
+                if progress:
+                    progress(collection_name, counts[collection_name])
+    os.replace(partial_path, path)
+    return counts
+
+def iter_backup_records(path):
+    """Yield (collection, doc_id, data) per archived document, after checking the header line"""
+    with gzip.open(path, mode="rt", encoding="utf-8") as in_file:
+        header = json.loads(in_file.readline() or "{}")
+        if header.get("format") != "matterid-backup":
+            raise ValueError(f"{path} is not a MatterID backup archive")
+        if header.get("version", 0) > BACKUP_FORMAT_VERSION:
+            raise ValueError(f"Backup format version {header['version']} is newer than this app supports")
+        for line in in_file:
+            if line.strip():
+                record = json.loads(line)
+                yield record["collection"], record["id"], record["data"]
+
+def restore_backup(client, path, collection_map=None, state_path=None, progress=None):
+    """Replay an archive with parallel batched sets; returns the number of documents restored.
+    
+    collection_map renames collections on the way in, e.g. {"registrations": "registrations_2025"}.
+    Progress is checkpointed to state_path as batches commit, so an interrupted
+    restore resumes after the last checkpoint. Sets are idempotent, so
+    batches replayed after a crash are harmless.
+    """
+    collection_map = collection_map or {}
+    state_path = state_path or path + ".restore-state.json"
+    skip = 0
+    if os.path.exists(state_path):
+        with open(state_path, encoding="utf-8") as state_file:
+            skip = json.load(state_file).get("committed", 0)
+        logging.info(f"Resuming restore of {path} after {skip} committed document(s).")
+    
+    def settle(future, end):
+        # Futures are settled in submission order, so everything before end is committed
+        future.result()  # a failed commit stops the restore at the last checkpoint
+        with open(state_path, "w", encoding="utf-8") as state_file:
+            json.dump({"archive": os.path.abspath(path), "committed": end}, state_file)
+        if progress:
+            progress(end)
+    
+    position = 0
+    operations = []
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=RESTORE_COMMIT_WORKERS) as executor:
+        for collection_name, doc_id, data in iter_backup_records(path):
+            position += 1
+            if position <= skip:
+                continue
+            ref = client.collection(collection_map.get(collection_name, collection_name)).document(doc_id)
+            operations.append(("set", ref, decode_backup_value(data, client)))
+            if len(operations) >= FIRESTORE_BATCH_LIMIT:
+                pending.append((executor.submit(commit_batched_writes, client, operations), position))
+                operations = []
+                while len(pending) > RESTORE_COMMIT_WORKERS * 2:
+                    settle(*pending.popleft())
+        if operations:
+            pending.append((executor.submit(commit_batched_writes, client, operations), position))
+        while pending:
+            settle(*pending.popleft())
+    
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    return max(0, position - skip)  # a checkpoint past the end of a replaced archive restores nothing
+
+# Cached Key Download
+KEY_FETCH_TIMEOUT = 20
+
+def key_cache_path(url):
+    # Service keys are credentials: keep the cache readable by this user only
+    cache_dir = private_data_dir("keys")
+    return os.path.join(cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest()[:24] + ".json")
+
+def load_cached_json(url):
+    """The cache entry for url ({"data", "etag", "last_modified", ...}) or None"""
+    try:
+        with open(key_cache_path(url), encoding="utf-8") as cache_file:
+            entry = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("url") == url and "data" in entry else None
+
+def forget_cached_json(url):
+    """Drop the cached copy of url, so the next fetch downloads it without revalidating"""
+    try:
+        os.remove(key_cache_path(url))
+    except FileNotFoundError:
+        pass
+
+def cache_control_expiry(headers):
+    """Absolute UTC expiry from Cache-Control max-age (less Age), or None"""
+    match = re.search(r"max-age=(\d+)", headers.get("Cache-Control") or "")
+    if not match:
+        return None
+    lifetime = int(match.group(1)) - int(headers.get("Age") or 0)
+    return (datetime.now(timezone.utc) + timedelta(seconds=max(lifetime, 0))).isoformat()
+
+def save_cached_json(url, data, headers, previous=None):
+    path = key_cache_path(url)
+    previous = previous or {}
+    entry = {"url": url, "data": data,
+             "etag": headers.get("ETag") or previous.get("etag"),
+             "last_modified": headers.get("Last-Modified") or previous.get("last_modified"),
+             "expires": cache_control_expiry(headers),
+             "fetched": datetime.now().isoformat()}
+    with open_private_file(path + ".tmp", encoding="utf-8") as cache_file:
+        json.dump(entry, cache_file)
+    os.replace(path + ".tmp", path)
+
+def fetch_json(url, timeout=KEY_FETCH_TIMEOUT, cache=False):
+    """GET a JSON document; with cache=True, revalidate the on-disk copy via ETag/If-Modified-Since.
+    
+    Returns the parsed document. A 304 response returns the cached copy.
+    """
+    entry = load_cached_json(url) if cache else None
+    request = urllib.request.Request(url)
+    if entry:
+        if entry.get("etag"):
+            request.add_header("If-None-Match", entry["etag"])
+        if entry.get("last_modified"):
+            request.add_header("If-Modified-Since", entry["last_modified"])
+    
+    ctx = ssl.create_default_context(cafile=certifi.where())
+    try:
+        with urllib.request.urlopen(request, context=ctx, timeout=timeout) as response:
+            data = json.loads(response.read().decode('utf-8'))
+            headers = response.headers
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and entry:
+            save_cached_json(url, entry["data"], e.headers, previous=entry)  # picks up the new max-age
+            return entry["data"]
+        raise
+    if cache:
+        save_cached_json(url, data, headers)
+    return data
+
+def revalidate_cached_json(urls):
+    """Refresh cached documents in the background; changes take effect on the next launch"""
+    for url in urls:
+        entry = load_cached_json(url)
+        try:
+            if fetch_json(url, cache=True) != (entry or {}).get("data"):
+                logging.info(f"Cached key for {urlparse(url).netloc} was updated; the new key is used from the next launch.")
+        except Exception as e:
+            logging.warning(f"Could not revalidate cached key from {urlparse(url).netloc}: {e}")
+
+# Token Verification
+ID_TOKEN_CERT_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+TOKEN_CERT_REFRESH_AHEAD = timedelta(minutes=30)  # refresh in the background this close to expiry
+TOKEN_CERT_FETCH_TIMEOUT = 10
+
+class CachedTokenVerifier:
+    """Verifies Firebase ID tokens against signing certificates cached on disk.
+    
+    The certificates are reused until their Cache-Control expiry and refreshed in
+    the background shortly before it; a token signed with a key the cached copy
+    lacks triggers one refresh, since Google rotates keys. Expired certificates are
+    never used unless stale_grace opts in to accepting them for that long after a
+    failed refresh. Raises auth.ExpiredIdTokenError / auth.InvalidIdTokenError like
+    auth.verify_id_token.
+    """
+
+    def __init__(self, project_id, cert_url=ID_TOKEN_CERT_URL, stale_grace=timedelta(0)):
+        self.project_id = project_id
+        self.cert_url = cert_url
+        self.stale_grace = stale_grace
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self):
+        with self._refresh_lock:
+            return fetch_json(self.cert_url, timeout=TOKEN_CERT_FETCH_TIMEOUT, cache=True)
+
+    def refresh_in_background(self, load=None):
+        def run():
+            try:
+                (load or self.refresh)()
+            except Exception as e:
+                logging.warning(f"Background refresh of token certificates failed: {e}")
+        threading.Thread(target=run, daemon=True).start()
+
+    def warm_up(self):
+        """Make sure usable certificates are cached, off the GUI thread (e.g. during login)"""
+        self.refresh_in_background(load=self.certificates)
+
+    def certificates(self):
+        entry = load_cached_json(self.cert_url)
+        expires = datetime.fromisoformat(entry["expires"]) if entry and entry.get("expires") else None
+        now = datetime.now(timezone.utc)
+        if expires and now < expires:
+            if expires - now < TOKEN_CERT_REFRESH_AHEAD:
+                self.refresh_in_background()
+            return entry["data"]
+        try:
+            return self.refresh()
+        except Exception as e:
+            if expires and self.stale_grace and now < expires + self.stale_grace:
+                logging.warning(f"Could not refresh token certificates ({e}); using cached copy that expired at {expires}.")
+                return entry["data"]
+            raise
+
+    def verify(self, token):
+        """Decoded claims of a valid ID token, with "uid" set like auth.verify_id_token"""
+        google_jwt = importlib.import_module("google.auth.jwt")
+        try:
+            unverified = google_jwt.decode(token, verify=False)
+        except Exception as e:
+            raise auth.InvalidIdTokenError(f"Malformed ID token: {e}")
+        if unverified.get("exp", 0) < time.time():
+            raise auth.ExpiredIdTokenError("The Firebase ID token has expired.", None)
+        
+        try:
+            certs = self.certificates()
+            if google_jwt.decode_header(token).get("kid") not in certs:
+                certs = self.refresh()  # signed with a key newer than the cached copy
+            claims = google_jwt.decode(token, certs=certs, audience=self.project_id)
+        except Exception as e:
+            raise auth.InvalidIdTokenError(f"ID token verification failed: {e}")
+        if claims.get("iss") != f"https://securetoken.google.com/{self.project_id}":
+            raise auth.InvalidIdTokenError(f"ID token has incorrect issuer: {claims.get('iss')}")
+        if not claims.get("sub") or len(claims["sub"]) > 128:
+            raise auth.InvalidIdTokenError("ID token has an invalid subject.")
+        if claims.get("auth_time", 0) > time.time():
+            raise auth.InvalidIdTokenError("ID token has an auth_time in the future.")
+        claims["uid"] = claims["sub"]
+        return claims
+
+# Analytics Computation
+ATTENDANCE_DAYS = ("day1", "day2", "day3")
+ANALYTICS_FIELDS = ("finalCommittee", "school", "createdAt", "updatedAt")
+ATTENDANCE_PATTERN_DESCRIPTIONS = {
+    "PPP": "Perfect Attendance",
+    "PPA": "Missed Day 3",
+    "PAP": "Missed Day 2",
+    "APP": "Missed Day 1",
+    "PAA": "Only Day 1",
+    "APA": "Only Day 2",
+    "AAP": "Only Day 3",
+    "AAA": "Absent All Days"
+}
+ANALYTICS_CANCEL_CHECK_EVERY = 1000
+
+TIMELINE_DAILY_MAX_SPAN_DAYS = 60
+
+@dataclass(frozen=True)
+class RegistrationTimeline:
+    """Registrations bucketed by day (short spans) or week (long spans)"""
+    granularity: str         # "day" or "week"
+    buckets: tuple           # ((period_label, count, running_total), ...) oldest first
+    peak_period: str
+    peak_count: int
+    average_daily: float
+    undated: int
+
+def registration_timestamp(data):
+    """Best available registration time for a document, or None"""
+    for field in ("createdAt", "updatedAt"):
+        value = data.get(field)
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, str) and value:
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                continue
+    return None
+
+def build_registration_timeline(timestamps, undated=0):
+    """Sort timestamps once and bucket them in a single sweep, filling empty periods"""
+    if not timestamps:
+        return RegistrationTimeline("day", (), "", 0, 0.0, undated)
+    
+    dates = sorted(ts.astimezone().date() for ts in timestamps)
+    span_days = (dates[-1] - dates[0]).days + 1
+    if span_days <= TIMELINE_DAILY_MAX_SPAN_DAYS:
+        granularity, step = "day", timedelta(days=1)
+        period_start = lambda d: d
+        label = lambda d: d.strftime("%Y-%m-%d")
+    else:
+        granularity, step = "week", timedelta(weeks=1)
+        period_start = lambda d: d - timedelta(days=d.weekday())
+        label = lambda d: f"Week of {d.strftime('%Y-%m-%d')}"
+    
+    buckets = []
+    running_total = 0
+    current = period_start(dates[0])
+    count = 0
+    for d in dates:
+        start = period_start(d)
+        while start > current:
+            running_total += count
+            buckets.append((label(current), count, running_total))
+            current += step
+            count = 0
+        count += 1
+    running_total += count
+    buckets.append((label(current), count, running_total))
+    
+    peak_period, peak_count, _ = max(buckets, key=lambda b: b[1])
+    return RegistrationTimeline(
+        granularity=granularity,
+        buckets=tuple(buckets),
+        peak_period=peak_period,
+        peak_count=peak_count,
+        average_daily=len(dates) / span_days,
+        undated=undated
+    )
+
+@dataclass(frozen=True)
+class AnalyticsResult:
+    """Immutable snapshot of every aggregate shown on the Analytics tab"""
+    total_registrations: int
+    active_committees: int
+    participating_schools: int
+    committee_counts: tuple  # ((committee, count), ...) sorted by count desc
+    school_counts: tuple     # ((school, count), ...) sorted by count desc
+    day_stats: tuple         # ((day, present_count), ...) in ATTENDANCE_DAYS order
+    pattern_counts: tuple    # ((pattern, count), ...) sorted by count desc
+    total_present_days: int
+    timeline: RegistrationTimeline
+
+    @property
+    def overall_attendance_rate(self):
+        total_possible_days = self.total_registrations * len(ATTENDANCE_DAYS)
+        return (self.total_present_days / total_possible_days * 100) if total_possible_days > 0 else 0
+
+def compute_analytics(store, attendance_data, is_cancelled=None):
+    """Aggregate a ColumnarStore of registrations and the attendance records.
+    
+    Returns None if is_cancelled() becomes true part-way through.
+    """
+    committee_counts = store.group_counts("finalCommittee", "Unassigned")
+    school_counts = store.group_counts("school", "Unknown")
+    timestamps = [ts for ts in store.derived("registeredAt", registration_timestamp) if ts is not None]
+    undated = len(store) - len(timestamps)
+    
+    day_stats = {day: 0 for day in ATTENDANCE_DAYS}
+    patterns = {}
+    for i, attendance in enumerate(attendance_data.values()):
+        if is_cancelled and i % ANALYTICS_CANCEL_CHECK_EVERY == 0 and is_cancelled():
+            return None
+        attendance = attendance or {}  # an empty record is absent every day ("AAA")
+        pattern_chars = []
+        for day in ATTENDANCE_DAYS:
+            is_present = bool(attendance.get(day, False))
+            pattern_chars.append("P" if is_present else "A")
+            if is_present:
+                day_stats[day] += 1
+        pattern = "".join(pattern_chars)
+        patterns[pattern] = patterns.get(pattern, 0) + 1
+    
+    by_count = lambda x: x[1]
+    return AnalyticsResult(
+        total_registrations=len(store) + store.empty_docs,
+        active_committees=store.distinct_present("finalCommittee"),
+        participating_schools=store.distinct_present("school"),
+        committee_counts=tuple(sorted(committee_counts.items(), key=by_count, reverse=True)),
+        school_counts=tuple(sorted(school_counts.items(), key=by_count, reverse=True)),
+        day_stats=tuple(day_stats.items()),
+        pattern_counts=tuple(sorted(patterns.items(), key=by_count, reverse=True)),
+        total_present_days=sum(day_stats.values()),
+        timeline=build_registration_timeline(timestamps, undated)
+    )
+
+# Startup Pipeline
+def load_conference_data(client, collection_name):
+    """(registrations, attendance) dicts for a collection; attendance failures are non-fatal"""
+    # References are made on the calling thread so metering sees the caller's feature
+    registrations_ref = client.collection(collection_name)
+    attendance_ref = client.collection("attendance")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        registrations = executor.submit(lambda: {
+            doc.id: doc.to_dict() for doc in registrations_ref.stream() if doc.exists
+        })
+        attendance = executor.submit(lambda: {
+            doc.id: doc.to_dict() for doc in attendance_ref.stream() if doc.exists
+        })
+        try:
+            attendance_data = attendance.result()
+            logging.info(f"Loaded {len(attendance_data)} attendance records.")
+        except Exception as e:
+            logging.warning(f"Could not load attendance data: {e}")
+            attendance_data = {}
+        return registrations.result(), attendance_data
+
+class StartupTimer:
+    """Wall-clock timings of startup phases, logged as they complete"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []
+
+    def record(self, name, seconds):
+        self.phases.append((name, seconds))  # list.append is atomic; prefetch records from its thread
+        PERF.record(f"startup.{name}", seconds)
+        logging.info(f"Startup phase '{name}' took {seconds * 1000:.0f} ms")
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def log_summary(self):
+        total = time.perf_counter() - self.started
+        breakdown = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases)
+        logging.info(f"Startup finished in {total * 1000:.0f} ms ({breakdown})")
+
+# Dataset Cache
+DATASET_CACHE_SIZE = 4  # conference datasets kept in memory for switching back without a reload
+
+@dataclass
+class CachedDataset:
+    key_url: str
+    collection_name: str
+    registrations: dict
+    attendance: dict
+    watermarks: dict   # collection name -> newest updatedAt seen, where the next delta sync starts
+    synced_at: datetime
+
+    @property
+    def key(self):
+        return (self.key_url, self.collection_name)
+
+def newest_update(docs):
+    """Latest updatedAt among docs (UTC), or None"""
+    newest = None
+    for data in docs.values():
+        updated = as_utc(data.get("updatedAt")) if data else None
+        if updated is not None and (newest is None or updated > newest):
+            newest = updated
+    return newest
+
+def cached_dataset(key_url, collection_name, registrations, attendance):
+    return CachedDataset(key_url, collection_name, registrations, attendance,
+                         {collection_name: newest_update(registrations), "attendance": newest_update(attendance)},
+                         datetime.now(timezone.utc))
+
+def dataset_sync_states(dataset):
+    """{collection: export-delta state} snapshot of a dataset, for fetch_dataset_changes().
+    
+    Take it on the thread that owns the dataset; the fetch then never touches the live dicts.
+    """
+    sources = ((dataset.collection_name, dataset.registrations), ("attendance", dataset.attendance))
+    return {name: {"watermark": dataset.watermarks.get(name), "ids": set(docs),
+                   "boundary_ids": ids_updated_at(docs, dataset.watermarks.get(name))} for name, docs in sources}
+
+def fetch_dataset_changes(client, states):
+    """{collection: (changes, watermark)} since a dataset_sync_states() snapshot.
+    
+    Only documents updated after each watermark are downloaded, plus the IDs of the rest.
+    """
+    with ThreadPoolExecutor(max_workers=len(states)) as executor:
+        fetched = {name: executor.submit(fetch_export_delta_source, client, name, state)
+                   for name, state in states.items()}
+        return {name: compute_export_delta(*fetched[name].result(), states[name]) for name in states}
+
+def apply_dataset_changes(dataset, result, skip_ids=()):
+    """Apply fetch_dataset_changes() output in place; returns the number of documents changed.
+    
+    Registrations in skip_ids (unsaved local edits) are left alone.
+    """
+    applied = 0
+    for name, (changes, watermark) in result.items():
+        docs = dataset.attendance if name == "attendance" else dataset.registrations
+        for change, doc_id, data in changes:
+            if name != "attendance" and doc_id in skip_ids:
+                continue
+            if change == CHANGE_REMOVED:
+                docs.pop(doc_id, None)
+            else:
+                docs[doc_id] = data
+            applied += 1
+        dataset.watermarks[name] = watermark
+    dataset.synced_at = datetime.now(timezone.utc)
+    return applied
+
+class DatasetCache:
+    """Least-recently-used conference datasets keyed by (key_url, collection).
+    
+    With a directory, datasets leaving memory (and every one on persist()) are written
+    there as gzip JSON, so they survive restarts; they hold delegates' personal data,
+    so the directory and files are readable by this user only.
+    """
+
+    def __init__(self, capacity=DATASET_CACHE_SIZE, directory=None):
+        self.capacity = max(1, capacity)
+        self.directory = directory
+        self.entries = OrderedDict()
+        if directory:
+            os.chmod(directory, 0o700)
+
+    def path(self, key_url, collection_name):
+        digest = hashlib.sha1(f"{key_url}\n{collection_name}".encode("utf-8")).hexdigest()[:16]
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", collection_name).strip("_")
+        return os.path.join(self.directory, f"{slug}-{digest}.json.gz")
+
+    def get(self, key_url, collection_name):
+        key = (key_url, collection_name)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        if self.directory:
+            dataset = self.load(key_url, collection_name)
+            if dataset is not None:
+                self.put(dataset)
+                return dataset
+        return None
+
+    def put(self, dataset):
+        self.entries[dataset.key] = dataset
+        self.entries.move_to_end(dataset.key)
+        while len(self.entries) > self.capacity:
+            _, evicted = self.entries.popitem(last=False)
+            logging.info(f"Dataset cache evicted '{evicted.collection_name}' ({evicted.key_url})")
+            if self.directory:
+                self.save(evicted)
+
+    def discard(self, key_url, collection_name):
+        self.entries.pop((key_url, collection_name), None)
+
+    def save(self, dataset):
+        path = self.path(dataset.key_url, dataset.collection_name)
+        record = {
+            "key_url": dataset.key_url,
+            "collection": dataset.collection_name,
+            "watermarks": {name: mark.isoformat() if mark else None for name, mark in dataset.watermarks.items()},
+            "synced_at": dataset.synced_at.isoformat(),
+            "registrations": encode_backup_value(dataset.registrations),
+            "attendance": encode_backup_value(dataset.attendance),
+        }
+        with open_private_file(path + ".tmp", "wb") as raw_file:
+            with gzip.open(raw_file, "wt", encoding="utf-8") as out_file:
+                json.dump(record, out_file, default=json_default)
+        os.replace(path + ".tmp", path)
+
+    def load(self, key_url, collection_name):
+        try:
+            with gzip.open(self.path(key_url, collection_name), "rt", encoding="utf-8") as in_file:
+                record = json.load(in_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable cached dataset for '{collection_name}': {e}")
+            return None
+        return CachedDataset(key_url, collection_name,
+                             decode_backup_value(record["registrations"]), decode_backup_value(record["attendance"]),
+                             {name: datetime.fromisoformat(mark) if mark else None
+                              for name, mark in record["watermarks"].items()},
+                             datetime.fromisoformat(record["synced_at"]))
+
+    def persist(self):
+        if not self.directory:
+            return
+        for dataset in self.entries.values():
+            try:
+                self.save(dataset)
+            except Exception as e:
+                logging.error(f"Could not save cached dataset '{dataset.collection_name}': {e}")
+
+def firestore_client_for_key(key_url):
+    """Metered client for the project behind a service key URL; each key gets its own Firebase app"""
+    name = "dataset-" + hashlib.sha1(key_url.encode("utf-8")).hexdigest()[:12]
+    try:
+        app = firebase_admin.get_app(name)
+    except ValueError:
+        app = firebase_admin.initialize_app(credentials.Certificate(fetch_json(key_url, cache=True)), name=name)
+    return MeteredClient(firestore.client(app))
+
+# In-Memory Firestore
+FAKE_FIRESTORE_ID_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+_FAKE_DELETED = object()  # DELETE_FIELD after sentinel resolution
+
+class FakeFirestoreError(Exception):
+    """Injected or emulated failure; code is the gRPC status a real client would report"""
+
+    def __init__(self, message, code="UNAVAILABLE"):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+
+class FakeChangeType(enum.Enum):
+    # Same names and values as google.cloud.firestore_v1.watch.ChangeType
+    ADDED = 1
+    REMOVED = 2
+    MODIFIED = 3
+
+@dataclass
+class FakeDocumentChange:
+    type: FakeChangeType
+    document: "FakeDocumentSnapshot"
+    old_index: int
+    new_index: int
+
+@dataclass
+class FakeWriteResult:
+    update_time: datetime
+
+@dataclass
+class _StoredDocument:
+    data: dict
+    create_time: datetime
+    update_time: datetime
+
+def _fake_copy(value):
+    if isinstance(value, dict):
+        return {key: _fake_copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fake_copy(item) for item in value]
+    return value
+
+def _fake_store_value(value, now):
+    """Copy of value as Firestore would store it: sentinels resolved, datetimes in UTC"""
+    if isinstance(value, dict):
+        return {key: _fake_store_value(item, now) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_fake_store_value(item, now) for item in value]
+    if isinstance(value, datetime):
+        # Like the SDK, naive datetimes are taken to be UTC
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if value is _FAKE_SERVER_TIMESTAMP:
+        return now
+    if firebase_sdk_loaded() and type(value).__name__ == "Sentinel":
+        if value is firestore.SERVER_TIMESTAMP:
+            return now
+        if value is firestore.DELETE_FIELD:
+            return _FAKE_DELETED
+    return value
+
+def _fake_merge(target, updates):
+    for key, value in updates.items():
+        if value is _FAKE_DELETED:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _fake_merge(target[key], value)
+        else:
+            target[key] = value
+
+def _fake_field(data, field_path):
+    """(found, value) for a dotted field path"""
+    value = data
+    for part in field_path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return False, None
+        value = value[part]
+    return True, value
+
+def _fake_sort_key(value):
+    """Firestore's cross-type ordering: null < bool < number < timestamp < string < bytes < array < map"""
+    if value is None:
+        return (0,)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (3, value if value.tzinfo else value.replace(tzinfo=timezone.utc))
+    if isinstance(value, str):
+        return (4, value)
+    if isinstance(value, bytes):
+        return (5, value)
+    if isinstance(value, (list, tuple)):
+        return (7, tuple(_fake_sort_key(item) for item in value))
+    if isinstance(value, dict):
+        return (8, tuple((key, _fake_sort_key(item)) for key, item in sorted(value.items())))
+    return (6, str(value))
+
+def _fake_matches(found, value, op, operand):
+    if op in ("!=", "not-in"):
+        if not found or value is None:
+            return False
+        key = _fake_sort_key(value)
+        operands = operand if op == "not-in" else [operand]
+        return all(key != _fake_sort_key(item) for item in operands)
+    if not found:
+        return False
+    key = _fake_sort_key(value)
+    if op == "==":
+        return key == _fake_sort_key(operand)
+    if op == "in":
+        return any(key == _fake_sort_key(item) for item in operand)
+    if op == "array-contains":
+        return isinstance(value, list) and any(_fake_sort_key(item) == _fake_sort_key(operand) for item in value)
+    if op == "array-contains-any":
+        wanted = {_fake_sort_key(item) for item in operand}
+        return isinstance(value, list) and any(_fake_sort_key(item) in wanted for item in value)
+    other = _fake_sort_key(operand)
+    if key[0] != other[0]:
+        return False  # range filters only match values of the same type
+    if op == "<":
+        return key < other
+    if op == "<=":
+        return key <= other
+    if op == ">":
+        return key > other
+    if op == ">=":
+        return key >= other
+    raise FakeFirestoreError(f"Unsupported filter operator {op!r}", "INVALID_ARGUMENT")
+
+class FakeDocumentSnapshot:
+    def __init__(self, reference, data, create_time=None, update_time=None, read_time=None):
+        self.reference = reference
+        self._data = data
+        self.create_time = create_time
+        self.update_time = update_time
+        self.read_time = read_time
+
+    @property
+    def id(self):
+        return self.reference.id
+
+    @property
+    def exists(self):
+        return self._data is not None
+
+    def to_dict(self):
+        return _fake_copy(self._data) if self._data is not None else None
+
+    def get(self, field_path):
+        found, value = _fake_field(self._data or {}, field_path)
+        if not found:
+            raise KeyError(field_path)
+        return _fake_copy(value)
+
+class FakeDocumentReference:
+    def __init__(self, client, path):
+        self._client = client
+        self.path = path
+
+    def __eq__(self, other):
+        return isinstance(other, FakeDocumentReference) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def __repr__(self):
+        return f"FakeDocumentReference({self.path!r})"
+
+    @property
+    def id(self):
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def parent(self):
+        return FakeCollectionReference(self._client, self.path.rsplit("/", 1)[0])
+
+    def collection(self, collection_id):
+        return FakeCollectionReference(self._client, f"{self.path}/{collection_id}")
+
+    def get(self, field_paths=None, transaction=None):
+        return self._client.get_all([self], field_paths)[0]
+
+    def create(self, document_data):
+        return self._client._commit([("create", self, document_data)], "create")[0]
+
+    def set(self, document_data, merge=False):
+        return self._client._commit([("merge" if merge else "set", self, document_data)], "set")[0]
+
+    def update(self, field_updates):
+        return self._client._commit([("update", self, field_updates)], "update")[0]
+
+    def delete(self):
+        return self._client._commit([("delete", self, None)], "delete")[0]
+
+    def on_snapshot(self, callback):
+        return self._client._listen(self, callback)
+
+class FakeQuery:
+    ASCENDING = "ASCENDING"
+    DESCENDING = "DESCENDING"
+
+    def __init__(self, client, collection_path, filters=(), orders=(), limit=None, offset=0,
+                 cursor=None, projection=None):
+        self._client = client
+        self._path = collection_path
+        self._filters = filters
+        self._orders = orders
+        self._limit = limit
+        self._offset = offset
+        self._cursor = cursor  # (values, inclusive)
+        self._projection = projection
+
+    def _copy(self, **changes):
+        fields = dict(filters=self._filters, orders=self._orders, limit=self._limit, offset=self._offset,
+                      cursor=self._cursor, projection=self._projection)
+        fields.update(changes)
+        return FakeQuery(self._client, self._path, **fields)
+
+    def where(self, field_path=None, op_string=None, value=None, *, filter=None):
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        return self._copy(filters=self._filters + ((field_path, op_string, value),))
+
+    def order_by(self, field_path, direction=ASCENDING):
+        return self._copy(orders=self._orders + ((field_path, direction == self.DESCENDING),))
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def offset(self, num_to_skip):
+        return self._copy(offset=num_to_skip)
+
+    def select(self, field_paths):
+        return self._copy(projection=tuple(field_paths))
+
+    def start_at(self, document_fields_or_snapshot):
+        return self._copy(cursor=(document_fields_or_snapshot, True))
+
+    def start_after(self, document_fields_or_snapshot):
+        return self._copy(cursor=(document_fields_or_snapshot, False))
+
+    def _order_key(self, doc_id, data):
+        return [_fake_sort_key(doc_id if field == "__name__" else _fake_field(data, field)[1])
+                for field, _ in self._orders] + [_fake_sort_key(doc_id)]
+
+    def _cursor_key(self):
+        position, _ = self._cursor
+        if isinstance(position, FakeDocumentSnapshot):
+            return self._order_key(position.id, position._data or {})
+        if isinstance(position, dict):
+            return [_fake_sort_key(position.get(field)) for field, _ in self._orders]
+        return [_fake_sort_key(value) for value in position]
+
+    def _compare(self, key, other):
+        for index, (a, b) in enumerate(zip(key, other)):
+            if a != b:
+                descending = index < len(self._orders) and self._orders[index][1]
+                return (-1 if a < b else 1) * (-1 if descending else 1)
+        return 0
+
+    def _run(self, documents):
+        """[(doc_id, stored)] for this query over a {doc_id: _StoredDocument} collection"""
+        if not self._filters and all(field == "__name__" and not descending for field, descending in self._orders):
+            return self._run_by_id(documents)
+        results = []
+        for doc_id, stored in documents.items():
+            if all(_fake_matches(*_fake_field(stored.data, field), op, value) for field, op, value in self._filters) \
+                    and all(field == "__name__" or _fake_field(stored.data, field)[0] for field, _ in self._orders):
+                results.append((self._order_key(doc_id, stored.data), doc_id, stored))
+        if any(descending for _, descending in self._orders):
+            results.sort(key=functools.cmp_to_key(lambda a, b: self._compare(a[0], b[0])))
+        else:
+            results.sort(key=lambda row: row[0])
+        if self._cursor is not None:
+            cursor_key, inclusive = self._cursor_key(), self._cursor[1]
+            results = [row for row in results
+                       if (self._compare(row[0][:len(cursor_key)], cursor_key) >= (0 if inclusive else 1))]
+        results = results[self._offset:]
+        if self._limit is not None:
+            results = results[:self._limit]
+        return [(doc_id, stored) for _, doc_id, stored in results]
+
+    def _run_by_id(self, documents):
+        """Unfiltered scan in document ID order, the shape of every paged export, via the sorted ID index"""
+        doc_ids = self._client._sorted_ids(self._path)
+        start = 0
+        if self._cursor is not None:
+            position, inclusive = self._cursor
+            if isinstance(position, FakeDocumentSnapshot):
+                position = position.id
+            elif isinstance(position, dict):
+                position = position.get("__name__")
+            elif isinstance(position, (list, tuple)):
+                position = position[0]
+            position = getattr(position, "id", position)
+            start = (bisect.bisect_left if inclusive else bisect.bisect_right)(doc_ids, position)
+        start += self._offset
+        end = len(doc_ids) if self._limit is None else start + self._limit
+        return [(doc_id, documents[doc_id]) for doc_id in doc_ids[start:end]]
+
+    def _project(self, data):
+        if self._projection is None:
+            return data
+        projected = {}
+        for field in self._projection:
+            found, value = _fake_field(data, field)
+            if found:
+                _fake_merge(projected, functools.reduce(lambda inner, part: {part: inner},
+                                                        reversed(field.split(".")), value))
+        return projected
+
+    def stream(self, transaction=None):
+        return iter(self._client._query(self))
+
+    def get(self, transaction=None):
+        return self._client._query(self)
+
+    def on_snapshot(self, callback):
+        return self._client._listen(self, callback)
+
+class FakeCollectionReference(FakeQuery):
+    def __init__(self, client, path):
+        super().__init__(client, path)
+
+    @property
+    def id(self):
+        return self._path.rsplit("/", 1)[-1]
+
+    def document(self, document_id=None):
+        if document_id is None:
+            document_id = "".join(random.choices(FAKE_FIRESTORE_ID_ALPHABET, k=20))
+        return FakeDocumentReference(self._client, f"{self._path}/{document_id}")
+
+    def add(self, document_data, document_id=None):
+        ref = self.document(document_id)
+        return ref.create(document_data).update_time, ref
+
+    def list_documents(self):
+        with self._client._lock:
+            return [self.document(doc_id) for doc_id in self._client._collections.get(self._path, {})]
+
+class FakeWriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._writes = []
+
+    def __len__(self):
+        return len(self._writes)
+
+    def create(self, reference, document_data):
+        self._writes.append(("create", reference, document_data))
+
+    def set(self, reference, document_data, merge=False):
+        self._writes.append(("merge" if merge else "set", reference, document_data))
+
+    def update(self, reference, field_updates):
+        self._writes.append(("update", reference, field_updates))
+
+    def delete(self, reference):
+        self._writes.append(("delete", reference, None))
+
+    def commit(self):
+        if len(self._writes) > FIRESTORE_BATCH_LIMIT:
+            raise FakeFirestoreError(f"maximum {FIRESTORE_BATCH_LIMIT} writes allowed per request",
+                                     "INVALID_ARGUMENT")
+        writes, self._writes = self._writes, []
+        return self._client._commit(writes, "commit")
+
+class _FakeWatch:
+    def __init__(self, client, target, callback):
+        self._client = client
+        self.target = target
+        self.callback = callback
+        self.known = {}  # doc_id -> update_time last delivered
+
+    def covers(self, path):
+        if isinstance(self.target, FakeDocumentReference):
+            return path == self.target.path
+        return path.rsplit("/", 1)[0] == self.target._path
+
+    def unsubscribe(self):
+        with self._client._lock:
+            if self in self._client._watches:
+                self._client._watches.remove(self)
+
+class FakeFirestore:
+    """Thread-safe in-memory stand-in for the subset of firestore.Client this app uses.
+    
+    Every call that would be an RPC (get, get_all, query, commit and the single
+    document writes) sleeps for latency plus up to jitter seconds and then
+    fails with FakeFirestoreError at failure_rate, or when fail_next() queued a
+    failure for it. Writes are applied atomically; listeners are called on a
+    separate thread, like the real watch stream.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._collections = {}  # collection path -> {doc_id: _StoredDocument}
+        self._id_index = {}  # collection path -> sorted doc IDs, dropped when the collection changes
+        self._watches = []
+        self._planned_failures = []  # [operation or None, code]
+        self._events = None
+        self.rpc_counts = {}
+        self.failures = 0
+        self.document_writes = {}  # document path -> committed writes, for spotting hot documents
+
+    @classmethod
+    def with_data(cls, collections, **options):
+        """A fake holding {collection_path: {doc_id: data}}; seeding is free of latency and failures"""
+        client = cls(**options)
+        now = datetime.now(timezone.utc)
+        for path, documents in collections.items():
+            client._collections[path] = {
+                doc_id: _StoredDocument(_fake_store_value(data, now), now, now) for doc_id, data in documents.items()
+            }
+        return client
+
+    def dump(self, collection_path):
+        """{doc_id: data} for a collection, bypassing latency and failures"""
+        with self._lock:
+            return {doc_id: _fake_copy(stored.data) for doc_id, stored in self._collections.get(collection_path, {}).items()}
+
+    def fail_next(self, operation=None, count=1, code="UNAVAILABLE"):
+        """Make the next count RPCs of operation ("commit", "query", "get_all", "set", …; None for any) fail"""
+        with self._lock:
+            self._planned_failures.extend([[operation, code]] * count)
+
+    def collection(self, collection_path):
+        return FakeCollectionReference(self, collection_path)
+
+    def document(self, document_path):
+        return FakeDocumentReference(self, document_path)
+
+    def batch(self):
+        return FakeWriteBatch(self)
+
+    def get_all(self, references, field_paths=None, transaction=None):
+        references = list(references)
+        self._rpc("get_all")
+        read_time = datetime.now(timezone.utc)
+        with self._lock:
+            snapshots = []
+            for ref in references:
+                collection_path, doc_id = ref.path.rsplit("/", 1)
+                stored = self._collections.get(collection_path, {}).get(doc_id)
+                data = stored.data if stored else None
+                if data is not None and field_paths is not None:
+                    data = FakeQuery(self, collection_path, projection=tuple(field_paths))._project(data)
+                snapshots.append(FakeDocumentSnapshot(ref, _fake_copy(data), stored and stored.create_time,
+                                                      stored and stored.update_time, read_time))
+            return snapshots
+
+    def _sorted_ids(self, collection_path):
+        doc_ids = self._id_index.get(collection_path)
+        if doc_ids is None:
+            doc_ids = self._id_index[collection_path] = sorted(self._collections.get(collection_path, {}))
+        return doc_ids
+
+    def _rpc(self, operation):
+        with self._lock:
+            self.rpc_counts[operation] = self.rpc_counts.get(operation, 0) + 1
+            code = None
+            for planned in self._planned_failures:
+                if planned[0] in (None, operation):
+                    self._planned_failures.remove(planned)
+                    code = planned[1]
+                    break
+            if code is None and self.failure_rate and self._random.random() < self.failure_rate:
+                code = "UNAVAILABLE"
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            if code:
+                self.failures += 1
+        if delay > 0:
+            time.sleep(delay)
+        if code:
+            raise FakeFirestoreError(f"injected failure in {operation}", code)
+
+    def _query(self, query):
+        self._rpc("query")
+        read_time = datetime.now(timezone.utc)
+        with self._lock:
+            return [
+                FakeDocumentSnapshot(FakeDocumentReference(self, f"{query._path}/{doc_id}"),
+                                     _fake_copy(query._project(stored.data)), stored.create_time,
+                                     stored.update_time, read_time)
+                for doc_id, stored in query._run(self._collections.get(query._path, {}))
+            ]
+
+    def _commit(self, writes, operation):
+        self._rpc(operation)
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            # Apply to an overlay first so a failing write leaves nothing behind
+            pending = {}
+            for op, ref, data in writes:
+                collection_path, doc_id = ref.path.rsplit("/", 1)
+                current = pending[ref.path] if ref.path in pending else \
+                    self._collections.get(collection_path, {}).get(doc_id)
+                if op == "delete":
+                    pending[ref.path] = None
+                    continue
+                if op == "create" and current is not None:
+                    raise FakeFirestoreError(f"Document already exists: {ref.path}", "ALREADY_EXISTS")
+                if op == "update" and current is None:
+                    raise FakeFirestoreError(f"No document to update: {ref.path}", "NOT_FOUND")
+                values = _fake_store_value(data, now)
+                if op == "update":
+                    new_data = _fake_copy(current.data)
+                    for field_path, value in values.items():
+                        *parents, leaf = field_path.split(".")
+                        target = new_data
+                        for part in parents:
+                            if not isinstance(target.get(part), dict):
+                                target[part] = {}
+                            target = target[part]
+                        if value is _FAKE_DELETED:
+                            target.pop(leaf, None)
+                        else:
+                            target[leaf] = value
+                elif op == "merge":
+                    new_data = _fake_copy(current.data) if current else {}
+                    _fake_merge(new_data, values)
+                else:
+                    new_data = {key: value for key, value in values.items() if value is not _FAKE_DELETED}
+                pending[ref.path] = _StoredDocument(new_data, current.create_time if current else now, now)
+            
+            for path, stored in pending.items():
+                collection_path, doc_id = path.rsplit("/", 1)
+                documents = self._collections.setdefault(collection_path, {})
+                if stored is None:
+                    if documents.pop(doc_id, None) is not None:
+                        self._id_index.pop(collection_path, None)
+                else:
+                    if doc_id not in documents:
+                        self._id_index.pop(collection_path, None)
+                    documents[doc_id] = stored
+                self.document_writes[path] = self.document_writes.get(path, 0) + 1
+            for watch in list(self._watches):
+                if any(watch.covers(path) for path in pending):
+                    self._deliver(watch)
+        return [FakeWriteResult(now) for _ in writes]
+
+    def _listen(self, target, callback):
+        watch = _FakeWatch(self, target, callback)
+        with self._lock:
+            self._watches.append(watch)
+            self._deliver(watch)
+        return watch
+
+    def _deliver(self, watch):
+        """Queue the watch's current view and what changed since it was last delivered (lock held)"""
+        read_time = datetime.now(timezone.utc)
+        if isinstance(watch.target, FakeDocumentReference):
+            collection_path, doc_id = watch.target.path.rsplit("/", 1)
+            rows = [(doc_id, self._collections.get(collection_path, {}).get(doc_id))]
+        else:
+            collection_path = watch.target._path
+            rows = watch.target._run(self._collections.get(collection_path, {}))
+        snapshots = [
+            FakeDocumentSnapshot(FakeDocumentReference(self, f"{collection_path}/{doc_id}"),
+                                 _fake_copy(stored.data) if stored else None,
+                                 stored and stored.create_time, stored and stored.update_time, read_time)
+            for doc_id, stored in rows
+        ]
+        
+        previous = watch.known
+        current = {snap.id: snap.update_time for snap in snapshots if snap.exists}
+        old_order = list(previous)
+        changes = [
+            FakeDocumentChange(FakeChangeType.REMOVED,
+                               FakeDocumentSnapshot(FakeDocumentReference(self, f"{collection_path}/{doc_id}"),
+                                                    None, read_time=read_time),
+                               old_order.index(doc_id), -1)
+            for doc_id in previous if doc_id not in current
+        ]
+        for index, snap in enumerate(snap for snap in snapshots if snap.exists):
+            if snap.id not in previous:
+                changes.append(FakeDocumentChange(FakeChangeType.ADDED, snap, -1, index))
+            elif previous[snap.id] != snap.update_time:
+                changes.append(FakeDocumentChange(FakeChangeType.MODIFIED, snap, old_order.index(snap.id), index))
+        watch.known = current
+        
+        if self._events is None:
+            self._events = queue.Queue()
+            threading.Thread(target=self._dispatch_events, daemon=True, name="FakeFirestoreWatch").start()
+        self._events.put((watch, snapshots, changes, read_time))
+
+    def _dispatch_events(self):
+        while True:
+            watch, snapshots, changes, read_time = self._events.get()
+            try:
+                if watch in self._watches:
+                    watch.callback(snapshots, changes, read_time)
+            except Exception as e:
+                logging.error(f"Fake Firestore listener failed: {e}")
+            finally:
+                self._events.task_done()
+
+    def wait_for_listeners(self):
+        """Block until every listener callback queued so far has run"""
+        if self._events is not None:
+            self._events.join()
+
+# Check-in Load Test
+LOADTEST_HOT_WINDOW_S = 1.0  # Firestore sustains roughly one write per second per document
+
+@dataclass
+class CheckinWrite:
+    station: int
+    doc_id: str
+    present: bool
+    basis: datetime        # when this station last knew the stored value
+    committed: datetime    # server commit time from the write result
+    latency_ms: float
+
+def emulator_firestore_client(host, project="demo-matterid"):
+    """A client for the Firestore emulator at host:port; never touches a real project"""
+    os.environ["FIRESTORE_EMULATOR_HOST"] = host
+    from google.cloud import firestore as cloud_firestore
+    return cloud_firestore.Client(project=project)
+
+class CheckinStation(threading.Thread):
+    """One Attendance tab: toggles delegates from a view loaded once, like the GUI does"""
+
+    def __init__(self, number, client, arrivals, day, view, loaded_at, options, rng):
+        super().__init__(daemon=True, name=f"CheckinStation-{number}")
+        self.number = number
+        self.client = client
+        self.arrivals = arrivals
+        self.day = day
+        self.view = view
+        self.known_at = dict.fromkeys(view, loaded_at)
+        self.loaded_at = loaded_at
+        self.options = options
+        self.rng = rng
+        self.writes = []
+        self.errors = 0
+
+    def toggle(self, doc_id):
+        present = not self.view.get(doc_id, False)
+        start = time.perf_counter()
+        try:
+            result = write_attendance(self.client, doc_id, self.day, present, f"station-{self.number}")
+        except Exception as e:
+            self.errors += 1
+            logging.debug(f"Station {self.number} failed to write {doc_id}: {e}")
+            return
+        latency_ms = (time.perf_counter() - start) * 1000
+        committed = as_utc(getattr(result, "update_time", None)) or datetime.now(timezone.utc)
+        self.writes.append(CheckinWrite(self.number, doc_id, present,
+                                        self.known_at.get(doc_id, self.loaded_at), committed, latency_ms))
+        self.view[doc_id] = present
+        self.known_at[doc_id] = committed
+
+    def run(self):
+        while True:
+            try:
+                doc_id = self.arrivals.get_nowait()
+            except queue.Empty:
+                return
+            if self.options["service_time"]:
+                time.sleep(self.rng.expovariate(1 / self.options["service_time"]))
+            self.toggle(doc_id)
+            roll = self.rng.random()
+            if roll < self.options["correction_rate"]:
+                self.toggle(doc_id)  # mis-tap undone straight away
+                self.toggle(doc_id)
+            elif roll < self.options["correction_rate"] + self.options["duplicate_rate"]:
+                self.arrivals.put(doc_id)  # the delegate queues again at another desk
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def analyse_checkin_writes(writes, final_state, day):
+    """Latency percentiles, hot documents and lost updates from every station's writes"""
+    latencies = sorted(write.latency_ms for write in writes)
+    by_doc = {}
+    for write in sorted(writes, key=lambda write: write.committed):
+        by_doc.setdefault(write.doc_id, []).append(write)
+    
+    stale_overwrites = lost_updates = 0
+    hot_docs = []
+    for doc_id, doc_writes in by_doc.items():
+        for previous, write in zip(doc_writes, doc_writes[1:]):
+            # Another station changed the field after this station last saw it
+            if previous.station != write.station and previous.committed > write.basis:
+                stale_overwrites += 1
+                if previous.present != write.present:
+                    lost_updates += 1
+        
+        times = [write.committed for write in doc_writes]
+        burst = max(bisect.bisect_right(times, t + timedelta(seconds=LOADTEST_HOT_WINDOW_S)) - i
+                    for i, t in enumerate(times))
+        if burst > 1:
+            hot_docs.append((doc_id, len(doc_writes), burst, len({write.station for write in doc_writes})))
+    
+    diverged = sum(1 for doc_id, doc_writes in by_doc.items()
+                   if bool((final_state.get(doc_id) or {}).get(day, False)) != doc_writes[-1].present)
+    hot_docs.sort(key=lambda row: (row[3], row[2], row[1]), reverse=True)  # cross-station contention first
+    return {
+        "writes": len(writes),
+        "latency_ms": {"p50": percentile(latencies, 0.50), "p90": percentile(latencies, 0.90),
+                       "p99": percentile(latencies, 0.99), "max": latencies[-1] if latencies else 0.0},
+        "documents_written": len(by_doc),
+        "hot_documents": len(hot_docs),
+        "hottest": [{"doc_id": doc_id, "writes": count, f"max_writes_per_{LOADTEST_HOT_WINDOW_S:g}s": burst,
+                     "stations": stations} for doc_id, count, burst, stations in hot_docs[:10]],
+        "stale_overwrites": stale_overwrites,
+        "lost_updates": lost_updates,
+        "final_state_mismatches": diverged,
+    }
+
+def run_checkin_load_test(stations=8, delegates=500, day="day1", service_time=0.5, correction_rate=0.05,
+                          duplicate_rate=0.03, latency=0.0, jitter=0.0, failure_rate=0.0,
+                          emulator=None, seed=None):
+    """Simulate check-in stations sharing one attendance collection and report how the writes fared"""
+    rng = random.Random(seed)
+    doc_ids = list(DemoDataGenerator.generate_demo_delegates(delegates, seed=seed))
+    attendance = DemoDataGenerator.generate_demo_attendance(doc_ids, seed=seed)
+    for record in attendance.values():
+        record[day] = False  # doors have not opened yet
+    
+    if emulator:
+        clients = [emulator_firestore_client(emulator) for _ in range(stations)]
+        commit_batched_writes(clients[0], [("set", clients[0].collection("attendance").document(doc_id), record)
+                                           for doc_id, record in attendance.items()])
+    else:
+        shared = FakeFirestore.with_data({"attendance": attendance}, latency=latency, jitter=jitter,
+                                         failure_rate=failure_rate, seed=seed)
+        clients = [shared] * stations
+    
+    # Delegates arrive in a single line and go to whichever desk is free
+    arrivals = queue.Queue()
+    for doc_id in rng.sample(doc_ids, len(doc_ids)):
+        arrivals.put(doc_id)
+    options = {"service_time": service_time, "correction_rate": correction_rate, "duplicate_rate": duplicate_rate}
+    workers = []
+    for number, client in enumerate(clients, 1):
+        loaded_at = datetime.now(timezone.utc)
+        station_attendance = {snap.id: snap.to_dict() or {} for snap in client.collection("attendance").stream()}
+        view = {doc_id: bool(record.get(day, False)) for doc_id, record in station_attendance.items()}
+        workers.append(CheckinStation(number, client, arrivals, day, view, loaded_at, options,
+                                      random.Random(rng.random())))
+    
+    server_timestamp(clients[0])  # an emulator client imports the SDK here rather than inside the first timed write
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    
+    final_state = {snap.id: snap.to_dict() or {} for snap in clients[0].collection("attendance").stream()}
+    writes = [write for worker in workers for write in worker.writes]
+    report = analyse_checkin_writes(writes, final_state, day)
+    report.update({
+        "target": f"emulator {emulator}" if emulator else "in-memory",
+        "stations": stations,
+        "delegates": delegates,
+        "elapsed_s": round(elapsed, 3),
+        "writes_per_s": round(len(writes) / elapsed, 1) if elapsed else 0.0,
+        "errors": sum(worker.errors for worker in workers),
+        "per_station": {worker.number: len(worker.writes) for worker in workers},
+    })
+    return report
+
+# LAN Sync Hub
+HUB_DEFAULT_PORT = 8765
+HUB_FLUSH_INTERVAL_S = 1.0   # upstream commit cadence; toggles within one interval cost a single write
+HUB_RETRY_MAX_S = 30.0
+HUB_EVENT_LOG_SIZE = 50000   # stations further behind than this reload the snapshot
+HUB_POLL_WAIT_S = 20.0       # how long a station's event poll is held open when nothing happens
+HUB_TOKEN_HEADER = "X-MatterID-Hub-Token"
+HUB_MAX_BODY_BYTES = 1 << 20  # larger posts are refused with 413 before the body is read
+HUB_EVENTS_PER_POST = 2000    # about 200 KB of check-ins per request when a station sends them all
+HUB_LOOKUP_RETRY_S = 60.0    # a delegate Firestore did not have either is not looked up again for this long
+
+class HubError(Exception):
+    pass
+
+class SyncHub:
+    """One machine's copy of the conference, shared with the check-in stations on the LAN.
+    
+    Stations load the delegate list from the hub, post check-ins that are applied in
+    arrival order and fanned out to every other station, and the hub merges them into
+    the attendance collection every flush_interval seconds in as few commits as possible.
+    
+    The hub speaks plain HTTP: the token and the delegate list cross the LAN unencrypted,
+    so run it on a network you trust (or behind a TLS-terminating proxy).
+    """
+
+    def __init__(self, client, collection_name, flush_interval=HUB_FLUSH_INTERVAL_S, token=None):
+        self.client = client
+        self.collection_name = collection_name
+        self.flush_interval = flush_interval
+        self.token = token
+        self.hub_id = uuid.uuid4().hex  # stations reload when the hub restarts
+        self.registrations = {}
+        self.encoded_registrations = {}
+        self.missing_ids = {}  # doc_id -> monotonic time Firestore last said it does not exist
+        self.attendance = {}
+        self.events = deque(maxlen=HUB_EVENT_LOG_SIZE)
+        self.seq = 0
+        self.pending = {}  # doc_id -> fields not yet merged upstream
+        self.condition = threading.Condition()
+        self.stop_event = threading.Event()
+        self.snapshot_cache = (None, None)
+        self.synced = 0
+        self.commits = 0
+        self.sync_errors = 0
+        self.last_sync = None
+        self.last_error = None
+        self.httpd = None
+        self.sync_thread = None
+
+    def load(self):
+        self.registrations, self.attendance = load_conference_data(self.client, self.collection_name)
+        self.encoded_registrations = encode_backup_value(self.registrations)
+        logging.info(f"Hub loaded {len(self.registrations)} delegates and "
+                     f"{len(self.attendance)} attendance records from '{self.collection_name}'")
+
+    def lookup_registrations(self, doc_ids):
+        """Fetch delegates registered since load(); returns the IDs still unknown"""
+        now = time.monotonic()
+        wanted = [doc_id for doc_id in doc_ids
+                  if now - self.missing_ids.get(doc_id, now - HUB_LOOKUP_RETRY_S) >= HUB_LOOKUP_RETRY_S]
+        collection_ref = self.client.collection(self.collection_name)
+        found = {}
+        for doc_id in wanted:
+            try:
+                snap = collection_ref.document(doc_id).get()
+            except Exception as e:
+                logging.warning(f"Hub could not look up delegate {doc_id}: {e}")
+                continue
+            if snap.exists:
+                found[doc_id] = snap.to_dict() or {}
+            else:
+                self.missing_ids[doc_id] = now
+        if found:
+            with self.condition:
+                # Replaced rather than updated: snapshot() may be encoding the old dicts right now
+                self.registrations = {**self.registrations, **found}
+                self.encoded_registrations = {**self.encoded_registrations, **encode_backup_value(found)}
+                self.snapshot_cache = (None, None)
+            logging.info(f"Hub picked up {len(found)} delegate(s) registered since it loaded")
+        return [doc_id for doc_id in doc_ids if doc_id not in found]
+
+    def record(self, events):
+        """Apply check-ins in arrival order and queue them upstream; returns the last sequence number"""
+        for event in events:
+            if event.get("day") not in ATTENDANCE_DAYS or not event.get("doc_id"):
+                raise ValueError(f"Invalid check-in: {event}")
+        unknown = sorted({event["doc_id"] for event in events} - self.registrations.keys())
+        if unknown:
+            unknown = self.lookup_registrations(unknown)
+            if unknown:
+                raise ValueError(f"Unknown delegate: {', '.join(unknown)}")
+        now = datetime.now(timezone.utc)
+        with self.condition:
+            for event in events:
+                doc_id, day, present = event["doc_id"], event["day"], bool(event.get("present"))
+                recorded_by = event.get("recorded_by") or "matterid_hub"
+                self.seq += 1
+                self.attendance.setdefault(doc_id, {}).update(
+                    {day: present, "updatedAt": now, "recordedBy": recorded_by})
+                self.pending.setdefault(doc_id, {}).update({day: present, "recordedBy": recorded_by})
+                self.events.append({"seq": self.seq, "doc_id": doc_id, "day": day, "present": present,
+                                    "station": event.get("station", "")})
+            self.condition.notify_all()
+            return self.seq
+
+    def events_since(self, seq, wait=0.0):
+        """(events after seq, current seq), holding the call up to wait seconds for one.
+        
+        None when seq is not from this hub's log, so the station has to reload.
+        """
+        with self.condition:
+            if wait and self.seq == seq:
+                self.condition.wait_for(lambda: self.seq != seq or self.stop_event.is_set(), wait)
+            behind = self.seq - seq
+            if behind < 0 or behind > len(self.events):
+                return None
+            return list(itertools.islice(self.events, len(self.events) - behind, None)), self.seq
+
+    def snapshot(self):
+        """gzip JSON of the delegates and attendance, rebuilt only after check-ins arrive"""
+        with self.condition:
+            seq, body = self.snapshot_cache
+            if seq == self.seq:
+                return body
+            seq = self.seq
+            registrations = self.encoded_registrations
+            attendance = encode_backup_value(self.attendance)
+        payload = {"hub": self.hub_id, "seq": seq, "collection": self.collection_name,
+                   "registrations": registrations, "attendance": attendance}
+        body = gzip.compress(json.dumps(payload, default=json_default).encode("utf-8"), compresslevel=5)
+        self.snapshot_cache = (seq, body)
+        return body
+
+    def flush(self):
+        """Merge every pending check-in into Firestore; returns how many documents were written"""
+        with self.condition:
+            taken, self.pending = self.pending, {}
+        if not taken:
+            return 0
+        attendance_ref = self.client.collection("attendance")
+        operations = [("merge", attendance_ref.document(doc_id), {**fields, "updatedAt": server_timestamp(self.client)})
+                      for doc_id, fields in taken.items()]
+        try:
+            commits = commit_batched_writes(self.client, operations)
+        except Exception:
+            with self.condition:
+                # Check-ins that arrived in the meantime are newer and win; replaying a merge is harmless
+                for doc_id, fields in taken.items():
+                    self.pending[doc_id] = {**fields, **self.pending.get(doc_id, {})}
+            raise
+        self.synced += len(operations)
+        self.commits += commits
+        self.last_sync = datetime.now(timezone.utc)
+        logging.debug(f"Hub synced {len(operations)} attendance document(s) in {commits} commit(s)")
+        return len(operations)
+
+    def run_sync_loop(self):
+        delay = self.flush_interval
+        while not self.stop_event.wait(delay):
+            try:
+                self.flush()
+                delay = self.flush_interval
+            except Exception as e:
+                self.sync_errors += 1
+                self.last_error = str(e)
+                delay = min(max(delay, self.flush_interval) * 2, HUB_RETRY_MAX_S)
+                logging.warning(f"Hub upstream sync failed; {len(self.pending)} document(s) wait, "
+                                f"retrying in {delay:.0f} s: {e}")
+
+    def status(self):
+        with self.condition:
+            return {
+                "hub": self.hub_id,
+                "collection": self.collection_name,
+                "delegates": len(self.registrations),
+                "seq": self.seq,
+                "pending": len(self.pending),
+                "synced": self.synced,
+                "commits": self.commits,
+                "last_sync": self.last_sync.isoformat() if self.last_sync else None,
+                "sync_errors": self.sync_errors,
+                "last_error": self.last_error,
+            }
+
+    def serve(self, host="0.0.0.0", port=HUB_DEFAULT_PORT):
+        """Start the HTTP server and the upstream sync on background threads.
+        
+        Anyone on the network could read the delegate list or post check-ins, so a hub
+        reachable from other machines always has a token; one is generated if none was given.
+        """
+        if not is_loopback_host(host):
+            if not self.token:
+                self.token = secrets.token_urlsafe(18)
+            logging.warning(f"Sync hub on {host} serves plain HTTP: its token and delegates' personal data "
+                            f"are readable by anyone who can watch this network")
+        self.httpd = ThreadingHTTPServer((host, port), _HubRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.hub = self
+        threading.Thread(target=self.httpd.serve_forever, daemon=True, name="SyncHubServer").start()
+        self.sync_thread = threading.Thread(target=self.run_sync_loop, daemon=True, name="SyncHubUpstream")
+        self.sync_thread.start()
+        return self.httpd.server_address
+
+    def stop(self):
+        """Stop serving and push whatever is still pending upstream"""
+        self.stop_event.set()
+        with self.condition:
+            self.condition.notify_all()
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+        if self.sync_thread is not None:
+            self.sync_thread.join()
+        try:
+            self.flush()
+        except Exception as e:
+            logging.error(f"Hub could not sync {len(self.pending)} attendance document(s) on shutdown: {e}")
+
+class _HubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so a check-in costs one LAN round trip
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def send_body(self, status, body, encoding=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection or self.server.hub.stop_event.is_set():
+            # Keep-alive connections outlive shutdown(); make stations reconnect to whatever hub comes next
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # the station went away mid-poll
+
+    def send_json(self, status, payload):
+        self.send_body(status, json.dumps(payload, default=json_default).encode("utf-8"))
+
+    def authorised(self):
+        if self.server.hub.stop_event.is_set():
+            self.send_json(503, {"error": "hub is shutting down"})
+            return False
+        token = self.server.hub.token
+        if token and not hmac.compare_digest(self.headers.get(HUB_TOKEN_HEADER, ""), token):
+            self.send_json(403, {"error": "wrong or missing hub token"})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self.authorised():
+            return
+        hub = self.server.hub
+        parsed = urlparse(self.path)
+        if parsed.path == "/snapshot":
+            self.send_body(200, hub.snapshot(), encoding="gzip")
+        elif parsed.path == "/events":
+            params = parse_qs(parsed.query)
+            try:
+                since = int(params.get("since", ["0"])[0])
+                wait = min(float(params.get("wait", ["0"])[0]), HUB_POLL_WAIT_S)
+            except ValueError:
+                self.send_json(400, {"error": "since and wait must be numbers"})
+                return
+            found = hub.events_since(since, wait)
+            if found is None:
+                self.send_json(200, {"hub": hub.hub_id, "resync": True})
+            else:
+                events, seq = found
+                self.send_json(200, {"hub": hub.hub_id, "seq": seq, "events": events})
+        elif parsed.path == "/status":
+            self.send_json(200, hub.status())
+        else:
+            self.send_json(404, {"error": f"unknown path {parsed.path}"})
+
+    def do_POST(self):
+        if not self.authorised():
+            return
+        if urlparse(self.path).path != "/attendance":
+            self.send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self.send_json(400, {"error": "Content-Length must be a number"})
+            return
+        if length > HUB_MAX_BODY_BYTES:
+            self.close_connection = True  # the unread body would be parsed as the next request
+            self.send_json(413, {"error": f"request body over {HUB_MAX_BODY_BYTES} bytes"})
+            return
+        try:
+            body = json.loads(self.rfile.read(max(0, length)) or b"{}")
+            seq = self.server.hub.record(body["events"])
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        self.send_json(200, {"seq": seq})
+
+    def log_message(self, format, *args):
+        logging.debug(f"Hub {self.address_string()}: {format % args}")
+
+class HubClient:
+    """A check-in station's connection to a SyncHub; keeps one HTTP connection open per thread"""
+
+    def __init__(self, address, token=None, timeout=5.0):
+        parsed = urlparse(address if "://" in address else f"http://{address}")
+        self.host = parsed.hostname
+        self.port = parsed.port or HUB_DEFAULT_PORT
+        self.url = f"http://{self.host}:{self.port}"
+        self.token = token
+        self.timeout = timeout
+        self.station = f"{platform.node()}-{uuid.uuid4().hex[:8]}"
+        self.hub_id = None
+        self.seq = 0
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def request(self, method, path, payload=None, timeout=None):
+        body = json.dumps(payload, default=json_default).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers[HUB_TOKEN_HEADER] = self.token
+        for attempt in range(2):
+            if self._closed:
+                raise HubError(f"Connection to hub {self.url} was closed")
+            connection = self.connection()
+            connection.timeout = timeout or self.timeout
+            if connection.sock is not None:
+                connection.sock.settimeout(connection.timeout)
+            try:
+                connection.request(method, path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # The hub dropped an idle keep-alive connection; every request is safe to repeat
+                connection.close()
+                if attempt:
+                    raise
+                continue
+            if response.status != 503 or attempt:
+                break
+            connection.close()  # a hub that is shutting down may already have been restarted
+        if response.getheader("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        result = json.loads(data) if data else {}
+        if response.status != 200:
+            raise HubError(f"Hub {self.url} answered {response.status}: {result.get('error', '')}")
+        return result
+
+    def load_conference_data(self):
+        """(collection name, registrations, attendance) as the hub currently has them"""
+        snapshot = self.request("GET", "/snapshot", timeout=max(self.timeout, 60))
+        self.hub_id, self.seq = snapshot["hub"], snapshot["seq"]
+        return (snapshot["collection"], decode_backup_value(snapshot["registrations"]),
+                decode_backup_value(snapshot["attendance"]))
+
+    def send_attendance(self, events):
+        events = [{**event, "station": self.station} for event in events]
+        seq = None
+        for start in range(0, len(events), HUB_EVENTS_PER_POST):  # keeps each body well under HUB_MAX_BODY_BYTES
+            seq = self.request("POST", "/attendance", {"events": events[start:start + HUB_EVENTS_PER_POST]})["seq"]
+        return seq
+
+    def write_attendance(self, doc_id, day, present, recorded_by="matterid_user"):
+        return self.send_attendance([{"doc_id": doc_id, "day": day, "present": present, "recorded_by": recorded_by}])
+
+    def poll(self, wait=HUB_POLL_WAIT_S):
+        """Check-ins other stations made since the last poll or load; None means reload from the hub"""
+        if self.hub_id is None:
+            return None
+        response = self.request("GET", f"/events?since={self.seq}&wait={wait:g}", timeout=wait + self.timeout)
+        if response.get("resync") or response["hub"] != self.hub_id:
+            self.hub_id = None
+            return None
+        self.seq = response["seq"]
+        return [event for event in response["events"] if event.get("station") != self.station]
+
+    def status(self):
+        return self.request("GET", "/status")
+
+    def close(self):
+        """Close every thread's connection, waking a poll that is waiting on the hub"""
+        self._closed = True
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            if connection.sock is not None:
+                try:
+                    connection.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            connection.close()
+
+def is_loopback_host(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def lan_address():
+    """This machine's address on the LAN, for telling stations where the hub is"""
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        probe.connect(("192.0.2.1", 9))  # no packet is sent; this only picks the outgoing interface
+        return probe.getsockname()[0]
+    except OSError:
+        return "127.0.0.1"
+    finally:
+        probe.close()
+
+# Headless Commands
+CLI_COMMANDS = ("backup", "restore", "export", "export-changes", "import", "attendance-set", "stats",
+                "checkin-loadtest", "hub")
+
+def init_firebase_headless(key_source):
+    """Initialise the default Firebase app from a service key file path or URL; returns a metered client"""
+    if os.path.exists(key_source):
+        with open(key_source, encoding="utf-8") as key_file:
+            service_data = json.load(key_file)
+    else:
+        service_data = fetch_json(key_source, cache=True)
+    if not firebase_admin._apps:
+        firebase_admin.initialize_app(credentials.Certificate(service_data))
+    return MeteredClient(firestore.client())
+
+def bulk_set_attendance(client, day, present, doc_ids, recorded_by="matterid_cli"):
+    """Mark one day present or absent for every doc ID in as few commits as possible"""
+    collection_ref = client.collection("attendance")
+    operations = [
+        ("merge", collection_ref.document(doc_id),
+         {day: present, "updatedAt": server_timestamp(client), "recordedBy": recorded_by})
+        for doc_id in doc_ids
+    ]
+    commit_batched_writes(client, operations)
+    return len(operations)
+
+def print_analytics(result):
+    print(f"Registrations        {result.total_registrations}")
+    print(f"Active committees    {result.active_committees}")
+    print(f"Schools              {result.participating_schools}")
+    print(f"Attendance rate      {result.overall_attendance_rate:.1f}%")
+    for day, present in result.day_stats:
+        print(f"  {day:<19}{present} present")
+    print("Committees")
+    for committee, count in result.committee_counts:
+        print(f"  {committee:<30}{count:>6}")
+    print("Top schools")
+    for school, count in result.school_counts[:10]:
+        print(f"  {school[:30]:<30}{count:>6}")
+
+def add_cli_commands(commands):
+    backup_parser = commands.add_parser("backup", help="Write collections to a gzip NDJSON archive")
+    backup_parser.add_argument("-o", "--output",
+                               default=f"matterid_backup_{datetime.now().strftime('%Y%m%d_%H%M')}.ndjson.gz")
+    backup_parser.add_argument("--collections", nargs="+",
+                               help="Collections to back up (default: the configured registrations collection and attendance)")
+
+    restore_parser = commands.add_parser("restore", help="Replay a backup archive into Firestore")
+    restore_parser.add_argument("archive")
+    restore_parser.add_argument("--map", action="append", default=[], metavar="SOURCE=TARGET",
+                                help="Restore a collection under another name (repeatable)")
+    restore_parser.add_argument("--restart", action="store_true", help="Ignore any saved resume checkpoint")
+
+    export_parser = commands.add_parser("export", help="Export the whole collection with attendance to CSV or NDJSON")
+    export_parser.add_argument("-o", "--output", required=True)
+    export_parser.add_argument("--format", choices=["csv", "ndjson"],
+                               help="Default: ndjson for .ndjson/.jsonl outputs, csv otherwise")
+    export_parser.add_argument("--collection", help="Collection to export (default: from the saved configuration)")
+
+    changes_parser = commands.add_parser("export-changes",
+                                         help="Write rows added, changed or removed since the last export to a destination")
+    changes_parser.add_argument("destination")
+    changes_parser.add_argument("-o", "--output", required=True)
+    changes_parser.add_argument("--collection", help="Collection to export (default: from the saved configuration)")
+
+    import_parser = commands.add_parser("import", help="Upsert registrations from a CSV file")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--collection", help="Target collection (default: from the saved configuration)")
+    import_parser.add_argument("--rejects", help="Where to write rejected rows (default: next to the file)")
+
+    attendance_parser = commands.add_parser("attendance-set", help="Mark a day present or absent in bulk")
+    attendance_parser.add_argument("day", choices=ATTENDANCE_DAYS)
+    attendance_parser.add_argument("state", choices=["present", "absent"])
+    attendance_parser.add_argument("--ids", nargs="+", help="Only these document IDs (default: every registration)")
+    attendance_parser.add_argument("--ids-file", help="Only the document IDs listed in this file, one per line")
+    attendance_parser.add_argument("--collection", help="Registrations collection (default: from the saved configuration)")
+    attendance_parser.add_argument("--dry-run", action="store_true", help="Report how many would change, write nothing")
+
+    stats_parser = commands.add_parser("stats", help="Registration, committee, school and attendance totals")
+    stats_parser.add_argument("--collection", help="Collection to summarise (default: from the saved configuration)")
+    stats_parser.add_argument("--json", action="store_true", help="Print the full analytics as JSON")
+
+    hub_parser = commands.add_parser("hub", help="Serve the delegate list to check-in stations on the LAN "
+                                                 "and batch their attendance up to Firestore")
+    hub_parser.add_argument("--host", default="0.0.0.0", help="Interface to listen on (default: all)")
+    hub_parser.add_argument("--port", type=int, default=HUB_DEFAULT_PORT)
+    hub_parser.add_argument("--collection", help="Registrations collection (default: from the saved configuration)")
+    hub_parser.add_argument("--flush-interval", type=float, default=HUB_FLUSH_INTERVAL_S,
+                            help="Seconds between upstream commits")
+    hub_parser.add_argument("--token", help="Shared secret stations must send (see --hub-token in the app); "
+                                            "generated when listening beyond this machine without one")
+
+    loadtest_parser = commands.add_parser("checkin-loadtest", help="Simulate concurrent check-in stations "
+                                                                    "against the in-memory client or the emulator")
+    loadtest_parser.add_argument("--stations", type=int, default=8)
+    loadtest_parser.add_argument("--delegates", type=int, default=500)
+    loadtest_parser.add_argument("--day", default="day1", choices=ATTENDANCE_DAYS)
+    loadtest_parser.add_argument("--service-time", type=float, default=0.5,
+                                 help="Mean seconds a desk spends per delegate (0 for flat out)")
+    loadtest_parser.add_argument("--correction-rate", type=float, default=0.05,
+                                 help="Share of check-ins followed by a mis-tap and its undo")
+    loadtest_parser.add_argument("--duplicate-rate", type=float, default=0.03,
+                                 help="Share of delegates who check in again at another desk")
+    loadtest_parser.add_argument("--latency", type=float, default=0.0, help="Simulated round trip in milliseconds")
+    loadtest_parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay up to this many ms")
+    loadtest_parser.add_argument("--failure-rate", type=float, default=0.0)
+    loadtest_parser.add_argument("--emulator", metavar="HOST:PORT", help="Run against the Firestore emulator")
+    loadtest_parser.add_argument("--seed", type=int)
+    loadtest_parser.add_argument("-o", "--output", help="Write the report as JSON")
+
+def run_checkin_load_test_command(args):
+    report = run_checkin_load_test(args.stations, args.delegates, args.day, args.service_time,
+                                   args.correction_rate, args.duplicate_rate, args.latency / 1000,
+                                   args.jitter / 1000, args.failure_rate, args.emulator, args.seed)
+    latency = report["latency_ms"]
+    print(f"{report['stations']} stations, {report['writes']} writes in {report['elapsed_s']:.1f} s "
+          f"({report['writes_per_s']} writes/s) against {report['target']}, {report['errors']} errors")
+    print(f"write latency  p50 {latency['p50']:.1f} ms  p90 {latency['p90']:.1f} ms  "
+          f"p99 {latency['p99']:.1f} ms  max {latency['max']:.1f} ms")
+    print(f"hot documents  {report['hot_documents']} written more than once within "
+          f"{LOADTEST_HOT_WINDOW_S:g} s")
+    for hot in report["hottest"][:5]:
+        print(f"  {hot['doc_id']:<24}{hot['writes']:>4} writes from {hot['stations']} station(s)")
+    print(f"stale overwrites {report['stale_overwrites']}, lost updates {report['lost_updates']}, "
+          f"final-state mismatches {report['final_state_mismatches']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+    return 0
+
+def run_sync_hub(args, client, collection_name):
+    hub = SyncHub(client.for_feature("Hub sync"), collection_name, args.flush_interval, args.token)
+    hub.load()
+    host, port = hub.serve(args.host, args.port)
+    station_host = lan_address() if host == "0.0.0.0" else host
+    logging.info(f"Sync hub for '{collection_name}' listening on {host}:{port}; "
+                 f"start stations with --hub {station_host}:{port}" + (" --hub-token …" if hub.token else ""))
+    if hub.token and not args.token:
+        print(f"Generated hub token (pass it to every station): --hub-token {hub.token}", flush=True)
+    try:
+        while True:
+            time.sleep(60)
+            status = hub.status()
+            logging.info(f"Hub: {status['seq']} check-in(s) received, {status['synced']} document write(s) in "
+                         f"{status['commits']} commit(s), {status['pending']} pending")
+    except KeyboardInterrupt:
+        logging.info("Hub stopping; syncing what is still pending…")
+    finally:
+        hub.stop()
+    return 0
+
+def run_firestore_command(args, client, config):
+    collection_name = getattr(args, "collection", None) or config.get("collection_name", "registrations")
+    table_columns = config.get("table_columns", [])
+    if args.command == "hub":
+        return run_sync_hub(args, client, collection_name)
+    if args.command == "export":
+        fmt = args.format or ("ndjson" if args.output.endswith((".ndjson", ".jsonl")) else "csv")
+        header = [col.get("display", "") for col in table_columns] + [f"Day {day[-1]}" for day in ATTENDANCE_DAYS]
+        written = write_export_file(args.output, header,
+                                    iter_firestore_export_rows(client, collection_name, table_columns, fmt), fmt=fmt)
+        logging.info(f"Exported {written} document(s) from '{collection_name}' to {args.output}")
+    elif args.command == "export-changes":
+        state = load_export_state(collection_name, args.destination)
+        candidates, current_ids = fetch_export_delta_source(client, collection_name, state)
+        changes, watermark = compute_export_delta(candidates, current_ids, state)
+        with open(args.output, mode="w", newline="", encoding="utf-8") as out_file:
+            writer = csv.writer(out_file)
+            writer.writerow(["Change"] + [col.get("display", "") for col in table_columns])
+            writer.writerows(iter_change_export_rows(changes, table_columns))
+        save_export_state(collection_name, args.destination, watermark, current_ids,
+                          ids_updated_at(candidates, watermark))
+        logging.info(f"Wrote {len(changes)} change(s) for '{args.destination}' to {args.output}")
+    elif args.command == "import":
+        reject_path = args.rejects or f"{os.path.splitext(args.file)[0]}_rejects.csv"
+        summary = CsvImporter(args.file, client, collection_name, table_columns, reject_path).run()
+        logging.info(f"Imported {len(summary['imported'])} row(s) into '{collection_name}' in "
+                     f"{summary['commits']} commit(s); {summary['rejected']} rejected")
+        if summary["reject_path"]:
+            logging.warning(f"Rejected rows written to {summary['reject_path']}")
+            return 2
+    elif args.command == "attendance-set":
+        if args.ids_file:
+            with open(args.ids_file, encoding="utf-8") as ids_file:
+                doc_ids = [line.strip() for line in ids_file if line.strip()]
+        elif args.ids:
+            doc_ids = args.ids
+        else:
+            doc_ids = [snap.id for snap in client.collection(collection_name).select([]).stream()]
+        if args.dry_run:
+            logging.info(f"Would mark {len(doc_ids)} delegate(s) {args.state} for {args.day}")
+        else:
+            count = bulk_set_attendance(client, args.day, args.state == "present", doc_ids)
+            logging.info(f"Marked {count} delegate(s) {args.state} for {args.day}")
+    elif args.command == "stats":
+        registrations, attendance = load_conference_data(client, collection_name)
+        store = ColumnarStore(registrations, list(ANALYTICS_FIELDS))
+        result = compute_analytics(store, attendance)
+        if args.json:
+            print(json.dumps(asdict(result), default=json_default, indent=2))
+        else:
+            print_analytics(result)
+    elif args.command == "backup":
+        counts = write_backup(client, args.output, args.collections or backup_collections(collection_name),
+                              progress=lambda name, count: logging.info(f"Backed up {count} document(s) from '{name}'"))
+        logging.info(f"Backup written to {args.output}: {counts}")
+    else:
+        collection_map = dict(mapping.split("=", 1) for mapping in args.map)
+        state_path = args.archive + ".restore-state.json"
+        if args.restart and os.path.exists(state_path):
+            os.remove(state_path)
+        restored = restore_backup(client, args.archive, collection_map, state_path,
+                                  progress=lambda count: logging.info(f"Restored {count} document(s)"))
+        logging.info(f"Restore of {args.archive} complete: {restored} document(s) written.")
+    return 0
+
+def run_cli(argv, extra_commands=()):
+    """Run a headless command; returns the process exit code.
+    
+    extra_commands are (name, help, add_arguments(parser), run(args)) tuples; the
+    desktop app adds the commands that need its widgets this way.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="matterid", description="MatterID - Manager v2.5 headless commands")
+    parser.add_argument("--key", help="Service key file or URL (default: key_url from the saved configuration)")
+    parser.add_argument("--log-file", help="Also write the log to this file, rotated")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_cli_commands(commands)
+    extra_runners = {}
+    for name, help_text, add_arguments, run in extra_commands:
+        add_arguments(commands.add_parser(name, help=help_text))
+        extra_runners[name] = run
+
+    args = parser.parse_args(argv)
+    if args.log_file:
+        enable_log_file(args.log_file)
+    if args.command in extra_runners:
+        return extra_runners[args.command](args)
+    if args.command == "checkin-loadtest":
+        return run_checkin_load_test_command(args)
+
+    try:
+        config = ConfigManager().get_config()
+        client = init_firebase_headless(args.key or config.get("key_url"))
+        with FIRESTORE_METER.feature(f"CLI {args.command}"):
+            exit_code = run_firestore_command(args, client, config)
+    except Exception as e:
+        logging.error(f"{args.command} failed: {e}\n{traceback.format_exc()}")
+        return 1
+    totals = FIRESTORE_METER.totals()
+    logging.info(f"Firestore usage: {totals['reads']} reads, {totals['writes']} writes, {totals['deletes']} deletes "
+                 f"(~${FirestoreMeter.estimated_cost(totals):.4f})")
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(run_cli(sys.argv[1:]))
@@ -10,21 +10,18 @@ import sys
 import csv
 import json
 import threading
-import urllib.request
-import ssl
-import certifi
-import re
 import logging
 import traceback
 import webbrowser
 import os
-from urllib.parse import urlparse, parse_qs
+import time
+import subprocess
+import platform
+import tempfile
+from urllib.parse import urlparse, parse_qs, quote
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from datetime import datetime
-import random
-
-import firebase_admin
-from firebase_admin import credentials, firestore, auth
+from concurrent.futures import ThreadPoolExecutor
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QTableWidget, QTableWidgetItem,
@@ -36,18 +33,28 @@ from PyQt6.QtWidgets import (
     QListWidget, QListWidgetItem, QInputDialog, QCheckBox
 )
 from PyQt6.QtGui import QPixmap, QKeySequence, QColor, QBrush, QAction, QFont
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, QDateTime, QSettings
-
-# Logging Setup
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(sys.stdout)]
+from PyQt6.QtCore import Qt, QObject, QTimer, QThread, pyqtSignal
+
+from matterid_core import (
+    ANALYTICS_FIELDS, apply_dataset_changes, ATTENDANCE_DAYS, ATTENDANCE_PATTERN_DESCRIPTIONS, auth,
+    cached_dataset, CachedTokenVerifier, CLI_COMMANDS, ColumnarStore, commit_batched_writes, compute_analytics,
+    compute_export_delta, ConfigManager, credentials, CsvImporter, DATASET_CACHE_SIZE, DatasetCache,
+    dataset_sync_states, DemoDataGenerator, enable_log_file, FakeFirestore, fetch_dataset_changes,
+    fetch_export_delta_source, fetch_json,
+    find_duplicate_clusters, firebase_admin, firestore, FIRESTORE_BATCH_LIMIT, firestore_client_for_key,
+    FIRESTORE_METER, FirestoreMeter, forget_cached_json, format_timestamp, HUB_POLL_WAIT_S, HubClient, ids_updated_at,
+    is_valid_email,
+    iter_attendance_export_rows, iter_change_export_rows, iter_firestore_export_records,
+    iter_firestore_export_rows, iter_table_export_rows, list_export_destinations, load_cached_json,
+    load_conference_data, load_export_state, LOG_RATE_LIMITER, merge_attendance,
+    merge_registrations, MeteredClient, np, PERF, private_data_dir,
+    prepare_table_export, registration_timestamp, revalidate_cached_json, run_cli, save_export_state, server_timestamp,
+    StartupTimer, write_attendance, write_export_file
 )
 
 # Global Variables
 db = None
-LOGIN_TOKEN = None
+hub = None  # HubClient when this instance is a check-in station of a LAN sync hub
 
 # MatterID Color Scheme
 MATTERID_COLORS = {
@@ -66,166 +73,7 @@ MATTERID_COLORS = {
     'cyan_accent': '#00D4FF'     # Cyan Accent
 }
 
-# Configuration Manager
-class ConfigManager:
-    def __init__(self):
-        self.settings = QSettings("MatterID", "Manager")
-        self.default_config = {
-            "key_url": "https://api.eliomatters.com/sangammun.json",
-            "collection_name": "registrations",
-            "table_columns": [
-                {"display": "Document ID", "field": None, "editable": False},
-                {"display": "First Name", "field": "name", "editable": True},
-                {"display": "Email", "field": "email", "editable": True},
-                {"display": "Phone No.", "field": "phone", "editable": True},
-                {"display": "School", "field": "school", "editable": True},
-                {"display": "School Info : If other than dps", "field": "customSchool", "editable": True},
-                {"display": "Committee Preferences", "field": "committeePreferences", "editable": True},
-                {"display": "Portfolio Preferences", "field": "portfolioPreferences", "editable": True},
-                {"display": "DOB", "field": "dob", "editable": True},
-                {"display": "Final Committee", "field": "finalCommittee", "editable": True},
-                {"display": "Final Portfolio", "field": "finalPortfolio", "editable": True},
-                {"display": "Payment SS URL", "field": "screenshotURL", "editable": True}
-            ],
-            "recent_configs": []
-        }
-    
-    def get_config(self):
-        config = {}
-        for key, default_value in self.default_config.items():
-            if key == "table_columns":
-                saved_columns = self.settings.value(key, default_value)
-                if isinstance(saved_columns, str):
-                    try:
-                        config[key] = json.loads(saved_columns)
-                    except json.JSONDecodeError:
-                        config[key] = default_value
-                else:
-                    config[key] = saved_columns or default_value
-            else:
-                config[key] = self.settings.value(key, default_value)
-        return config
-    
-    def save_config(self, config):
-        for key, value in config.items():
-            if key == "table_columns":
-                self.settings.setValue(key, json.dumps(value))
-            else:
-                self.settings.setValue(key, value)
-        self.settings.sync()
-    
-    def add_recent_config(self, config_name, config):
-        recent = self.get_config().get("recent_configs", [])
-        recent = [r for r in recent if r.get("name") != config_name]
-        recent.insert(0, {"name": config_name, "config": config})
-        recent = recent[:10]
-        
-        current_config = self.get_config()
-        current_config["recent_configs"] = recent
-        self.save_config(current_config)
-    
-    def export_config(self, filepath):
-        config = self.get_config()
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
-    
-    def import_config(self, filepath):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        self.save_config(config)
-        return config
-
-# Demo Data Generator
-class DemoDataGenerator:
-    @staticmethod
-    def generate_demo_delegates():
-        """Generate 10 sample delegates for demonstration"""
-        delegates = {}
-        
-        committees = ["UNHRC", "Lok Sabha", "UNGA-Disec", "UNCSW", "Continuous Crisis Committee", "International Press"]
-        schools = ["DPS RK Puram", "DPS Mathura Road", "Ryan International", "Modern School", "Delhi Public School", "Sanskriti School"]
-        
-        sample_names = [
-            "Arjun Sharma", "Priya Patel", "Rahul Gupta", "Ananya Singh", 
-            "Karthik Iyer", "Sneha Reddy", "Vikram Malhotra", "Riya Kapoor",
-            "Aditya Jain", "Kavya Nair"
-        ]
-        
-        for i, name in enumerate(sample_names):
-            doc_id = f"demo_{i+1:03d}"
-            delegates[doc_id] = {
-                "name": name,
-                "email": f"{name.lower().replace(' ', '.')}@example.com",
-                "phone": f"+91 9{random.randint(100000000, 999999999)}",
-                "school": random.choice(schools),
-                "customSchool": "",
-                "committeePreferences": random.choice(committees),
-                "portfolioPreferences": f"Delegate of {random.choice(['India', 'USA', 'China', 'France', 'UK', 'Germany'])}",
-                "dob": f"{random.randint(2005, 2008)}-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
-                "finalCommittee": random.choice(committees),
-                "finalPortfolio": f"Delegate of {random.choice(['India', 'USA', 'China', 'France', 'UK', 'Germany'])}",
-                "screenshotURL": "https://example.com/payment_screenshot.jpg",
-                "updatedAt": datetime.now()
-            }
-        
-        return delegates
-    
-    @staticmethod
-    def generate_demo_attendance():
-        """Generate sample attendance data"""
-        attendance = {}
-        
-        # Generate attendance patterns
-        patterns = [
-            [True, True, True],    # Perfect attendance
-            [True, True, False],   # Missed day 3
-            [True, False, True],   # Missed day 2
-            [False, True, True],   # Missed day 1
-            [True, False, False],  # Only day 1
-            [False, False, True],  # Only day 3
-        ]
-        
-        for i in range(1, 11):
-            doc_id = f"demo_{i:03d}"
-            pattern = random.choice(patterns)
-            attendance[doc_id] = {
-                "day1": pattern[0],
-                "day2": pattern[1],
-                "day3": pattern[2],
-                "updatedAt": datetime.now(),
-                "recordedBy": "demo_user"
-            }
-        
-        return attendance
-
-# Import exceptions
-try:
-    from firebase_admin.auth import ExpiredIdTokenError, InvalidIdTokenError
-except ImportError:
-    class ExpiredIdTokenError(Exception):
-        pass
-    class InvalidIdTokenError(Exception):
-        pass
-
 # Helper Functions
-EMAIL_REGEX = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-
-def is_valid_email(email):
-    return re.match(EMAIL_REGEX, email) is not None
-
-def format_timestamp(ts):
-    if isinstance(ts, datetime):
-        try:
-            local_dt = ts.astimezone()
-            return local_dt.strftime("%Y-%m-%d %H:%M:%S")
-        except Exception:
-            return ts.strftime("%Y-%m-%d %H:%M:%S (UTC?)")
-    elif isinstance(ts, QDateTime):
-        return ts.toString("yyyy-MM-dd HH:mm:ss")
-    elif ts:
-        return str(ts)
-    return ""
-
 def get_initials(name):
     if not name:
         return "??"
@@ -237,18 +85,82 @@ def get_initials(name):
     else:
         return (words[0][0] + words[-1][0]).upper()
 
+# Firestore Meter Signals
+class FirestoreMeterSignals(QObject):
+    """Re-emits FIRESTORE_METER changes as a Qt signal, so widgets update on the GUI thread"""
+    changed = pyqtSignal()
+
+FIRESTORE_METER_SIGNALS = FirestoreMeterSignals()
+FIRESTORE_METER.add_listener(FIRESTORE_METER_SIGNALS.changed.emit)
+
+# StreamingExportThread
+class StreamingExportThread(QThread):
+    progress = pyqtSignal(int, int)         # rows written, total rows (0 if unknown)
+    export_finished = pyqtSignal(str, int)  # file path, rows written
+    export_failed = pyqtSignal(str)
+    export_cancelled = pyqtSignal(str)
+
+    def __init__(self, file_path, header, rows, total, fmt="csv"):
+        super().__init__()
+        self.file_path = file_path
+        self.header = header
+        self.rows = rows
+        self.total = total
+        self.fmt = fmt
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
+        try:
+            written = write_export_file(self.file_path, self.header, self.rows, self.total, self.fmt,
+                                        self.progress.emit, self._cancel_event)
+        except Exception as e:
+            logging.error(f"Error exporting to {self.file_path}: {e}\n{traceback.format_exc()}")
+            self.export_failed.emit(str(e))
+            return
+        
+        if self._cancel_event.is_set():
+            self.export_cancelled.emit(self.file_path)
+            return
+        self.export_finished.emit(self.file_path, written)
+
+# CsvImportThread
+class CsvImportThread(QThread):
+    progress = pyqtSignal(int, int)      # rows read, total rows (0 if unknown)
+    import_finished = pyqtSignal(object)  # summary dict
+    import_failed = pyqtSignal(str)
+
+    def __init__(self, file_path, client, collection_name, table_columns, reject_path):
+        super().__init__()
+        self.importer = CsvImporter(file_path, client, collection_name, table_columns, reject_path,
+                                    progress=self.progress.emit)
+
+    def cancel(self):
+        self.importer.cancel_event.set()
+
+    def run(self):
+        try:
+            summary = self.importer.run()
+        except Exception as e:
+            logging.error(f"Error importing {self.importer.file_path}: {e}\n{traceback.format_exc()}")
+            self.import_failed.emit(str(e))
+            return
+        self.import_finished.emit(summary)
+
 # Callback Handler
 class _CallbackHandler(BaseHTTPRequestHandler):
     def do_GET(self):
-        global LOGIN_TOKEN
         parsed = urlparse(self.path)
-        logging.info(f"Received HTTP GET: {self.path}")
+        logging.info(f"Received HTTP GET: {parsed.path}")  # the query carries the token
 
         if parsed.path == "/callback":
             params = parse_qs(parsed.query)
             token_list = params.get("token", [])
             if token_list:
-                LOGIN_TOKEN = token_list[0]
+                # on_token is set by LoginCallbackServer and emits a queued Qt signal
+                self.server.on_token(token_list[0])
                 self.send_response(200)
                 self.send_header("Content-Type", "text/html")
                 self.end_headers()
@@ -259,7 +171,6 @@ class _CallbackHandler(BaseHTTPRequestHandler):
                     <p>You may close this window and return to MatterID - Manager.</p>
                     </div></body></html>"""
                 self.wfile.write(html_response.encode('utf-8'))
-                threading.Thread(target=self.server.shutdown, daemon=True).start()
                 return
 
         self.send_response(404)
@@ -267,10 +178,63 @@ class _CallbackHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(b"<html><body><h2>Not Found</h2></body></html>")
 
+    def log_message(self, format, *args):
+        pass  # request lines would leak the token into stderr
+
+# LoginCallbackServer
+class LoginCallbackServer(QObject):
+    """Local HTTP server for the login redirect; token_received fires on the GUI thread"""
+    token_received = pyqtSignal(str)
+
+    def __init__(self, port=0, parent=None):
+        super().__init__(parent)
+        try:
+            self.httpd = HTTPServer(("127.0.0.1", port), _CallbackHandler)
+        except OSError:
+            if port == 0:
+                raise
+            logging.warning(f"Login port {port} is in use; falling back to a free port.")
+            self.httpd = HTTPServer(("127.0.0.1", 0), _CallbackHandler)
+        # Emitting from the server thread queues delivery to receivers on the GUI thread
+        self.httpd.on_token = self.token_received.emit
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    @property
+    def callback_url(self):
+        return f"http://127.0.0.1:{self.port}/callback"
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        # shutdown() blocks until serve_forever notices, so keep it off the GUI thread
+        def close():
+            try:
+                self.httpd.shutdown()
+                self.httpd.server_close()
+            except Exception:
+                pass
+        threading.Thread(target=close, daemon=True).start()
+
 # WebLoginDialog
+LOGIN_TIMEOUT_MS = 5 * 60 * 1000  # give up waiting for the browser redirect after this long
+
 class WebLoginDialog(QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, login_url="https://eliomatters.com/auth.html", port=5000,
+                 open_browser=webbrowser.open, timeout_ms=LOGIN_TIMEOUT_MS):
         super().__init__(parent)
+        self.login_url = login_url
+        self.port = port
+        self.open_browser = open_browser
+        self.token = None
+        self.timeout_timer = QTimer(self)
+        self.timeout_timer.setSingleShot(True)
+        self.timeout_timer.setInterval(timeout_ms)
+        self.timeout_timer.timeout.connect(self.on_login_timeout)
         self.setWindowTitle("MatterID - Manager Login")
         self.setModal(True)
         self.setFixedSize(400, 200)
@@ -336,90 +300,119 @@ class WebLoginDialog(QDialog):
         self.setLayout(layout)
 
         self.server = None
-        self.server_thread = None
-
-        self.poll_timer = QTimer(self)
-        self.poll_timer.setInterval(500)
-        self.poll_timer.timeout.connect(self.check_token)
 
     def start_web_login(self):
-        global LOGIN_TOKEN
-        LOGIN_TOKEN = None
+        self.token = None
 
         try:
-            self.server = HTTPServer(("127.0.0.1", 5000), _CallbackHandler)
-        except OSError:
-            QMessageBox.critical(self, "Error", "Could not start local server on port 5000. Port may be in use.")
+            self.server = LoginCallbackServer(self.port, self)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Could not start the local login server:\n{e}")
             return
+        self.server.token_received.connect(self.on_token_received)
+        self.server.start()
 
-        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
-        self.server_thread.start()
-
-        webbrowser.open("https://eliomatters.com/auth.html")
+        # The redirect target is passed along in case a fallback port is in use
+        separator = "&" if "?" in self.login_url else "?"
+        self.open_browser(f"{self.login_url}{separator}redirect_uri={quote(self.server.callback_url, safe='')}")
 
         self.login_btn.setEnabled(False)
         self.cancel_btn.setEnabled(True)
         self.status_label.setText("🔄 Waiting for MatterID authentication…")
         self.status_label.setStyleSheet(f"color: {MATTERID_COLORS['accent']};")
-        self.poll_timer.start()
-
-    def check_token(self):
-        global LOGIN_TOKEN
-        if LOGIN_TOKEN:
-            self.poll_timer.stop()
-            self.status_label.setText("✅ Token received. Verifying…")
-            self.status_label.setStyleSheet(f"color: {MATTERID_COLORS['success']};")
-            QApplication.processEvents()
-            QTimer.singleShot(100, self.accept)
+        self.timeout_timer.start()
 
-    def cancel_login(self):
-        self.poll_timer.stop()
+    def on_login_timeout(self):
+        port = self.server.port if self.server else self.port
+        self.stop_server()
+        logging.warning(f"No login callback on port {port} within {self.timeout_timer.interval() // 1000} s.")
+        self.login_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.status_label.setText("❌ Login timed out. Try again.")
+        self.status_label.setStyleSheet(f"color: {MATTERID_COLORS['error']};")
+        message = "No response arrived from the MatterID login page."
+        if port != self.port:
+            # A login page that ignores redirect_uri still sends the browser to the configured port
+            message += (f"\n\nPort {self.port} was busy, so MatterID listened on port {port} instead. "
+                        f"If the login page does not support that, free port {self.port} and try again.")
+        QMessageBox.critical(self, "Login Timed Out", message)
+
+    def on_token_received(self, token):
+        if self.token is not None:
+            return
+        self.token = token
+        self.status_label.setText("✅ Token received. Verifying…")
+        self.status_label.setStyleSheet(f"color: {MATTERID_COLORS['success']};")
+        self.stop_server()
+        self.accept()
+
+    def stop_server(self):
+        self.timeout_timer.stop()
         if self.server:
-            try:
-                self.server.shutdown()
-                self.server.server_close()
-            except Exception:
-                pass
+            self.server.stop()
+            self.server = None
+
+    def cancel_login(self):
+        self.stop_server()
         self.reject()
 
     def closeEvent(self, event):
-        self.poll_timer.stop()
-        if self.server:
-            try:
-                self.server.shutdown()
-                self.server.server_close()
-            except Exception:
-                pass
+        self.stop_server()
         super().closeEvent(event)
 
+def run_login_dialog(config_manager):
+    """Show the web login and return the ID token, or None if it was cancelled"""
+    config = config_manager.get_config()
+    login_dialog = WebLoginDialog(login_url=config.get("login_url", "https://eliomatters.com/auth.html"),
+                                  port=int(config.get("login_port", 5000) or 0))
+    if login_dialog.exec() != QDialog.DialogCode.Accepted:
+        return None
+    return login_dialog.token
+
 # KeyDownloadThread
 class KeyDownloadThread(QThread):
     progress = pyqtSignal(int)
     finished = pyqtSignal(dict, dict)
     error = pyqtSignal(str)
 
-    def __init__(self, key_url, auth_url):
+    def __init__(self, key_url, auth_url, use_cache=True):
         super().__init__()
         self.key_url = key_url
         self.auth_url = auth_url or key_url  # Use same key if auth_url not provided
+        self.use_cache = use_cache
+        self.from_cache = False  # set when the emitted keys came from the on-disk cache
 
     def run(self):
+        urls = list(dict.fromkeys([self.key_url, self.auth_url]))
+        if not self.use_cache:
+            for url in urls:
+                forget_cached_json(url)
+        cached = {url: load_cached_json(url) for url in urls}
+        if cached[self.key_url]:
+            # Start from the cached keys and revalidate them off the startup path
+            logging.info("Using cached MatterID keys; revalidating in the background…")
+            service_data = cached[self.key_url]["data"]
+            auth_data = (cached[self.auth_url] or cached[self.key_url])["data"]
+            threading.Thread(target=revalidate_cached_json, args=(urls,), daemon=True).start()
+            self.from_cache = True
+            self.progress.emit(100)
+            self.finished.emit(service_data, auth_data)
+            return
+
         logging.info("Starting MatterID key download from API…")
         try:
-            ctx = ssl.create_default_context(cafile=certifi.where())
-            
-            with urllib.request.urlopen(self.key_url, context=ctx, timeout=20) as response:
-                service_data = json.loads(response.read().decode('utf-8'))
-            
-            self.progress.emit(50)
-            
-            # Try to get auth data from separate URL, fallback to service data
-            try:
-                with urllib.request.urlopen(self.auth_url, context=ctx, timeout=20) as response:
-                    auth_data = json.loads(response.read().decode('utf-8'))
-            except:
-                # Use service data as fallback
-                auth_data = service_data
+            # Both documents are fetched at once rather than one timeout after the other
+            with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+                futures = {url: executor.submit(fetch_json, url, cache=True) for url in urls}
+                service_data = futures[self.key_url].result()
+                self.progress.emit(50)
+                
+                # Try to get auth data from separate URL, fallback to service data
+                try:
+                    auth_data = futures[self.auth_url].result()
+                except Exception as e:
+                    logging.warning(f"Auth key download failed, using service key: {e}")
+                    auth_data = service_data
             
             self.progress.emit(100)
             
@@ -439,6 +432,7 @@ class DownloadSplashScreen(QDialog):
         self.config_manager = config_manager
         self.service_key_data = None
         self.auth_key_data = None
+        self.firebase_app_names = []  # apps this splash initialised, so a retry can tear them down
         self.setStyleSheet(f"""
             QDialog {{
                 background-color: {MATTERID_COLORS['background']};
@@ -492,16 +486,30 @@ class DownloadSplashScreen(QDialog):
         self.setLayout(layout)
         self.resize(400, 250)
 
+        self.start_download()
+
+    def start_download(self, use_cache=True):
         config = self.config_manager.get_config()
         key_url = config.get("key_url", "https://api.eliomatters.com/sangammun.json")
         auth_url = "https://api.eliomatters.com/eliomatter.json"  # Use specific auth URL
 
-        self.thread = KeyDownloadThread(key_url, auth_url)
+        self.thread = KeyDownloadThread(key_url, auth_url, use_cache)
         self.thread.progress.connect(self.update_progress)
         self.thread.finished.connect(self.download_finished)
         self.thread.error.connect(self.download_error)
         self.thread.start()
 
+    def retry_without_cache(self, error):
+        """A cached key Firebase rejects is stale: download a fresh one rather than fall back to demo mode"""
+        logging.warning(f"Cached MatterID key was rejected ({error}); downloading a fresh copy…")
+        for name in self.firebase_app_names:
+            firebase_admin.delete_app(firebase_admin.get_app(name))  # a half-finished init would be reused otherwise
+        self.firebase_app_names = []
+        self.thread.wait()  # finished is emitted from run(); replacing a running QThread aborts the app
+        self.message_label.setText("🔄 Cached configuration rejected. Downloading a fresh copy…")
+        self.progress_bar.setValue(0)
+        self.start_download(use_cache=False)
+
     def update_progress(self, value):
         self.progress_bar.setValue(value)
 
@@ -516,22 +524,30 @@ class DownloadSplashScreen(QDialog):
             
             if not firebase_admin._apps:
                 default_app = firebase_admin.initialize_app(service_cred)
+                self.firebase_app_names.append(default_app.name)
                 # Initialize auth app for token verification
                 auth_app = firebase_admin.initialize_app(auth_cred, name='auth')
+                self.firebase_app_names.append(auth_app.name)
                 logging.info("Firebase apps initialized successfully.")
             else:
                 logging.warning("Firebase app already initialized.")
 
             global db
-            db = firestore.client()
+            db = MeteredClient(firestore.client())
 
             self.accept()
 
         except ValueError as e:
+            if self.thread.from_cache:
+                self.retry_without_cache(e)
+                return
             logging.error(f"Invalid MatterID key format: {e}")
             QMessageBox.critical(self, "MatterID Error", f"Invalid key format: {e}")
             self.reject()
         except Exception as e:
+            if self.thread.from_cache:
+                self.retry_without_cache(e)
+                return
             logging.error(f"Firebase initialization error: {e}\n{traceback.format_exc()}")
             QMessageBox.critical(self, "MatterID Error", f"Firebase init error: {e}")
             self.reject()
@@ -881,6 +897,15 @@ class AttendanceCard(QFrame):
         if day in self.day_checkboxes:
             self.day_checkboxes[day].setChecked(present)
             self.attendance_data[day] = present
+    
+    def show_remote_attendance(self, day, present):
+        """Reflect another station's check-in without writing it back"""
+        if day in self.day_checkboxes:
+            checkbox = self.day_checkboxes[day]
+            checkbox.blockSignals(True)
+            checkbox.setChecked(present)
+            checkbox.blockSignals(False)
+        self.attendance_data[day] = present
 
 # Attendance View Widget
 class AttendanceView(QWidget):
@@ -920,8 +945,9 @@ class AttendanceView(QWidget):
         
         self.mark_present_btn.clicked.connect(self.mark_all_present)
         self.mark_absent_btn.clicked.connect(self.mark_all_absent)
-        self.save_attendance_btn.clicked.connect(self.save_all_attendance)
-        self.test_db_btn.clicked.connect(self.test_database_connection)
+        # Decorated slots take *args, so clicked's checked flag must not reach them
+        self.save_attendance_btn.clicked.connect(lambda: self.save_all_attendance())
+        self.test_db_btn.clicked.connect(lambda: self.test_database_connection())
         self.export_btn.clicked.connect(self.export_attendance)
         
         controls_layout.addWidget(QLabel("Search:"))
@@ -1006,32 +1032,37 @@ class AttendanceView(QWidget):
         
         self.update_statistics()
     
+    @PERF.traced("attendance.write")
+    @FIRESTORE_METER.feature("Attendance check-in")
     def on_attendance_changed(self, doc_id, day, present):
         """Handle attendance change from card"""
         if doc_id not in self.attendance_data:
             self.attendance_data[doc_id] = {}
         
         self.attendance_data[doc_id][day] = present
-        self.attendance_data[doc_id]["updatedAt"] = firestore.SERVER_TIMESTAMP if db else datetime.now()
+        self.attendance_data[doc_id]["updatedAt"] = server_timestamp(db) if db else datetime.now()
         self.attendance_data[doc_id]["recordedBy"] = "matterid_user"  # TODO: Get actual user ID
         
+        # Check-in stations hand the write to the hub, which syncs upstream in batches
+        if hub is not None and not self.main_window.demo_mode:
+            try:
+                hub.write_attendance(doc_id, day, present)
+                logging.debug(f"Attendance for {doc_id}: {day} = {present} sent to the hub")
+                self.main_window.update_status(f"Attendance saved: {doc_id} - {day}")
+            except Exception as e:
+                logging.error(f"❌ Error sending attendance for {doc_id} to the hub: {e}")
+                QMessageBox.warning(
+                    self.main_window,
+                    "Attendance Save Error",
+                    f"Could not reach the sync hub at {hub.url} to save {doc_id}:\n{str(e)}"
+                )
         # Save to database if connected
-        if db and not self.main_window.demo_mode:
+        elif db and not self.main_window.demo_mode:
             try:
                 logging.info(f"Attempting to save attendance for {doc_id}: {day} = {present}")
                 
-                # Create the attendance document data
-                attendance_doc = {
-                    day: present,
-                    "updatedAt": firestore.SERVER_TIMESTAMP,
-                    "recordedBy": "matterid_user"
-                }
-                
                 # Save to Firestore with merge=True to update existing or create new
-                result = db.collection("attendance").document(doc_id).set(
-                    attendance_doc, 
-                    merge=True
-                )
+                write_attendance(db, doc_id, day, present)
                 
                 logging.info(f"✅ Attendance saved successfully for {doc_id}: {day} = {present}")
                 
@@ -1051,6 +1082,15 @@ class AttendanceView(QWidget):
         else:
             logging.info(f"Demo mode: Attendance for {doc_id} saved locally only")
         
+        self.main_window.mark_data_changed([self.main_window.analytics_view])
+        self.update_statistics()
+    
+    def apply_remote_attendance(self, events):
+        """Show check-ins made at other stations; attendance_data is already updated"""
+        for event in events:
+            card = self.attendance_cards.get(event["doc_id"])
+            if card is not None:
+                card.show_remote_attendance(event["day"], event["present"])
         self.update_statistics()
     
     def filter_attendance(self):
@@ -1102,8 +1142,28 @@ class AttendanceView(QWidget):
         
         self.update_statistics()
     
+    @FIRESTORE_METER.feature("Connection test")
     def test_database_connection(self):
         """Test database connection and permissions"""
+        if hub is not None:
+            try:
+                status = hub.status()
+            except Exception as e:
+                QMessageBox.critical(self, "Sync Hub Error", f"❌ Could not reach the sync hub at {hub.url}:\n\n{e}")
+                return
+            last_sync = status["last_sync"] or "not yet"
+            QMessageBox.information(
+                self,
+                "Sync Hub Connection Test",
+                f"✅ Connected to the sync hub at {hub.url}\n\n"
+                f"📊 Collection: {status['collection']} ({status['delegates']} delegates)\n"
+                f"✅ Check-ins received: {status['seq']}\n"
+                f"⏳ Waiting to sync to Firebase: {status['pending']}\n"
+                f"🔄 Last sync: {last_sync}\n"
+                f"⚠️ Sync errors: {status['sync_errors']}"
+            )
+            return
+        
         if not db:
             QMessageBox.warning(self, "No Database", "Database connection not available. Running in demo mode.")
             return
@@ -1128,7 +1188,7 @@ class AttendanceView(QWidget):
                 "day1": True,
                 "day2": False,
                 "day3": True,
-                "updatedAt": firestore.SERVER_TIMESTAMP,
+                "updatedAt": server_timestamp(db),
                 "recordedBy": "connection_test"
             }
             
@@ -1157,8 +1217,24 @@ class AttendanceView(QWidget):
             
             QMessageBox.critical(self, "Database Connection Error", error_msg)
     
+    @PERF.traced("attendance.save_all")
+    @FIRESTORE_METER.feature("Save all attendance")
     def save_all_attendance(self):
         """Manually save all attendance data to Firebase"""
+        if hub is not None and not self.main_window.demo_mode:
+            events = [{"doc_id": doc_id, "day": day, "present": bool(attendance.get(day, False))}
+                      for doc_id, attendance in self.attendance_data.items() for day in ATTENDANCE_DAYS]
+            try:
+                hub.send_attendance(events)
+            except Exception as e:
+                logging.error(f"Error sending all attendance to the hub: {e}")
+                QMessageBox.warning(self, "Sync Hub Error", f"Could not reach the sync hub at {hub.url}:\n{e}")
+                return
+            QMessageBox.information(self, "Success", f"Sent attendance for {len(self.attendance_data)} delegates "
+                                                     "to the sync hub; it saves them to Firebase in batches.")
+            self.main_window.update_status(f"Attendance sent to hub: {len(self.attendance_data)} delegates")
+            return
+        
         if not db or self.main_window.demo_mode:
             QMessageBox.information(self, "Demo Mode", "Running in demo mode. Attendance data is stored locally only.")
             return
@@ -1167,6 +1243,9 @@ class AttendanceView(QWidget):
             QMessageBox.information(self, "No Data", "No attendance data to save.")
             return
         
+        if not self.main_window.confirm_firestore_budget("Save all attendance", len(self.attendance_data)):
+            return
+        
         # Show progress dialog
         progress = QProgressDialog("Saving attendance data to Firebase...", "Cancel", 0, len(self.attendance_data), self)
         progress.setWindowTitle("Saving Attendance")
@@ -1186,14 +1265,14 @@ class AttendanceView(QWidget):
                     "day1": attendance.get("day1", False),
                     "day2": attendance.get("day2", False), 
                     "day3": attendance.get("day3", False),
-                    "updatedAt": firestore.SERVER_TIMESTAMP,
+                    "updatedAt": server_timestamp(db),
                     "recordedBy": "matterid_user"
                 }
                 
                 # Save to Firebase
                 db.collection("attendance").document(doc_id).set(firebase_data, merge=True)
                 saved_count += 1
-                logging.info(f"Saved attendance for {doc_id}")
+                logging.debug(f"Saved attendance for {doc_id}")
                 
             except Exception as e:
                 error_count += 1
@@ -1203,6 +1282,7 @@ class AttendanceView(QWidget):
             QApplication.processEvents()
         
         progress.close()
+        logging.info(f"Save all attendance: {saved_count} saved, {error_count} failed")
         
         # Show results
         if error_count == 0:
@@ -1242,48 +1322,42 @@ class AttendanceView(QWidget):
         if not file_path:
             return
         
+        # Card visibility is GUI state, so snapshot it here; rows are built on the export thread
+        snapshot = [
+            (doc_id, card.user_data.get("name", ""), card.user_data.get("finalCommittee", ""),
+             self.attendance_data.get(doc_id, {}))
+            for doc_id, card in self.attendance_cards.items() if card.isVisible()
+        ]
+        header = ["Document ID", "Name", "Committee", "Day 1", "Day 2", "Day 3", "Pattern", "Days Present"]
+        self.main_window.start_export(
+            file_path, header, iter_attendance_export_rows(snapshot), len(snapshot), "Attendance export"
+        )
+
+# AnalyticsComputeThread
+class AnalyticsComputeThread(QThread):
+    result_ready = pyqtSignal(int, object)  # generation, AnalyticsResult
+
+    def __init__(self, generation, store, attendance_data):
+        super().__init__()
+        self.generation = generation
+        self.store = store
+        self.attendance_data = attendance_data
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def run(self):
         try:
-            with open(file_path, mode="w", newline="", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                
-                # Header
-                header = ["Document ID", "Name", "Committee", "Day 1", "Day 2", "Day 3", "Pattern", "Days Present"]
-                writer.writerow(header)
-                
-                # Data rows
-                for doc_id, card in self.attendance_cards.items():
-                    if card.isVisible():
-                        user_data = card.user_data
-                        attendance = self.attendance_data.get(doc_id, {})
-                        
-                        day1 = "✅" if attendance.get("day1", False) else "❌"
-                        day2 = "✅" if attendance.get("day2", False) else "❌"
-                        day3 = "✅" if attendance.get("day3", False) else "❌"
-                        
-                        # Generate pattern
-                        pattern_chars = []
-                        pattern_chars.append("P" if attendance.get("day1", False) else "A")
-                        pattern_chars.append("P" if attendance.get("day2", False) else "A")
-                        pattern_chars.append("P" if attendance.get("day3", False) else "A")
-                        pattern = "".join(pattern_chars)
-                        
-                        days_present = sum([attendance.get("day1", False), 
-                                          attendance.get("day2", False), 
-                                          attendance.get("day3", False)])
-                        
-                        row = [
-                            doc_id,
-                            user_data.get("name", ""),
-                            user_data.get("finalCommittee", ""),
-                            day1, day2, day3,
-                            pattern,
-                            days_present
-                        ]
-                        writer.writerow(row)
-            
-            QMessageBox.information(self, "Success", f"Attendance data exported to:\n{file_path}")
+            with PERF.trace("analytics.compute"):
+                result = compute_analytics(self.store, self.attendance_data, self._cancel_event.is_set)
         except Exception as e:
-            QMessageBox.critical(self, "Export Error", f"Error exporting attendance data:\n{e}")
+            logging.error(f"Error computing analytics: {e}\n{traceback.format_exc()}")
+            return
+        if result is None:
+            logging.debug(f"Analytics computation {self.generation} cancelled.")
+            return
+        self.result_ready.emit(self.generation, result)
 
 # Analytics View Widget
 class AnalyticsView(QWidget):
@@ -1292,6 +1366,16 @@ class AnalyticsView(QWidget):
         self.main_window = main_window
         self.users_data = {}
         self.attendance_data = {}
+        self.compute_generation = 0
+        self.compute_version = -1
+        self.compute_thread = None
+        self.running_threads = set()
+        # Aggregate cache shared by the dashboard and the report export,
+        # keyed on MainWindow.data_version
+        self.analytics_result = None
+        self.analytics_result_version = -1
+        self.rendered_version = -1
+        self.pending_export_path = None
         self.init_ui()
     
     def init_ui(self):
@@ -1329,59 +1413,91 @@ class AnalyticsView(QWidget):
         
         self.setLayout(layout)
         
-        # Initialize with demo data
+        # Sections are built by MainWindow the first time this tab is shown
+    
+    def ensure_analytics(self):
+        """Render cached aggregates if they match the current data, else recompute"""
+        version = self.main_window.data_version
+        if self.analytics_result is not None and self.analytics_result_version == version:
+            if self.rendered_version != version:
+                self.render_analytics(self.analytics_result)
+                self.rendered_version = version
+            return
+        if self.compute_version == version and self.compute_thread is not None and self.compute_thread.isRunning():
+            return
         self.refresh_analytics()
     
     def refresh_analytics(self):
-        """Refresh all analytics data"""
-        # Clear existing analytics
-        for i in reversed(range(self.analytics_layout.count())):
-            child = self.analytics_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        
+        """Recompute analytics in the background, superseding any pending run"""
         # Get data (use demo data if no real data available)
         if not self.users_data:
             self.users_data = DemoDataGenerator.generate_demo_delegates()
         if not self.attendance_data:
             self.attendance_data = DemoDataGenerator.generate_demo_attendance()
         
-        # Generate analytics sections
-        self.create_key_statistics()
-        self.create_committee_distribution()
-        self.create_school_analysis()
-        self.create_attendance_analytics()
-        self.create_registration_timeline()
+        if self.compute_thread is not None:
+            self.compute_thread.cancel()
+        self.running_threads = {t for t in self.running_threads if t.isRunning()}
+        
+        self.compute_generation += 1
+        self.compute_version = self.main_window.data_version
+        if self.users_data is self.main_window.all_loaded_data:
+            store = self.main_window.get_columnar_store()
+        else:
+            store = ColumnarStore(self.users_data, ANALYTICS_FIELDS)
+        # Shallow copy so the worker never iterates a dict the GUI is resizing
+        thread = AnalyticsComputeThread(self.compute_generation, store, dict(self.attendance_data))
+        thread.result_ready.connect(self.on_analytics_ready)
+        self.compute_thread = thread
+        self.running_threads.add(thread)
+        thread.start()
+    
+    def on_analytics_ready(self, generation, result):
+        if generation != self.compute_generation:
+            return  # Superseded by newer data
+        self.analytics_result = result
+        self.analytics_result_version = self.compute_version
+        self.render_analytics(result)
+        self.rendered_version = self.compute_version
+        
+        if self.pending_export_path:
+            file_path = self.pending_export_path
+            self.pending_export_path = None
+            self.write_report(file_path, result)
+    
+    @PERF.traced("analytics.render")
+    def render_analytics(self, result):
+        """Replace all analytics sections with ones built from result"""
+        for i in reversed(range(self.analytics_layout.count())):
+            child = self.analytics_layout.itemAt(i).widget()
+            if child:
+                child.setParent(None)
+        
+        self.create_key_statistics(result)
+        self.create_committee_distribution(result)
+        self.create_school_analysis(result)
+        self.create_attendance_analytics(result)
+        self.create_registration_timeline(result)
     
-    def create_key_statistics(self):
+    def shutdown(self):
+        """Cancel background computations and wait for them to exit"""
+        for thread in self.running_threads:
+            thread.cancel()
+        for thread in self.running_threads:
+            thread.wait()
+        self.running_threads.clear()
+    
+    def create_key_statistics(self, result):
         """Create key statistics section"""
         stats_group = QGroupBox("📊 Key Statistics")
         stats_layout = QGridLayout()
         
-        total_registrations = len(self.users_data)
-        committees = set(data.get("finalCommittee", "") for data in self.users_data.values() if data.get("finalCommittee"))
-        active_committees = len(committees) if committees else 0
-        schools = set(data.get("school", "") for data in self.users_data.values() if data.get("school"))
-        participating_schools = len(schools) if schools else 0
-        
-        # Calculate attendance statistics
-        total_possible_days = total_registrations * 3
-        total_present_days = 0
-        for attendance in self.attendance_data.values():
-            total_present_days += sum([
-                attendance.get("day1", False),
-                attendance.get("day2", False),
-                attendance.get("day3", False)
-            ])
-        
-        overall_attendance_rate = (total_present_days / total_possible_days * 100) if total_possible_days > 0 else 0
-        
         # Create statistic cards
         stats = [
-            ("👥 Total Registrations", str(total_registrations), MATTERID_COLORS['primary']),
-            ("🏛️ Active Committees", str(active_committees), MATTERID_COLORS['accent']),
-            ("🏫 Participating Schools", str(participating_schools), MATTERID_COLORS['success']),
-            ("📈 Overall Attendance", f"{overall_attendance_rate:.1f}%", MATTERID_COLORS['warning'])
+            ("👥 Total Registrations", str(result.total_registrations), MATTERID_COLORS['primary']),
+            ("🏛️ Active Committees", str(result.active_committees), MATTERID_COLORS['accent']),
+            ("🏫 Participating Schools", str(result.participating_schools), MATTERID_COLORS['success']),
+            ("📈 Overall Attendance", f"{result.overall_attendance_rate:.1f}%", MATTERID_COLORS['warning'])
         ]
         
         for i, (title, value, color) in enumerate(stats):
@@ -1425,20 +1541,14 @@ class AnalyticsView(QWidget):
         
         return card
     
-    def create_committee_distribution(self):
+    def create_committee_distribution(self, result):
         """Create committee distribution chart"""
         committee_group = QGroupBox("🏛️ Committee Distribution")
         committee_layout = QVBoxLayout()
         
-        # Count delegates per committee
-        committee_counts = {}
-        for data in self.users_data.values():
-            committee = data.get("finalCommittee", "Unassigned")
-            committee_counts[committee] = committee_counts.get(committee, 0) + 1
-        
         # Create text-based bar chart
-        if committee_counts:
-            max_count = max(committee_counts.values())
+        if result.committee_counts:
+            max_count = result.committee_counts[0][1]
             
             chart_text = QTextEdit()
             chart_text.setReadOnly(True)
@@ -1454,10 +1564,10 @@ class AnalyticsView(QWidget):
             """)
             
             chart_content = "Committee Distribution:\n\n"
-            for committee, count in sorted(committee_counts.items(), key=lambda x: x[1], reverse=True):
+            for committee, count in result.committee_counts:
                 bar_length = int((count / max_count) * 30) if max_count > 0 else 0
                 bar = "█" * bar_length
-                percentage = (count / len(self.users_data) * 100) if self.users_data else 0
+                percentage = (count / result.total_registrations * 100) if result.total_registrations else 0
                 chart_content += f"{committee:<25} {bar:<30} {count:>3} ({percentage:>5.1f}%)\n"
             
             chart_text.setPlainText(chart_content)
@@ -1466,19 +1576,13 @@ class AnalyticsView(QWidget):
         committee_group.setLayout(committee_layout)
         self.analytics_layout.addWidget(committee_group)
     
-    def create_school_analysis(self):
+    def create_school_analysis(self, result):
         """Create school participation analysis"""
         school_group = QGroupBox("🏫 School Participation Analysis")
         school_layout = QVBoxLayout()
         
-        # Count delegates per school
-        school_counts = {}
-        for data in self.users_data.values():
-            school = data.get("school", "Unknown")
-            school_counts[school] = school_counts.get(school, 0) + 1
-        
-        if school_counts:
-            max_count = max(school_counts.values())
+        if result.school_counts:
+            max_count = result.school_counts[0][1]
             
             chart_text = QTextEdit()
             chart_text.setReadOnly(True)
@@ -1494,10 +1598,10 @@ class AnalyticsView(QWidget):
             """)
             
             chart_content = "School Participation:\n\n"
-            for school, count in sorted(school_counts.items(), key=lambda x: x[1], reverse=True):
+            for school, count in result.school_counts:
                 bar_length = int((count / max_count) * 25) if max_count > 0 else 0
                 bar = "█" * bar_length
-                percentage = (count / len(self.users_data) * 100) if self.users_data else 0
+                percentage = (count / result.total_registrations * 100) if result.total_registrations else 0
                 chart_content += f"{school:<30} {bar:<25} {count:>3} ({percentage:>5.1f}%)\n"
             
             chart_text.setPlainText(chart_content)
@@ -1506,40 +1610,11 @@ class AnalyticsView(QWidget):
         school_group.setLayout(school_layout)
         self.analytics_layout.addWidget(school_group)
     
-    def create_attendance_analytics(self):
+    def create_attendance_analytics(self, result):
         """Create attendance pattern analysis"""
         attendance_group = QGroupBox("📅 Attendance Analytics")
         attendance_layout = QVBoxLayout()
         
-        # Analyze attendance patterns
-        patterns = {}
-        day_stats = {"day1": 0, "day2": 0, "day3": 0}
-        
-        for doc_id, attendance in self.attendance_data.items():
-            # Generate pattern
-            pattern_chars = []
-            for day in ["day1", "day2", "day3"]:
-                is_present = attendance.get(day, False)
-                pattern_chars.append("P" if is_present else "A")
-                if is_present:
-                    day_stats[day] += 1
-            
-            pattern = "".join(pattern_chars)
-            patterns[pattern] = patterns.get(pattern, 0) + 1
-        
-        # Pattern descriptions
-        pattern_descriptions = {
-            "PPP": "Perfect Attendance",
-            "PPA": "Missed Day 3",
-            "PAP": "Missed Day 2", 
-            "APP": "Missed Day 1",
-            "PPO": "Only Days 1-2",
-            "PAA": "Only Day 1",
-            "APP": "Only Day 1",
-            "AAP": "Only Day 3",
-            "AAA": "Absent All Days"
-        }
-        
         chart_text = QTextEdit()
         chart_text.setReadOnly(True)
         chart_text.setMaximumHeight(250)
@@ -1553,12 +1628,12 @@ class AnalyticsView(QWidget):
             }}
         """)
         
-        total_delegates = len(self.users_data)
+        total_delegates = result.total_registrations
         chart_content = "Attendance Patterns:\n\n"
         
         # Daily statistics
         chart_content += "Daily Attendance:\n"
-        for day, count in day_stats.items():
+        for day, count in result.day_stats:
             day_num = day[-1]
             percentage = (count / total_delegates * 100) if total_delegates > 0 else 0
             bar_length = int((count / total_delegates * 20)) if total_delegates > 0 else 0
@@ -1566,10 +1641,10 @@ class AnalyticsView(QWidget):
             chart_content += f"Day {day_num}: {bar:<20} {count:>3}/{total_delegates} ({percentage:>5.1f}%)\n"
         
         chart_content += "\nAttendance Patterns:\n"
-        if patterns:
-            max_pattern_count = max(patterns.values())
-            for pattern, count in sorted(patterns.items(), key=lambda x: x[1], reverse=True):
-                description = pattern_descriptions.get(pattern, "Custom Pattern")
+        if result.pattern_counts:
+            max_pattern_count = result.pattern_counts[0][1]
+            for pattern, count in result.pattern_counts:
+                description = ATTENDANCE_PATTERN_DESCRIPTIONS.get(pattern, "Custom Pattern")
                 percentage = (count / total_delegates * 100) if total_delegates > 0 else 0
                 bar_length = int((count / max_pattern_count * 15)) if max_pattern_count > 0 else 0
                 bar = "█" * bar_length
@@ -1581,20 +1656,24 @@ class AnalyticsView(QWidget):
         attendance_group.setLayout(attendance_layout)
         self.analytics_layout.addWidget(attendance_group)
     
-    def create_registration_timeline(self):
+    def create_registration_timeline(self, result):
         """Create registration timeline analysis"""
         timeline_group = QGroupBox("📅 Registration Timeline")
         timeline_layout = QVBoxLayout()
+        timeline = result.timeline
+        
+        if not timeline.buckets:
+            info_label = QLabel("No registration timestamps (createdAt / updatedAt) found in the loaded data.")
+            info_label.setStyleSheet(f"color: {MATTERID_COLORS['text_secondary']}; font-style: italic; padding: 10px;")
+            timeline_layout.addWidget(info_label)
+            timeline_group.setLayout(timeline_layout)
+            self.analytics_layout.addWidget(timeline_group)
+            return
         
-        info_label = QLabel("Registration timeline analysis would show when delegates registered over time.")
-        info_label.setStyleSheet(f"color: {MATTERID_COLORS['text_secondary']}; font-style: italic; padding: 10px;")
-        timeline_layout.addWidget(info_label)
-        
-        # Demo timeline data
-        demo_text = QTextEdit()
-        demo_text.setReadOnly(True)
-        demo_text.setMaximumHeight(120)
-        demo_text.setStyleSheet(f"""
+        chart_text = QTextEdit()
+        chart_text.setReadOnly(True)
+        chart_text.setMaximumHeight(250)
+        chart_text.setStyleSheet(f"""
             QTextEdit {{
                 background-color: {MATTERID_COLORS['card_bg']};
                 color: {MATTERID_COLORS['text_primary']};
@@ -1604,17 +1683,21 @@ class AnalyticsView(QWidget):
             }}
         """)
         
-        demo_content = """Registration Timeline (Demo Data):
-
-Week 1: ████████████████████ 8 registrations (80%)
-Week 2: ████                 2 registrations (20%)
-Week 3: ██                   0 registrations (0%)
-
-Peak registration period: Week 1
-Average daily registrations: 1.4"""
+        total_dated = timeline.buckets[-1][2]
+        chart_content = f"Registration Timeline (by {timeline.granularity}):\n\n"
+        for period, count, running_total in timeline.buckets:
+            bar_length = int((count / timeline.peak_count) * 20) if timeline.peak_count > 0 else 0
+            bar = "█" * bar_length
+            percentage = (count / total_dated * 100) if total_dated > 0 else 0
+            chart_content += f"{period:<20} {bar:<20} {count:>3} ({percentage:>5.1f}%)  Total: {running_total}\n"
         
-        demo_text.setPlainText(demo_content)
-        timeline_layout.addWidget(demo_text)
+        chart_content += f"\nPeak registration period: {timeline.peak_period} ({timeline.peak_count} registrations)\n"
+        chart_content += f"Average daily registrations: {timeline.average_daily:.1f}\n"
+        if timeline.undated:
+            chart_content += f"Registrations without a timestamp: {timeline.undated}\n"
+        
+        chart_text.setPlainText(chart_content)
+        timeline_layout.addWidget(chart_text)
         
         timeline_group.setLayout(timeline_layout)
         self.analytics_layout.addWidget(timeline_group)
@@ -1626,6 +1709,16 @@ Average daily registrations: 1.4"""
         if not file_path:
             return
         
+        if self.analytics_result is None or self.analytics_result_version != self.main_window.data_version:
+            # Written by on_analytics_ready once the in-flight computation lands
+            self.pending_export_path = file_path
+            self.ensure_analytics()
+            self.main_window.update_status("Analytics still computing • report will be saved when ready")
+            return
+        
+        self.write_report(file_path, self.analytics_result)
+    
+    def write_report(self, file_path, result):
         try:
             with open(file_path, mode="w", newline="", encoding="utf-8") as csv_file:
                 writer = csv.writer(csv_file)
@@ -1638,38 +1731,26 @@ Average daily registrations: 1.4"""
                 # Key statistics
                 writer.writerow(["KEY STATISTICS"])
                 writer.writerow(["Metric", "Value"])
-                writer.writerow(["Total Registrations", len(self.users_data)])
-                
-                committees = set(data.get("finalCommittee", "") for data in self.users_data.values() if data.get("finalCommittee"))
-                writer.writerow(["Active Committees", len(committees)])
-                
-                schools = set(data.get("school", "") for data in self.users_data.values() if data.get("school"))
-                writer.writerow(["Participating Schools", len(schools)])
+                writer.writerow(["Total Registrations", result.total_registrations])
+                writer.writerow(["Active Committees", result.active_committees])
+                writer.writerow(["Participating Schools", result.participating_schools])
                 writer.writerow([])
                 
+                total = result.total_registrations
+                
                 # Committee distribution
                 writer.writerow(["COMMITTEE DISTRIBUTION"])
                 writer.writerow(["Committee", "Count", "Percentage"])
-                committee_counts = {}
-                for data in self.users_data.values():
-                    committee = data.get("finalCommittee", "Unassigned")
-                    committee_counts[committee] = committee_counts.get(committee, 0) + 1
-                
-                for committee, count in sorted(committee_counts.items(), key=lambda x: x[1], reverse=True):
-                    percentage = (count / len(self.users_data) * 100) if self.users_data else 0
+                for committee, count in result.committee_counts:
+                    percentage = (count / total * 100) if total else 0
                     writer.writerow([committee, count, f"{percentage:.1f}%"])
                 writer.writerow([])
                 
                 # School analysis
                 writer.writerow(["SCHOOL PARTICIPATION"])
                 writer.writerow(["School", "Count", "Percentage"])
-                school_counts = {}
-                for data in self.users_data.values():
-                    school = data.get("school", "Unknown")
-                    school_counts[school] = school_counts.get(school, 0) + 1
-                
-                for school, count in sorted(school_counts.items(), key=lambda x: x[1], reverse=True):
-                    percentage = (count / len(self.users_data) * 100) if self.users_data else 0
+                for school, count in result.school_counts:
+                    percentage = (count / total * 100) if total else 0
                     writer.writerow([school, count, f"{percentage:.1f}%"])
                 writer.writerow([])
                 
@@ -1677,28 +1758,21 @@ Average daily registrations: 1.4"""
                 writer.writerow(["ATTENDANCE ANALYSIS"])
                 writer.writerow(["Pattern", "Description", "Count", "Percentage"])
                 
-                patterns = {}
-                for attendance in self.attendance_data.values():
-                    pattern_chars = []
-                    for day in ["day1", "day2", "day3"]:
-                        pattern_chars.append("P" if attendance.get(day, False) else "A")
-                    pattern = "".join(pattern_chars)
-                    patterns[pattern] = patterns.get(pattern, 0) + 1
-                
-                pattern_descriptions = {
-                    "PPP": "Perfect Attendance",
-                    "PPA": "Missed Day 3",
-                    "PAP": "Missed Day 2",
-                    "APP": "Missed Day 1",
-                    "PAA": "Only Day 1",
-                    "AAP": "Only Day 3",
-                    "AAA": "Absent All Days"
-                }
-                
-                for pattern, count in sorted(patterns.items(), key=lambda x: x[1], reverse=True):
-                    description = pattern_descriptions.get(pattern, "Custom Pattern")
-                    percentage = (count / len(self.users_data) * 100) if self.users_data else 0
+                for pattern, count in result.pattern_counts:
+                    description = ATTENDANCE_PATTERN_DESCRIPTIONS.get(pattern, "Custom Pattern")
+                    percentage = (count / total * 100) if total else 0
                     writer.writerow([pattern, description, count, f"{percentage:.1f}%"])
+                writer.writerow([])
+                
+                # Registration timeline
+                timeline = result.timeline
+                writer.writerow(["REGISTRATION TIMELINE"])
+                writer.writerow(["Period", "Registrations", "Running Total"])
+                for period, count, running_total in timeline.buckets:
+                    writer.writerow([period, count, running_total])
+                writer.writerow(["Peak Period", timeline.peak_period, timeline.peak_count])
+                writer.writerow(["Average Daily Registrations", f"{timeline.average_daily:.1f}"])
+                writer.writerow(["Undated Registrations", timeline.undated])
             
             QMessageBox.information(self, "Success", f"Comprehensive analytics report exported to:\n{file_path}")
         except Exception as e:
@@ -1709,7 +1783,112 @@ Average daily registrations: 1.4"""
         self.users_data = users_data
         if attendance_data:
             self.attendance_data = attendance_data
-        self.refresh_analytics()
+        self.ensure_analytics()
+
+# Diagnostics View Widget
+class DiagnosticsView(QWidget):
+    """Hidden tab (Ctrl+Shift+D) showing PERF latency stats per operation"""
+    COLUMNS = ("Operation", "Count", "Mean (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)", "Total (ms)")
+    REFRESH_INTERVAL_MS = 2000
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.snapshot = {}
+        self.init_ui()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        header_layout = QHBoxLayout()
+        title_label = QLabel("🩺 Performance Diagnostics")
+        title_label.setStyleSheet(f"font-size: 18px; font-weight: bold; color: {MATTERID_COLORS['primary']};")
+        self.since_label = QLabel("")
+        self.since_label.setStyleSheet(f"color: {MATTERID_COLORS['text_muted']};")
+        header_layout.addWidget(title_label)
+        header_layout.addStretch()
+        header_layout.addWidget(self.since_label)
+        layout.addLayout(header_layout)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.currentCellChanged.connect(lambda row, *_: self.show_histogram(row))
+        layout.addWidget(self.table)
+
+        self.histogram_label = QLabel("Select an operation to see its latency histogram.")
+        self.histogram_label.setStyleSheet(f"font-family: monospace; color: {MATTERID_COLORS['text_secondary']};")
+        layout.addWidget(self.histogram_label)
+
+        button_layout = QHBoxLayout()
+        refresh_button = QPushButton("🔄 Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        reset_button = QPushButton("🧹 Reset")
+        reset_button.clicked.connect(self.reset_stats)
+        export_button = QPushButton("📤 Export JSON")
+        export_button.setToolTip("Save the stats to compare builds")
+        export_button.clicked.connect(self.export_stats)
+        button_layout.addWidget(refresh_button)
+        button_layout.addWidget(reset_button)
+        button_layout.addStretch()
+        button_layout.addWidget(export_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        self.snapshot = PERF.snapshot()
+        current = self.table.currentRow()
+        self.table.setRowCount(len(self.snapshot))
+        for row, (name, stats) in enumerate(self.snapshot.items()):
+            values = (name, stats["count"], stats["mean_ms"], stats["p50_ms"],
+                      stats["p95_ms"], stats["max_ms"], stats["total_ms"])
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value if isinstance(value, str) else f"{value:,.1f}" if isinstance(value, float) else str(value))
+                if col:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, col, item)
+        self.since_label.setText(f"Since {PERF.started.strftime('%H:%M:%S')}")
+        self.show_histogram(current)
+
+    def show_histogram(self, row):
+        names = list(self.snapshot)
+        if not 0 <= row < len(names):
+            return
+        histogram = self.snapshot[names[row]]["histogram"]
+        peak = max(histogram.values()) or 1
+        lines = [f"{bucket:>9} {'█' * round(20 * count / peak):<20} {count}"
+                 for bucket, count in histogram.items() if count]
+        self.histogram_label.setText(f"{names[row]}\n" + "\n".join(lines))
+
+    def reset_stats(self):
+        PERF.reset()
+        self.refresh()
+
+    def export_stats(self):
+        default_filename = f"matterid_perf_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Performance Stats", default_filename, "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            PERF.export_json(file_path)
+            self.main_window.update_status(f"Performance stats exported → {file_path}", 5000)
+        except Exception as e:
+            logging.error(f"Error exporting performance stats: {e}")
+            QMessageBox.critical(self, "Export Error", f"Could not export stats:\n{e}")
 
 # User Card Widget
 class UserCard(QFrame):
@@ -2042,6 +2221,239 @@ class UserEditDialog(QDialog):
     def get_updated_data(self):
         return self.user_data
 
+# Duplicate Review Dialog
+class DuplicateReviewDialog(QDialog):
+    REVIEW_FIELDS = ["name", "email", "phone", "dob", "school", "finalCommittee", "finalPortfolio"]
+    
+    def __init__(self, clusters, users_data, parent=None):
+        super().__init__(parent)
+        self.clusters = clusters
+        self.users_data = users_data
+        self.decisions = {}  # cluster index -> ("merge", keep_id) or ("delete", doc_id)
+        self.init_ui()
+    
+    def init_ui(self):
+        self.setWindowTitle("Duplicate Delegates")
+        self.setModal(True)
+        self.resize(1000, 600)
+        
+        layout = QVBoxLayout()
+        
+        header_label = QLabel(f"🧬 {len(self.clusters)} possible duplicate group(s)")
+        header_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {MATTERID_COLORS['primary']}; margin: 10px;")
+        layout.addWidget(header_label)
+        
+        help_label = QLabel("Select a group, pick the record to keep, then merge or delete. Nothing is written until you apply.")
+        help_label.setWordWrap(True)
+        layout.addWidget(help_label)
+        
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        
+        self.cluster_list = QListWidget()
+        for i in range(len(self.clusters)):
+            self.cluster_list.addItem(QListWidgetItem(self.cluster_label(i)))
+        self.cluster_list.currentRowChanged.connect(self.show_cluster)
+        splitter.addWidget(self.cluster_list)
+        
+        self.records_table = QTableWidget()
+        self.records_table.setColumnCount(len(self.REVIEW_FIELDS) + 1)
+        self.records_table.setHorizontalHeaderLabels(["Document ID"] + self.REVIEW_FIELDS)
+        self.records_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.records_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.records_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        splitter.addWidget(self.records_table)
+        splitter.setSizes([250, 750])
+        layout.addWidget(splitter)
+        
+        button_layout = QHBoxLayout()
+        self.merge_btn = QPushButton("🔗 Merge Into Selected")
+        self.merge_btn.setToolTip("Keep the selected record, fill its empty fields from the others, delete the others")
+        self.delete_btn = QPushButton("🗑️ Delete Selected")
+        self.clear_btn = QPushButton("↩️ Clear Decision")
+        self.apply_btn = QPushButton("✅ Apply Changes")
+        self.cancel_btn = QPushButton("❌ Cancel")
+        
+        self.merge_btn.clicked.connect(self.merge_into_selected)
+        self.delete_btn.clicked.connect(self.delete_selected)
+        self.clear_btn.clicked.connect(self.clear_decision)
+        self.apply_btn.clicked.connect(self.accept)
+        self.cancel_btn.clicked.connect(self.reject)
+        
+        button_layout.addWidget(self.merge_btn)
+        button_layout.addWidget(self.delete_btn)
+        button_layout.addWidget(self.clear_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(self.apply_btn)
+        button_layout.addWidget(self.cancel_btn)
+        layout.addLayout(button_layout)
+        
+        self.setLayout(layout)
+        if self.clusters:
+            self.cluster_list.setCurrentRow(0)
+    
+    def cluster_label(self, index):
+        doc_ids, reasons = self.clusters[index]
+        label = f"Group {index + 1} • {len(doc_ids)} records • {', '.join(reasons)}"
+        decision = self.decisions.get(index)
+        if decision:
+            action, doc_id = decision
+            label += f"  →  {'merge into' if action == 'merge' else 'delete'} {doc_id}"
+        return label
+    
+    def show_cluster(self, index):
+        self.records_table.setRowCount(0)
+        if index < 0:
+            return
+        doc_ids, _ = self.clusters[index]
+        self.records_table.setRowCount(len(doc_ids))
+        for row, doc_id in enumerate(doc_ids):
+            data = self.users_data.get(doc_id) or {}
+            self.records_table.setItem(row, 0, QTableWidgetItem(doc_id))
+            for col, field in enumerate(self.REVIEW_FIELDS, start=1):
+                self.records_table.setItem(row, col, QTableWidgetItem(str(data.get(field, ""))))
+        self.records_table.resizeColumnsToContents()
+        self.records_table.selectRow(0)
+    
+    def selected_doc_id(self):
+        row = self.records_table.currentRow()
+        item = self.records_table.item(row, 0) if row >= 0 else None
+        return item.text() if item else None
+    
+    def set_decision(self, decision):
+        index = self.cluster_list.currentRow()
+        if index < 0:
+            return
+        if decision is None:
+            self.decisions.pop(index, None)
+        else:
+            self.decisions[index] = decision
+        self.cluster_list.item(index).setText(self.cluster_label(index))
+    
+    def merge_into_selected(self):
+        doc_id = self.selected_doc_id()
+        if doc_id:
+            self.set_decision(("merge", doc_id))
+    
+    def delete_selected(self):
+        doc_id = self.selected_doc_id()
+        if doc_id:
+            self.set_decision(("delete", doc_id))
+    
+    def clear_decision(self):
+        self.set_decision(None)
+    
+    def get_changes(self):
+        """(updates, deletes, merged) for the staged decisions.
+        
+        updates is {doc_id: filled_fields}, deletes [doc_id, ...] and merged {kept_id: [merged_id, ...]}.
+        """
+        updates = {}
+        deletes = []
+        merged = {}
+        for index, (action, doc_id) in self.decisions.items():
+            doc_ids, _ = self.clusters[index]
+            if action == "delete":
+                deletes.append(doc_id)
+                continue
+            others = [d for d in doc_ids if d != doc_id]
+            filled = merge_registrations(self.users_data.get(doc_id) or {},
+                                         [self.users_data.get(d) or {} for d in others])
+            if filled:
+                updates[doc_id] = filled
+            deletes.extend(others)
+            merged[doc_id] = others
+        return updates, deletes, merged
+
+# DataPrefetchThread
+class DataPrefetchThread(QThread):
+    """Loads the conference data in the background, e.g. while the user logs in"""
+
+    def __init__(self, client, collection_name, timer=None):
+        super().__init__()
+        self.client = client
+        self.collection_name = collection_name
+        self.timer = timer
+        self.result = None
+        self.error = None
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            self.result = load_conference_data(self.client, self.collection_name)
+        except Exception as e:
+            logging.error(f"Data prefetch failed: {e}\n{traceback.format_exc()}")
+            self.error = e
+        if self.timer:
+            self.timer.record("data prefetch", time.perf_counter() - start)
+
+    def take_result(self, collection_name):
+        """Wait for the prefetch; returns its data, or None if it failed or is for another collection"""
+        self.wait()
+        if self.error is not None or collection_name != self.collection_name:
+            return None
+        return self.result
+
+# DatasetSyncThread
+class DatasetSyncThread(QThread):
+    """Fetches what changed in a cached dataset since it was last synced"""
+    synced = pyqtSignal(object, object)  # CachedDataset, fetch_dataset_changes() result
+    failed = pyqtSignal(object, str)
+
+    def __init__(self, client, dataset, states):
+        super().__init__()
+        self.client = client
+        self.dataset = dataset  # only handed back; the GUI thread owns it
+        self.states = states
+
+    def run(self):
+        try:
+            result = fetch_dataset_changes(self.client, self.states)
+        except Exception as e:
+            logging.error(f"Sync of cached dataset '{self.dataset.collection_name}' failed: "
+                          f"{e}\n{traceback.format_exc()}")
+            self.failed.emit(self.dataset, str(e))
+            return
+        self.synced.emit(self.dataset, result)
+
+# HubEventsThread
+class HubEventsThread(QThread):
+    """Long-polls the sync hub for check-ins made at other stations"""
+    events_received = pyqtSignal(list)
+    resync_needed = pyqtSignal()
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+        self.stopping = False
+
+    def stop(self):
+        self.stopping = True
+        self.client.close()  # wakes the poll that is waiting on the hub
+
+    def run(self):
+        reported_resync = False
+        while not self.stopping:
+            if self.client.hub_id is None:
+                # Nothing loaded yet, or the main window is reloading after a resync
+                self.msleep(250)
+                continue
+            try:
+                events = self.client.poll(HUB_POLL_WAIT_S)
+            except Exception as e:
+                if self.stopping:
+                    return
+                logging.warning(f"Lost contact with the sync hub at {self.client.url}: {e}")
+                self.msleep(2000)
+                continue
+            if events is None:
+                if not reported_resync:
+                    reported_resync = True
+                    self.resync_needed.emit()
+                continue
+            reported_resync = False
+            if events:
+                self.events_received.emit(events)
+
 # Initial MatterID Splash Screen
 def show_matterid_splash_screen(app):
     dialog = QDialog()
@@ -2091,32 +2503,60 @@ def show_matterid_splash_screen(app):
     dialog.resize(500, 300)
     dialog.show()
     
-    QTimer.singleShot(3000, dialog.accept)
+    # Non-blocking: the caller closes the splash once startup work is done
     app.processEvents()
-    dialog.exec()
+    return dialog
 
 # MainWindow
 DEBOUNCE_TIME_MS = 350
+TABLE_EDIT_TRIGGERS = (
+    QTableWidget.EditTrigger.DoubleClicked |
+    QTableWidget.EditTrigger.EditKeyPressed |
+    QTableWidget.EditTrigger.AnyKeyPressed
+)
 SAVE_FEEDBACK_DURATION_MS = 1500
 UNSAVED_COLOR = QColor(255, 255, 204)
 SAVE_SUCCESS_COLOR = QColor(204, 255, 204)
 SAVE_ERROR_COLOR = QColor(255, 204, 204)
 
 class MainWindow(QMainWindow):
-    def __init__(self, config_manager):
+    def __init__(self, config_manager, prefetch=None):
         super().__init__()
         self.config_manager = config_manager
+        # DataPrefetchThread started during login, consumed by the first load_data
+        self.prefetch = prefetch
         logging.info("Initializing MatterID - Manager v2.5…")
         self.setWindowTitle("MatterID - Manager v2.5 • Configuration")
         self.resize(1400, 900)
         self.unsaved_changes = set()
         self.all_loaded_data = {}
         self.attendance_data = {}
+        # Bumped on every change to all_loaded_data / attendance_data
+        self.data_version = 0
+        self.columnar_store = None
+        self.columnar_store_version = -1
         self.demo_mode = False
 
+        # Recently loaded (key_url, collection) datasets, so switching back skips the full reload
+        config = config_manager.get_config()
+        on_disk = str(config.get("dataset_cache_on_disk", False)).lower() in ("true", "1")
+        self.dataset_cache = DatasetCache(int(config.get("dataset_cache_size", DATASET_CACHE_SIZE) or 1),
+                                          private_data_dir("datasets") if on_disk else None)
+        self.dataset_key = None
+        self.firestore_clients = {config.get("key_url", ""): db}
+        self.dataset_syncs = []
+
         self.init_ui()
         self.load_data()
 
+        # Check-in stations follow the other stations' check-ins through the hub
+        self.hub_events = None
+        if hub is not None:
+            self.hub_events = HubEventsThread(hub)
+            self.hub_events.events_received.connect(self.apply_hub_events)
+            self.hub_events.resync_needed.connect(self.on_hub_resync)
+            self.hub_events.start()
+
     def init_ui(self):
         self.tab_widget = QTabWidget()
         self.tab_widget.currentChanged.connect(self.on_tab_changed)
@@ -2144,12 +2584,44 @@ class MainWindow(QMainWindow):
         self.analytics_view = AnalyticsView(self)
         self.tab_widget.addTab(self.analytics_view, "📈 Analytics")
         
+        # Diagnostics Tab: hidden until toggled with Ctrl+Shift+D
+        self.diagnostics_view = DiagnosticsView(self)
+
+        # Data-driven tabs are rebuilt lazily, only once they become visible
+        self.view_refreshers = {
+            self.spreadsheet_tab: self.populate_table,
+            self.user_view: lambda: self.user_view.update_users(self.all_loaded_data),
+            self.attendance_view: lambda: self.attendance_view.update_attendance_data(
+                self.all_loaded_data, self.attendance_data),
+            self.analytics_view: lambda: self.analytics_view.update_data(
+                self.all_loaded_data, self.attendance_data),
+        }
+        self.dirty_views = set(self.view_refreshers)
+        
         # Status Bar
         self.statusBar = QStatusBar()
         self.setStatusBar(self.statusBar)
         self.status_row_count_label = QLabel("Rows: 0 / 0")
         self.statusBar.addPermanentWidget(self.status_row_count_label)
         
+        # Firestore operations used this session
+        self.firestore_meter_label = QLabel()
+        self.statusBar.addPermanentWidget(self.firestore_meter_label)
+        FIRESTORE_METER_SIGNALS.changed.connect(self.update_firestore_meter_label)
+        self.update_firestore_meter_label()
+        
+        # Background job (export / import) progress
+        self.job_thread = None
+        self.job_description = ""
+        self.job_progress_bar = QProgressBar()
+        self.job_progress_bar.setMaximumWidth(200)
+        self.job_progress_bar.setVisible(False)
+        self.job_cancel_button = QPushButton("✖ Cancel")
+        self.job_cancel_button.clicked.connect(self.cancel_job)
+        self.job_cancel_button.setVisible(False)
+        self.statusBar.addPermanentWidget(self.job_progress_bar)
+        self.statusBar.addPermanentWidget(self.job_cancel_button)
+        
         # Version label
         version_label = QLabel("MatterID - Manager v2.5")
         version_label.setStyleSheet(f"color: {MATTERID_COLORS['text_muted']}; font-style: italic;")
@@ -2162,6 +2634,36 @@ class MainWindow(QMainWindow):
         tab_names = ["Configuration", "Spreadsheet View", "Delegate View", "Attendance", "Analytics"]
         if 0 <= index < len(tab_names):
             self.setWindowTitle(f"MatterID - Manager v2.5 • {tab_names[index]}")
+        self.refresh_current_view()
+
+    def mark_views_dirty(self, views=None):
+        """Flag views as stale and rebuild only the one currently visible"""
+        self.dirty_views.update(views if views is not None else self.view_refreshers)
+        self.refresh_current_view()
+
+    def mark_data_changed(self, views=None):
+        """Invalidate cached aggregates and flag views built from the data"""
+        self.data_version += 1
+        self.mark_views_dirty(views)
+
+    def get_columnar_store(self):
+        """Columnar view of all_loaded_data, rebuilt once per data_version"""
+        if self.columnar_store is None or self.columnar_store_version != self.data_version:
+            config = self.config_manager.get_config()
+            fields = [col.get("field") for col in config.get("table_columns", []) if col.get("field")]
+            self.columnar_store = ColumnarStore(self.all_loaded_data, fields + list(ANALYTICS_FIELDS))
+            self.columnar_store.derived("registeredAt", registration_timestamp)
+            self.columnar_store_version = self.data_version
+        return self.columnar_store
+
+    def refresh_current_view(self):
+        # on_tab_changed fires while init_ui is still adding tabs
+        if not hasattr(self, "dirty_views"):
+            return
+        view = self.tab_widget.currentWidget()
+        if view in self.dirty_views:
+            self.dirty_views.discard(view)
+            self.view_refreshers[view]()
 
     def init_spreadsheet_tab(self):
         layout = QVBoxLayout()
@@ -2224,11 +2726,7 @@ class MainWindow(QMainWindow):
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setSortingEnabled(True)
         self.table.setAlternatingRowColors(True)
-        self.table.setEditTriggers(
-            QTableWidget.EditTrigger.DoubleClicked |
-            QTableWidget.EditTrigger.EditKeyPressed |
-            QTableWidget.EditTrigger.AnyKeyPressed
-        )
+        self.table.setEditTriggers(TABLE_EDIT_TRIGGERS)
         self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.table.customContextMenuRequested.connect(self.show_table_context_menu)
         self.table.itemSelectionChanged.connect(self.update_button_states)
@@ -2240,15 +2738,31 @@ class MainWindow(QMainWindow):
 
         self.save_all_button = QPushButton("💾 Save All Changes")
         self.save_all_button.setToolTip("Save all rows with unsaved changes")
-        self.save_all_button.clicked.connect(self.autosave_all_rows)
+        self.save_all_button.clicked.connect(lambda: self.autosave_all_rows())  # decorated: drop checked
 
         self.export_all_button = QPushButton("📤 Export All")
-        self.export_all_button.setToolTip("Export entire dataset from Firestore as CSV")
+        self.export_all_button.setToolTip("Export all loaded rows as CSV")
         self.export_all_button.clicked.connect(self.export_all_data)
 
+        self.server_export_button = QPushButton("☁️ Server Export")
+        self.server_export_button.setToolTip("Export a whole Firestore collection with attendance, page by page, without loading it")
+        self.server_export_button.clicked.connect(self.export_from_firestore)
+
+        self.changes_export_button = QPushButton("🔁 Export Changes")
+        self.changes_export_button.setToolTip("Export only rows added, changed or removed since the last export to a destination")
+        self.changes_export_button.clicked.connect(lambda: self.export_changes())  # decorated: drop checked
+
+        self.import_button = QPushButton("📥 Import CSV")
+        self.import_button.setToolTip("Validate a CSV file and upsert its rows into the collection in batches")
+        self.import_button.clicked.connect(self.import_csv)
+
+        self.duplicates_button = QPushButton("🧬 Find Duplicates")
+        self.duplicates_button.setToolTip("Find delegates sharing an email, phone number or name + DOB")
+        self.duplicates_button.clicked.connect(self.review_duplicates)
+
         self.delete_button = QPushButton("🗑️ Delete Selected")
         self.delete_button.setToolTip("Delete selected row(s) from Firestore")
-        self.delete_button.clicked.connect(self.delete_selected_documents)
+        self.delete_button.clicked.connect(lambda: self.delete_selected_documents())  # decorated: drop checked
         self.delete_button.setObjectName("delete_button")
         self.delete_button.setEnabled(False)
 
@@ -2256,6 +2770,10 @@ class MainWindow(QMainWindow):
         action_layout.addWidget(self.refresh_button)
         action_layout.addWidget(self.save_all_button)
         action_layout.addWidget(self.export_all_button)
+        action_layout.addWidget(self.changes_export_button)
+        action_layout.addWidget(self.server_export_button)
+        action_layout.addWidget(self.import_button)
+        action_layout.addWidget(self.duplicates_button)
         action_layout.addStretch()
         action_layout.addWidget(self.delete_button)
 
@@ -2282,16 +2800,107 @@ class MainWindow(QMainWindow):
 
     def on_config_changed(self):
         self.update_table_structure()
-        self.load_data(reload_all=False)
+        config = self.config_manager.get_config()
+        key = (config.get("key_url", ""), config.get("collection_name", "registrations"))
+        # After a failed load dataset_key is None, so any fixed key / collection gets a fresh load
+        if db is not None and hub is None and key != self.dataset_key:
+            self.switch_dataset(*key)
+        else:
+            self.load_data(reload_all=False)
+
+    def restore_dataset_config(self):
+        """Point key_url / collection_name back at the loaded dataset, so saves keep going where it came from"""
+        if self.dataset_key is None:
+            return  # demo data after a failed load: nothing to point back at
+        key_url, collection_name = self.dataset_key
+        config = self.config_manager.get_config()
+        config["key_url"], config["collection_name"] = key_url, collection_name
+        self.config_manager.save_config(config)
+        self.config_tab.load_config()
+
+    @PERF.traced("data.switch")
+    @FIRESTORE_METER.feature("Data load")
+    def switch_dataset(self, key_url, collection_name):
+        """Show another key_url / collection: from the dataset cache with a delta sync, else a full load"""
+        global db
+        if self.unsaved_changes:
+            reply = QMessageBox.question(
+                self, "Unsaved Changes",
+                f"You have {len(self.unsaved_changes)} unsaved change(s). "
+                "Switching datasets will discard them. Continue?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.No:
+                self.restore_dataset_config()
+                self.update_status("Dataset switch cancelled; the configuration still points at the loaded data.")
+                return
+            self.unsaved_changes.clear()
 
+        client = self.firestore_clients.get(key_url)
+        if client is None:
+            if isinstance(getattr(db, "_client", None), FakeFirestore):
+                client = db  # the in-memory client stands in for every key
+            else:
+                self.update_status(f"Opening {key_url}…")
+                QApplication.processEvents()
+                try:
+                    client = firestore_client_for_key(key_url)
+                except Exception as e:
+                    logging.error(f"Could not open key {key_url}: {e}\n{traceback.format_exc()}")
+                    QMessageBox.warning(self, "MatterID Error", f"Could not open the key at {key_url}:\n{e}")
+                    self.restore_dataset_config()
+                    return
+            self.firestore_clients[key_url] = client
+        db = client
+
+        dataset = self.dataset_cache.get(key_url, collection_name)
+        if dataset is None:
+            self.load_data(reload_all=True)
+            return
+        self.all_loaded_data, self.attendance_data = dataset.registrations, dataset.attendance
+        self.dataset_key = dataset.key
+        self.demo_mode = False
+        self.data_version += 1
+        self.mark_views_dirty()
+        logging.info(f"Switched to cached dataset '{collection_name}' ({len(self.all_loaded_data)} documents, "
+                     f"synced {format_timestamp(dataset.synced_at)}); fetching changes since then…")
+        self.update_status(f"Switched to '{collection_name}' • syncing changes…")
+
+        thread = DatasetSyncThread(db.for_feature("Dataset sync"), dataset, dataset_sync_states(dataset))
+        thread.synced.connect(self.on_dataset_synced)
+        thread.failed.connect(self.on_dataset_sync_failed)
+        self.dataset_syncs = [running for running in self.dataset_syncs if running.isRunning()] + [thread]
+        thread.start()
+
+    def on_dataset_synced(self, dataset, result):
+        current = dataset.key == self.dataset_key
+        applied = apply_dataset_changes(dataset, result, self.unsaved_changes if current else ())
+        logging.info(f"Cached dataset '{dataset.collection_name}' synced: {applied} document(s) changed.")
+        if not current:
+            return
+        self.update_status(f"Ready • '{dataset.collection_name}' up to date ({applied} change(s) since last sync)")
+        if applied:
+            # A table rebuild would drop unsaved cell edits
+            views = [view for view in self.view_refreshers
+                     if view is not self.spreadsheet_tab or not self.unsaved_changes]
+            self.mark_data_changed(views)
+
+    def on_dataset_sync_failed(self, dataset, error):
+        if dataset.key == self.dataset_key:
+            self.update_status(f"Showing cached '{dataset.collection_name}'; sync failed: {error}", error=True)
+
+    @FIRESTORE_METER.feature("Delegate edit")
     def edit_user(self, doc_id):
+        if self.refuse_at_station("Editing delegates"):
+            return
         user_data = self.all_loaded_data.get(doc_id)
         if user_data:
             dialog = UserEditDialog(doc_id, user_data, self.config_manager, self)
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 updated_data = dialog.get_updated_data()
                 try:
-                    updated_data["updatedAt"] = firestore.SERVER_TIMESTAMP if db else datetime.now()
+                    updated_data["updatedAt"] = server_timestamp(db) if db else datetime.now()
                     
                     if db:
                         config = self.config_manager.get_config()
@@ -2299,55 +2908,52 @@ class MainWindow(QMainWindow):
                         db.collection(collection_name).document(doc_id).update(updated_data)
                     
                     self.all_loaded_data[doc_id] = updated_data
-                    self.populate_table()
-                    self.user_view.update_users(self.all_loaded_data)
+                    self.mark_data_changed()
                     
                     QMessageBox.information(self, "Success", "Delegate updated successfully!")
                     
                 except Exception as e:
                     QMessageBox.critical(self, "Error", f"Failed to update delegate: {e}")
 
+    @PERF.traced("data.load")
+    @FIRESTORE_METER.feature("Data load")
     def load_data(self, reload_all=True):
         if reload_all:
             self.update_status("Loading data…")
             QApplication.processEvents()
             
             try:
-                if db is None:
+                dataset = None
+                if hub is not None:
+                    # Check-in station: the hub serves its cached copy over the LAN
+                    collection_name, registrations, attendance = hub.load_conference_data()
+                    demo_mode = False
+                    logging.info(f"Loaded {len(registrations)} delegates of '{collection_name}' "
+                                 f"from the sync hub at {hub.url}.")
+                elif db is None:
                     # Demo mode
-                    self.demo_mode = True
-                    self.all_loaded_data = DemoDataGenerator.generate_demo_delegates()
-                    self.attendance_data = DemoDataGenerator.generate_demo_attendance()
-                    logging.info(f"Demo mode: Loaded {len(self.all_loaded_data)} demo delegates.")
-                    self.update_status("Ready • Demo Mode • MatterID - Manager v2.5")
+                    demo_mode = True
+                    registrations = DemoDataGenerator.generate_demo_delegates()
+                    attendance = DemoDataGenerator.generate_demo_attendance()
+                    logging.info(f"Demo mode: Loaded {len(registrations)} demo delegates.")
                 else:
                     # Production mode
                     config = self.config_manager.get_config()
                     collection_name = config.get("collection_name", "registrations")
                     
-                    # Load registrations
-                    collection_ref = db.collection(collection_name)
-                    docs = list(collection_ref.stream())
-                    self.all_loaded_data = {
-                        doc.id: doc.to_dict()
-                        for doc in docs if doc.exists
-                    }
-                    
-                    # Load attendance data
-                    try:
-                        attendance_ref = db.collection("attendance")
-                        attendance_docs = list(attendance_ref.stream())
-                        self.attendance_data = {
-                            doc.id: doc.to_dict()
-                            for doc in attendance_docs if doc.exists
-                        }
-                        logging.info(f"Loaded {len(self.attendance_data)} attendance records.")
-                    except Exception as e:
-                        logging.warning(f"Could not load attendance data: {e}")
-                        self.attendance_data = {}
+                    loaded = None
+                    if self.prefetch is not None:
+                        prefetch, self.prefetch = self.prefetch, None
+                        loaded = prefetch.take_result(collection_name)
+                    if loaded is None:
+                        loaded = load_conference_data(db, collection_name)
+                    registrations, attendance = loaded
+                    demo_mode = False
+                    dataset = cached_dataset(config.get("key_url", ""), collection_name, *loaded)
                     
-                    logging.info(f"Loaded {len(self.all_loaded_data)} documents from Firestore.")
+                    logging.info(f"Loaded {len(registrations)} documents from Firestore.")
 
+                # Nothing is replaced until the user agrees to drop their edits
                 if self.unsaved_changes:
                     reply = QMessageBox.question(
                         self, "Unsaved Changes",
@@ -2357,25 +2963,48 @@ class MainWindow(QMainWindow):
                         QMessageBox.StandardButton.No
                     )
                     if reply == QMessageBox.StandardButton.No:
+                        if self.dataset_key is not None:
+                            self.restore_dataset_config()
                         self.update_status("Reload cancelled.")
                         return
                     self.unsaved_changes.clear()
 
+                self.demo_mode = demo_mode
+                self.all_loaded_data, self.attendance_data = registrations, attendance
+                if dataset is not None:
+                    self.dataset_key = dataset.key
+                    self.dataset_cache.put(dataset)
+                if demo_mode:
+                    self.update_status("Ready • Demo Mode • MatterID - Manager v2.5")
+
             except Exception as e:
                 logging.error(f"Error loading data: {e}\n{traceback.format_exc()}")
                 # Fallback to demo mode
                 self.demo_mode = True
+                self.dataset_key = None
                 self.all_loaded_data = DemoDataGenerator.generate_demo_delegates()
                 self.attendance_data = DemoDataGenerator.generate_demo_attendance()
                 QMessageBox.warning(self, "Connection Error", 
                                   f"Could not connect to database. Running in demo mode.\nError: {e}")
                 self.update_status("Ready • Demo Mode • MatterID - Manager v2.5")
 
-        self.populate_table()
-        self.user_view.update_users(self.all_loaded_data)
-        self.attendance_view.update_attendance_data(self.all_loaded_data, self.attendance_data)
-        self.analytics_view.update_data(self.all_loaded_data, self.attendance_data)
+            self.data_version += 1
+            self.apply_station_mode()
+
+        self.mark_views_dirty()
 
+    def apply_hub_events(self, events):
+        for event in events:
+            self.attendance_data.setdefault(event["doc_id"], {})[event["day"]] = event["present"]
+        if self.attendance_view not in self.dirty_views:
+            self.attendance_view.apply_remote_attendance(events)
+        self.mark_data_changed([self.analytics_view])
+
+    def on_hub_resync(self):
+        logging.info("The sync hub restarted or this station fell behind; reloading from the hub.")
+        self.load_data(reload_all=True)
+
+    @PERF.traced("table.populate")
     def populate_table(self):
         self.update_status("Filtering and displaying data…")
         QApplication.processEvents()
@@ -2389,28 +3018,14 @@ class MainWindow(QMainWindow):
         filter_field = self.filter_field_combo.currentText()
         filter_value = self.filter_text_edit.text().strip().lower()
 
-        filtered_ids = []
-        for doc_id, data in self.all_loaded_data.items():
-            if data is None:
-                continue
-            match = True
-
-            if search_value:
-                if search_field == "Document ID":
-                    if search_value not in doc_id.lower():
-                        match = False
-                else:
-                    field_data = str(data.get(search_field, "")).lower()
-                    if search_value not in field_data:
-                        match = False
-
-            if match and filter_value:
-                field_data = str(data.get(filter_field, "")).lower()
-                if filter_value != field_data:
-                    match = False
-
-            if match:
-                filtered_ids.append(doc_id)
+        store = self.get_columnar_store()
+        rows = None
+        if search_value:
+            search_column = None if search_field == "Document ID" else search_field
+            rows = store.match_rows(search_column, lambda text: search_value in text)
+        if filter_value:
+            rows = store.match_rows(filter_field, lambda text: text == filter_value, rows)
+        filtered_ids = store.doc_ids if rows is None else [store.doc_ids[i] for i in rows]
 
         self.table.setRowCount(len(filtered_ids))
         visible_row_count = 0
@@ -2481,6 +3096,9 @@ class MainWindow(QMainWindow):
 
     def refresh_data(self):
         logging.info("Refresh requested.")
+        # One read per registration and attendance document, judging by the last load
+        if not self.confirm_firestore_budget("Refresh", len(self.all_loaded_data) + len(self.attendance_data)):
+            return
         self.load_data(reload_all=True)
 
     def reset_view(self):
@@ -2530,6 +3148,14 @@ class MainWindow(QMainWindow):
     def set_row_color(self, row, color=None):
         if row < 0 or row >= self.table.rowCount():
             return
+        # A background change emits itemChanged, which would mark the row unsaved again
+        blocked = self.table.blockSignals(True)
+        try:
+            self.paint_row(row, color)
+        finally:
+            self.table.blockSignals(blocked)
+
+    def paint_row(self, row, color):
         for col in range(self.table.columnCount()):
             item = self.table.item(row, col)
             widget = self.table.cellWidget(row, col)
@@ -2564,8 +3190,10 @@ class MainWindow(QMainWindow):
                 return r
         return -1
 
+    @PERF.traced("row.save")
+    @FIRESTORE_METER.feature("Row save")
     def save_row(self, row):
-        if row < 0 or row >= self.table.rowCount():
+        if row < 0 or row >= self.table.rowCount() or self.refuse_at_station("Saving rows"):
             return
         doc_id_item = self.table.item(row, 0)
         if not doc_id_item:
@@ -2605,7 +3233,7 @@ class MainWindow(QMainWindow):
                             break
 
             if validation_ok and updated_data:
-                updated_data["updatedAt"] = firestore.SERVER_TIMESTAMP if db else datetime.now()
+                updated_data["updatedAt"] = server_timestamp(db) if db else datetime.now()
 
         finally:
             self.table.blockSignals(False)
@@ -2629,8 +3257,9 @@ class MainWindow(QMainWindow):
             if db:
                 config = self.config_manager.get_config()
                 collection_name = config.get("collection_name", "registrations")
-                logging.info(f"Updating Firestore doc '{doc_id}' with data: "
-                           f"{ {k: v for k, v in updated_data.items() if k != 'updatedAt'} }")
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug(f"Updating Firestore doc '{doc_id}' with data: "
+                                  f"{ {k: v for k, v in updated_data.items() if k != 'updatedAt'} }")
                 db.collection(collection_name).document(doc_id).update(updated_data)
 
                 updated_doc = db.collection(collection_name).document(doc_id).get()
@@ -2643,6 +3272,8 @@ class MainWindow(QMainWindow):
             if doc_id in self.unsaved_changes:
                 self.unsaved_changes.remove(doc_id)
 
+            # The table row already shows the saved values; rebuild the rest lazily
+            self.mark_data_changed([self.user_view, self.attendance_view, self.analytics_view])
             self.flash_row_color(row, SAVE_SUCCESS_COLOR)
             self.update_status(f"Saved {doc_id}")
             logging.info(f"Successfully updated document {doc_id}")
@@ -2653,7 +3284,11 @@ class MainWindow(QMainWindow):
             self.flash_row_color(row, SAVE_ERROR_COLOR)
             self.update_status(f"Error saving {doc_id}", error=False)
 
+    @PERF.traced("rows.autosave")
+    @LOG_RATE_LIMITER.batch("Save all rows")
     def autosave_all_rows(self):
+        if self.refuse_at_station("Saving rows"):
+            return
         doc_ids_to_save = list(self.unsaved_changes)
         if not doc_ids_to_save:
             QMessageBox.information(self, "Save All", "No unsaved changes to save.")
@@ -2699,7 +3334,10 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "Save All Complete", summary_msg)
         self.update_status("Ready")
 
+    @FIRESTORE_METER.feature("Delete")
     def delete_selected_documents(self):
+        if self.refuse_at_station("Deleting delegates"):
+            return
         selected_rows = sorted(
             list(set(item.row() for item in self.table.selectedItems())),
             reverse=True
@@ -2718,6 +3356,9 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Delete Error", "Could not find valid Document IDs.")
             return
 
+        if not self.confirm_firestore_budget("Delete", len(doc_ids_to_delete)):
+            return
+
         confirm = QMessageBox.question(
             self, "Confirm Deletion",
             f"Are you sure you want to delete {len(doc_ids_to_delete)} document(s)?",
@@ -2756,6 +3397,7 @@ class MainWindow(QMainWindow):
         progress.close()
 
         if deleted_count > 0:
+            self.data_version += 1
             self.load_data(reload_all=False)
 
         summary_msg = f"Deletion finished.\nDeleted: {deleted_count}\nErrors: {error_count}"
@@ -2766,6 +3408,92 @@ class MainWindow(QMainWindow):
         self.update_status("Ready")
         self.update_button_states()
 
+    def review_duplicates(self):
+        if self.refuse_at_station("Resolving duplicates"):
+            return
+        clusters = find_duplicate_clusters(self.all_loaded_data)
+        logging.info(f"Duplicate scan found {len(clusters)} group(s) in {len(self.all_loaded_data)} documents.")
+        if not clusters:
+            QMessageBox.information(self, "Find Duplicates", "No duplicate delegates found.")
+            return
+        
+        dialog = DuplicateReviewDialog(clusters, self.all_loaded_data, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        updates, deletes, merged = dialog.get_changes()
+        if not updates and not deletes:
+            return
+        
+        confirm = QMessageBox.question(
+            self, "Apply Duplicate Resolution",
+            f"Update {len(updates)} and delete {len(deletes)} document(s)?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+        self.apply_duplicate_resolution(updates, deletes, merged)
+
+    @FIRESTORE_METER.feature("Duplicate resolution")
+    def apply_duplicate_resolution(self, updates, deletes, merged=None):
+        """Write merged fields and deletions in one atomic batch, then update local data.
+        
+        merged maps each kept doc ID to the duplicates folded into it; their check-ins
+        carry over to the kept record before their attendance documents are deleted.
+        """
+        if self.refuse_at_station("Resolving duplicates"):
+            return
+        check_ins = {}
+        for keep_id, others in (merged or {}).items():
+            days = merge_attendance(self.attendance_data.get(keep_id),
+                                    [self.attendance_data.get(doc_id) for doc_id in others])
+            if days:
+                check_ins[keep_id] = days
+        # Each deleted duplicate also loses its attendance record
+        operation_count = len(updates) + len(check_ins) + 2 * len(deletes)
+        if operation_count > FIRESTORE_BATCH_LIMIT:
+            QMessageBox.warning(
+                self, "Duplicate Resolution Too Large",
+                f"This resolution needs {operation_count} writes, but one atomic batch allows "
+                f"{FIRESTORE_BATCH_LIMIT}.\nNo changes were applied; resolve fewer groups at a time."
+            )
+            return
+        try:
+            if db and not self.demo_mode:
+                config = self.config_manager.get_config()
+                collection_ref = db.collection(config.get("collection_name", "registrations"))
+                attendance_ref = db.collection("attendance")
+                operations = [
+                    ("update", collection_ref.document(doc_id), dict(fields, updatedAt=server_timestamp(db)))
+                    for doc_id, fields in updates.items()
+                ]
+                operations += [
+                    ("merge", attendance_ref.document(doc_id),
+                     dict(days, updatedAt=server_timestamp(db), recordedBy="duplicate_merge"))
+                    for doc_id, days in check_ins.items()
+                ]
+                for doc_id in deletes:
+                    operations.append(("delete", collection_ref.document(doc_id), None))
+                    operations.append(("delete", attendance_ref.document(doc_id), None))
+                commit_batched_writes(db, operations)
+                logging.info(f"Duplicate resolution committed {len(operations)} operation(s) in one batch.")
+        except Exception as e:
+            logging.error(f"Error applying duplicate resolution: {e}\n{traceback.format_exc()}")
+            QMessageBox.critical(self, "Duplicate Resolution Error", f"No changes were applied:\n{e}")
+            return
+        
+        for doc_id, fields in updates.items():
+            if self.all_loaded_data.get(doc_id) is not None:
+                self.all_loaded_data[doc_id].update(fields)
+        for doc_id, days in check_ins.items():
+            self.attendance_data.setdefault(doc_id, {}).update(days)
+        for doc_id in deletes:
+            self.all_loaded_data.pop(doc_id, None)
+            self.attendance_data.pop(doc_id, None)
+            self.unsaved_changes.discard(doc_id)
+        self.mark_data_changed()
+        self.update_status(f"Duplicates resolved • {len(updates)} merged, {len(deletes)} deleted")
+
     def download_filtered_data(self):
         visible_rows = self.table.rowCount()
         if visible_rows == 0:
@@ -2777,37 +3505,22 @@ class MainWindow(QMainWindow):
         if not file_path:
             return
 
-        try:
-            config = self.config_manager.get_config()
-            table_columns = config.get("table_columns", [])
-            
-            with open(file_path, mode="w", newline="", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                header = [col.get("display", "") for col in table_columns]
-                writer.writerow(header)
-                
-                for row in range(visible_rows):
-                    row_data = []
-                    doc_id_item = self.table.item(row, 0)
-                    if doc_id_item:
-                        doc_id = doc_id_item.text()
-                        data = self.all_loaded_data.get(doc_id, {})
-                        
-                        for col_index, column_config in enumerate(table_columns):
-                            field_name = column_config.get("field")
-                            if field_name is None:
-                                row_data.append(doc_id)
-                            elif field_name == "updatedAt":
-                                row_data.append(format_timestamp(data.get(field_name)))
-                            else:
-                                row_data.append(data.get(field_name, ""))
-                        writer.writerow(row_data)
-            
-            QMessageBox.information(self, "Success", f"Visible data successfully exported to:\n{file_path}")
-            self.update_status("Export complete.")
-        except Exception as e:
-            logging.error(f"Error exporting filtered data: {e}")
-            QMessageBox.critical(self, "Export Error", f"Error exporting data:\n{e}")
+        config = self.config_manager.get_config()
+        table_columns = config.get("table_columns", [])
+        store = self.get_columnar_store()
+        prepare_table_export(store, table_columns)
+
+        # Visible rows in their on-screen (possibly sorted) order
+        rows = []
+        for row in range(visible_rows):
+            doc_id_item = self.table.item(row, 0)
+            if doc_id_item and doc_id_item.text() in store.row_of:
+                rows.append(store.row_of[doc_id_item.text()])
+
+        header = [col.get("display", "") for col in table_columns]
+        self.start_export(
+            file_path, header, iter_table_export_rows(store, table_columns, rows), len(rows), "Filtered export"
+        )
 
     def export_all_data(self):
         total_docs = len(self.all_loaded_data)
@@ -2820,34 +3533,238 @@ class MainWindow(QMainWindow):
         if not file_path:
             return
 
+        config = self.config_manager.get_config()
+        table_columns = config.get("table_columns", [])
+        store = self.get_columnar_store()
+        prepare_table_export(store, table_columns)
+
+        header = [col.get("display", "") for col in table_columns]
+        self.start_export(
+            file_path, header, iter_table_export_rows(store, table_columns), len(store), "Full export"
+        )
+
+    @FIRESTORE_METER.feature("Export changes")
+    def export_changes(self):
+        """Export what changed since the last export to a destination, judged by server timestamps"""
+        config = self.config_manager.get_config()
+        collection_name = config.get("collection_name", "registrations")
+        destinations = list_export_destinations(collection_name)
+        destination, ok = QInputDialog.getItem(
+            self, "Export Changes", "Destination (remembers what it was last sent):",
+            destinations or ["logistics"], 0, True
+        )
+        destination = destination.strip()
+        if not ok or not destination:
+            return
+
+        state = load_export_state(collection_name, destination)
+        if db and not self.demo_mode:
+            # Local copies of fresh writes hold no server time yet, so read the delta from Firestore
+            self.update_status(f"Reading changes since the last export to '{destination}'...")
+            try:
+                candidates, current_ids = fetch_export_delta_source(db, collection_name, state)
+            except Exception as e:
+                logging.error(f"Error reading changes for export: {e}")
+                QMessageBox.critical(self, "Export Changes", f"Could not read changes from Firestore:\n{e}")
+                self.update_status("Changes export failed", error=True)
+                return
+        else:
+            candidates, current_ids = self.all_loaded_data, set(self.all_loaded_data)
+        changes, watermark = compute_export_delta(candidates, current_ids, state)
+        boundary_ids = ids_updated_at(candidates, watermark)
+        if not changes:
+            QMessageBox.information(self, "Export Changes", f"No changes since the last export to '{destination}'.")
+            return
+
+        default_filename = f"matterid_changes_{destination}_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Changes", default_filename, "CSV Files (*.csv)")
+        if not file_path:
+            return
+
+        table_columns = config.get("table_columns", [])
+        header = ["Change"] + [col.get("display", "") for col in table_columns]
+        thread = self.start_export(
+            file_path, header, iter_change_export_rows(changes, table_columns), len(changes),
+            f"Changes export to '{destination}'"
+        )
+        if thread is not None:
+            # The watermark only moves once the file is fully written
+            thread.export_finished.connect(
+                lambda *_: save_export_state(collection_name, destination, watermark, current_ids, boundary_ids))
+
+    def export_from_firestore(self):
+        """Page a whole collection straight from Firestore to CSV or NDJSON"""
+        if not db or self.demo_mode:
+            QMessageBox.information(self, "Demo Mode", "Server export needs a Firestore connection.")
+            return
+
+        config = self.config_manager.get_config()
+        collection_name, ok = QInputDialog.getText(
+            self, "Server Export", "Collection to export:",
+            text=config.get("collection_name", "registrations")
+        )
+        collection_name = collection_name.strip()
+        if not ok or not collection_name:
+            return
+
+        default_filename = f"matterid_{collection_name}_server_export_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Server Export", default_filename, "CSV Files (*.csv);;NDJSON Files (*.ndjson)"
+        )
+        if not file_path:
+            return
+        fmt = "ndjson" if file_path.endswith(".ndjson") or "NDJSON" in selected_filter else "csv"
+
+        # A read per registration plus a batched attendance read for each, judging by the loaded data
+        if not self.confirm_firestore_budget("Server export", 2 * len(self.all_loaded_data)):
+            return
+
+        table_columns = config.get("table_columns", [])
+        header = [col.get("display", "") for col in table_columns] + [f"Day {day[-1]}" for day in ATTENDANCE_DAYS]
+        rows = iter_firestore_export_rows(db.for_feature("Server export"), collection_name, table_columns, fmt)
+        self.start_export(file_path, header, rows, 0, f"Server export of '{collection_name}'", fmt)
+
+    def job_running(self):
+        if self.job_thread is not None and self.job_thread.isRunning():
+            QMessageBox.information(self, "Job In Progress", f"{self.job_description} is still running. Please wait or cancel it.")
+            return True
+        return False
+
+    def start_background_job(self, thread, description, total):
+        """Run a thread with progress(int, int) and cancel() behind the status bar progress bar"""
+        self.job_description = description
+        self.job_thread = thread
+        thread.progress.connect(self.on_job_progress)
+
+        self.job_progress_bar.setRange(0, total)  # (0, 0) shows a busy indicator
+        self.job_progress_bar.setValue(0)
+        self.job_progress_bar.setVisible(True)
+        self.job_cancel_button.setVisible(True)
+        self.update_status(f"{description} running…")
+        thread.start()
+
+    def start_export(self, file_path, header, rows, total, description, fmt="csv"):
+        """Stream rows to file_path on a background thread with status bar progress"""
+        if self.job_running():
+            return None
+
+        thread = StreamingExportThread(file_path, header, rows, total, fmt)
+        thread.export_finished.connect(self.on_export_finished)
+        thread.export_failed.connect(self.on_export_failed)
+        thread.export_cancelled.connect(self.on_export_cancelled)
+        self.start_background_job(thread, description, total)
+        return thread
+
+    def cancel_job(self):
+        if self.job_thread is not None and self.job_thread.isRunning():
+            self.job_thread.cancel()
+            self.update_status(f"Cancelling {self.job_description.lower()}…")
+
+    def on_job_progress(self, written, total):
+        if total:
+            self.job_progress_bar.setValue(written)
+            self.statusBar.showMessage(f"{self.job_description}: {written} / {total} rows")
+        else:
+            self.statusBar.showMessage(f"{self.job_description}: {written} rows")
+
+    def hide_job_progress(self):
+        self.job_progress_bar.setVisible(False)
+        self.job_cancel_button.setVisible(False)
+
+    def on_export_finished(self, file_path, written):
+        self.hide_job_progress()
+        logging.info(f"{self.job_description} wrote {written} rows to {file_path}")
+        self.update_status(f"{self.job_description} complete • {written} rows → {file_path}", 10000)
+
+    def on_export_failed(self, message):
+        self.hide_job_progress()
+        QMessageBox.critical(self, "Export Error", f"Error exporting data:\n{message}")
+        self.update_status(f"{self.job_description} failed", error=True)
+
+    def on_export_cancelled(self, file_path):
+        self.hide_job_progress()
+        self.update_status(f"{self.job_description} cancelled", 5000)
+
+    def import_csv(self):
+        if self.job_running() or self.refuse_at_station("Importing a CSV"):
+            return
+        file_path, _ = QFileDialog.getOpenFileName(self, "Import CSV", "", "CSV Files (*.csv)")
+        if not file_path:
+            return
+
+        config = self.config_manager.get_config()
+        client = db.for_feature("CSV import") if db and not self.demo_mode else None
+        if client is not None:
+            with open(file_path, encoding="utf-8-sig") as in_file:
+                estimated_writes = max(sum(1 for _ in in_file) - 1, 0)
+            if not self.confirm_firestore_budget("CSV import", estimated_writes):
+                return
+        reject_path = f"{os.path.splitext(file_path)[0]}_rejects.csv"
+        thread = CsvImportThread(file_path, client, config.get("collection_name", "registrations"),
+                                 config.get("table_columns", []), reject_path)
+        thread.import_finished.connect(self.on_import_finished)
+        thread.import_failed.connect(self.on_import_failed)
+        self.start_background_job(thread, f"Import of {os.path.basename(file_path)}", 0)
+
+    def on_import_finished(self, summary):
+        self.hide_job_progress()
+        # Firestore stamped these rows; a local clock reading here would skew export watermarks
+        updated_at = server_timestamp(db) if db else datetime.now()
+        for doc_id, fields in summary["imported"].items():
+            if self.all_loaded_data.get(doc_id) is not None:
+                self.all_loaded_data[doc_id].update(fields, updatedAt=updated_at)
+            else:
+                self.all_loaded_data[doc_id] = dict(fields, updatedAt=updated_at)
+        if summary["imported"]:
+            self.mark_data_changed()
+
+        imported = len(summary["imported"])
+        logging.info(f"{self.job_description}: {summary['read']} read, {imported} imported, "
+                     f"{summary['rejected']} rejected in {summary['commits']} commit(s).")
+        message = f"{imported} of {summary['read']} rows imported."
+        if summary["cancelled"]:
+            message = "Import cancelled. " + message
+        if summary["rejected"]:
+            message += f"\n{summary['rejected']} rows rejected; see:\n{summary['reject_path']}"
+            QMessageBox.warning(self, "Import Complete", message)
+        else:
+            QMessageBox.information(self, "Import Complete", message)
+        self.update_status(f"{self.job_description} • {imported} imported, {summary['rejected']} rejected", 10000)
+
+    def on_import_failed(self, error):
+        self.hide_job_progress()
+        QMessageBox.critical(self, "Import Error", f"Failed to import CSV:\n{error}")
+        self.update_status(f"{self.job_description} failed", error=True)
+
+    def update_firestore_meter_label(self):
+        totals = FIRESTORE_METER.totals()
+        self.firestore_meter_label.setText(
+            f"🔥 R {totals['reads']:,} · W {totals['writes']:,} · D {totals['deletes']:,}"
+            f" · ≈${FirestoreMeter.estimated_cost(totals):.4f}"
+        )
+        lines = [f"{feature}: {counts['reads']:,} reads, {counts['writes']:,} writes, {counts['deletes']:,} deletes"
+                 for feature, counts in FIRESTORE_METER.breakdown().items()]
+        self.firestore_meter_label.setToolTip("Firestore operations this session\n" + ("\n".join(lines) or "None yet"))
+
+    def confirm_firestore_budget(self, action, estimated_ops):
+        """Ask before an action estimated to use more Firestore operations than the budget"""
+        if not db or self.demo_mode:
+            return True
         try:
-            config = self.config_manager.get_config()
-            table_columns = config.get("table_columns", [])
-            
-            with open(file_path, mode="w", newline="", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                header = [col.get("display", "") for col in table_columns]
-                writer.writerow(header)
-                
-                for doc_id, data in self.all_loaded_data.items():
-                    if data is None:
-                        continue
-                    row_data = []
-                    for column_config in table_columns:
-                        field_name = column_config.get("field")
-                        if field_name is None:
-                            row_data.append(doc_id)
-                        elif field_name == "updatedAt":
-                            row_data.append(format_timestamp(data.get(field_name)))
-                        else:
-                            row_data.append(data.get(field_name, ""))
-                    writer.writerow(row_data)
-            
-            QMessageBox.information(self, "Success", f"All {total_docs} documents exported to:\n{file_path}")
-            self.update_status("Full export complete.")
-        except Exception as e:
-            logging.error(f"Error exporting all data: {e}")
-            QMessageBox.critical(self, "Export Error", f"Error exporting data:\n{e}")
+            budget = int(self.config_manager.get_config().get("firestore_budget", 10000))
+        except (TypeError, ValueError):
+            budget = 10000
+        if budget <= 0 or estimated_ops <= budget:
+            return True
+        logging.warning(f"{action} is estimated at {estimated_ops:,} Firestore operations (budget {budget:,}).")
+        reply = QMessageBox.question(
+            self, "Firestore Budget",
+            f"{action} is estimated to use about {estimated_ops:,} Firestore operations, "
+            f"above the budget of {budget:,} per action.\n\nContinue?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        return reply == QMessageBox.StandardButton.Yes
 
     def update_status(self, message, timeout=0, error=False):
         if error:
@@ -2859,7 +3776,28 @@ class MainWindow(QMainWindow):
 
     def update_button_states(self):
         has_selection = bool(self.table.selectedItems())
-        self.delete_button.setEnabled(has_selection)
+        self.delete_button.setEnabled(has_selection and not self.is_station())
+
+    def is_station(self):
+        """A check-in station reaches Firestore only through the hub, which takes attendance alone"""
+        return hub is not None and not self.demo_mode
+
+    def apply_station_mode(self):
+        """Make registrations read-only at a check-in station, where edits could not be saved"""
+        station = self.is_station()
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers if station else TABLE_EDIT_TRIGGERS)
+        for button in (self.save_all_button, self.import_button, self.duplicates_button):
+            button.setEnabled(not station)
+        self.update_button_states()
+
+    def refuse_at_station(self, action):
+        """True (after telling the user) when action would only change this station's copy"""
+        if not self.is_station():
+            return False
+        QMessageBox.information(self, "Check-in Station",
+                                f"{action} is not available at a check-in station; registrations can only be "
+                                f"changed on a machine connected to Firebase. Attendance still syncs via the hub.")
+        return True
 
     def keyPressEvent(self, event):
         key = event.key()
@@ -2869,14 +3807,26 @@ class MainWindow(QMainWindow):
             self.search_text_edit.setFocus()
             self.search_text_edit.selectAll()
             event.accept()
+        elif key == Qt.Key.Key_D and modifiers == (Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier):
+            self.toggle_diagnostics_tab()
+            event.accept()
         elif event.matches(QKeySequence.StandardKey.Save):
             current_row = self.table.currentRow()
-            if current_row >= 0:
+            # A stale (not yet rebuilt) table must not be written back
+            if current_row >= 0 and self.spreadsheet_tab not in self.dirty_views:
                 self.save_row(current_row)
             event.accept()
         else:
             super().keyPressEvent(event)
 
+    def toggle_diagnostics_tab(self):
+        index = self.tab_widget.indexOf(self.diagnostics_view)
+        if index >= 0:
+            self.tab_widget.removeTab(index)
+        else:
+            self.diagnostics_view.refresh()
+            self.tab_widget.setCurrentIndex(self.tab_widget.addTab(self.diagnostics_view, "🩺 Diagnostics"))
+
     def show_table_context_menu(self, pos):
         row = self.table.rowAt(pos.y())
         if row < 0:
@@ -2904,92 +3854,355 @@ class MainWindow(QMainWindow):
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                 QMessageBox.StandardButton.No
             )
-            if reply == QMessageBox.StandardButton.Yes:
-                event.accept()
-            else:
+            if reply != QMessageBox.StandardButton.Yes:
                 event.ignore()
-        else:
-            event.accept()
+                return
+        self.analytics_view.shutdown()
+        totals = FIRESTORE_METER.totals()
+        logging.info(f"Firestore operations this session: {totals} (≈${FirestoreMeter.estimated_cost(totals):.4f}); "
+                     f"by feature: {FIRESTORE_METER.breakdown()}")
+        if self.job_thread is not None and self.job_thread.isRunning():
+            self.job_thread.cancel()
+            self.job_thread.wait()
+        if self.hub_events is not None:
+            self.hub_events.stop()
+            self.hub_events.wait()
+        for thread in self.dataset_syncs:
+            thread.wait()
+        self.dataset_cache.persist()
+        event.accept()
+
+# Fake Firestore Mode
+def fake_firestore_from_args(argv, collection_name):
+    """A seeded in-memory client when argv asks for --fake-firestore, otherwise None"""
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--fake-firestore", type=int, nargs="?", const=200, metavar="DELEGATES")
+    parser.add_argument("--fake-latency", type=float, default=0.0, metavar="MS")
+    parser.add_argument("--fake-failure-rate", type=float, default=0.0)
+    args, _ = parser.parse_known_args(argv)
+    if args.fake_firestore is None:
+        return None
+    delegates = DemoDataGenerator.generate_demo_delegates(args.fake_firestore, seed=BENCHMARK_SEED)
+    attendance = DemoDataGenerator.generate_demo_attendance(delegates.keys(), seed=BENCHMARK_SEED)
+    return FakeFirestore.with_data({collection_name: delegates, "attendance": attendance},
+                                   latency=args.fake_latency / 1000, failure_rate=args.fake_failure_rate)
+
+def use_fake_firestore(client):
+    global db
+    db = MeteredClient(client)
+
+# Check-in Station Mode
+def hub_client_from_args(argv):
+    """A HubClient when argv asks for --hub HOST[:PORT], otherwise None"""
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--hub", metavar="HOST[:PORT]")
+    parser.add_argument("--hub-token")
+    args, _ = parser.parse_known_args(argv)
+    if args.hub is None:
+        return None
+    return HubClient(args.hub, token=args.hub_token)
+
+def use_sync_hub(client):
+    global hub
+    hub = client
+
+# Benchmark Suite
+BENCHMARK_SIZES = (1000, 10000, 50000)
+BENCHMARK_SEED = 2025
+BENCHMARK_OP_LIMIT_S = 30.0        # ops slower than this at one size are skipped at larger sizes
+BENCHMARK_REGRESSION_RATIO = 1.25  # slower than baseline by this factor counts as a regression
+
+def benchmark_operations(window, delegates, attendance, work_dir, latency=0.0):
+    """(name, callable) pairs for one dataset; each callable runs one measured iteration"""
+    config = window.config_manager.get_config()
+    table_columns = config.get("table_columns", [])
+    store_holder = {}
+
+    def load():
+        window.all_loaded_data = dict(delegates)
+        window.attendance_data = dict(attendance)
+        window.data_version += 1
+        store_holder["store"] = window.get_columnar_store()
+
+    def export():
+        store = store_holder["store"]
+        prepare_table_export(store, table_columns)
+        header = [col.get("display", "") for col in table_columns]
+        StreamingExportThread(os.path.join(work_dir, "export.csv"), header,
+                              iter_table_export_rows(store, table_columns), len(store)).run()
+
+    # Firestore paths run against an in-memory client, so they measure the app's side plus latency
+    client = FakeFirestore.with_data({"registrations": delegates, "attendance": attendance}, latency=latency)
+
+    def save_batching():
+        collection_ref = client.collection("registrations")
+        operations = [("update", collection_ref.document(doc_id), {"finalCommittee": data.get("finalCommittee", "")})
+                      for doc_id, data in delegates.items()]
+        commit_batched_writes(client, operations)
+
+    return [
+        ("firestore load", lambda: load_conference_data(client, "registrations")),
+        ("firestore paging", lambda: sum(1 for _ in iter_firestore_export_records(client, "registrations"))),
+        ("load", load),
+        ("search", lambda: store_holder["store"].match_rows("name", lambda text: "sharma" in text)),
+        ("filter", lambda: store_holder["store"].match_rows("finalCommittee", lambda text: text == "unhrc")),
+        ("analytics", lambda: compute_analytics(store_holder["store"], attendance)),
+        ("export", export),
+        ("save batching", save_batching),
+        ("render table", window.populate_table),
+        ("render delegate cards", lambda: window.user_view.update_users(window.all_loaded_data)),
+        ("render attendance cards", lambda: window.attendance_view.update_attendance_data(
+            window.all_loaded_data, window.attendance_data)),
+    ]
+
+def run_benchmark_suite(sizes=BENCHMARK_SIZES, repeat=3, op_limit=BENCHMARK_OP_LIMIT_S, latency=0.0, progress=None):
+    """Time the hot paths on seeded synthetic data under offscreen Qt; returns a JSON-able report"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    logging_level = logging.getLogger().level
+    logging.getLogger().setLevel(logging.WARNING)  # per-row info logs would dominate the timings
+    window = MainWindow(ConfigManager())
+    too_slow = {}  # op -> (size, seconds) that exceeded op_limit
+    report = {
+        "app": "MatterID - Manager v2.5",
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "numpy": np is not None,
+        "seed": BENCHMARK_SEED,
+        "firestore_latency_ms": latency * 1000,
+        "created": datetime.now().isoformat(),
+        "sizes": {},
+    }
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            for size in sizes:
+                delegates = DemoDataGenerator.generate_demo_delegates(size, seed=BENCHMARK_SEED)
+                attendance = DemoDataGenerator.generate_demo_attendance(delegates.keys(), seed=BENCHMARK_SEED)
+                results = report["sizes"][str(size)] = {}
+                for name, operation in benchmark_operations(window, delegates, attendance, work_dir, latency):
+                    if name in too_slow:
+                        results[name] = {"skipped": f"over {op_limit:.0f} s at {too_slow[name][0]} rows"}
+                        continue
+                    timings = []
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        operation()
+                        app.processEvents()
+                        timings.append(time.perf_counter() - start)
+                        if timings[-1] > op_limit / 4:
+                            break  # slow enough that one sample is representative
+                    timings.sort()
+                    results[name] = {"median_ms": round(timings[len(timings) // 2] * 1000, 3),
+                                     "min_ms": round(timings[0] * 1000, 3), "runs": len(timings)}
+                    if timings[0] > op_limit:
+                        too_slow[name] = (size, timings[0])
+                    if progress:
+                        progress(size, name, results[name])
+    finally:
+        logging.getLogger().setLevel(logging_level)
+        window.analytics_view.shutdown()
+        window.deleteLater()
+    return report
+
+def compare_benchmark_reports(report, baseline, ratio=BENCHMARK_REGRESSION_RATIO):
+    """[(size, op, baseline_ms, current_ms, regressed)] for ops measured in both reports"""
+    rows = []
+    for size, results in report["sizes"].items():
+        for name, current in results.items():
+            previous = baseline.get("sizes", {}).get(size, {}).get(name, {})
+            if "median_ms" in current and "median_ms" in previous:
+                rows.append((size, name, previous["median_ms"], current["median_ms"],
+                             current["median_ms"] > previous["median_ms"] * ratio))
+    return rows
+
+# Headless Commands
+STARTUP_APP_IMPORT = (
+    "import importlib.util\n"
+    "sys.path.insert(0, {directory!r})\n"
+    "spec = importlib.util.spec_from_file_location('matterid_app', {path!r})\n"
+    "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+)
+# The first two time the same app module; only the eager SDK import of the previous startup differs
+STARTUP_BENCHMARK_SCENARIOS = (
+    ("app import, eager SDK (previous startup)",
+     "import firebase_admin\nfrom firebase_admin import credentials, firestore, auth\n" + STARTUP_APP_IMPORT),
+    ("app import, lazy SDK",
+     STARTUP_APP_IMPORT + "assert 'firebase_admin' not in sys.modules, 'firebase_admin was imported eagerly'\n"),
+    ("headless core import (no Qt widgets)",
+     "sys.path.insert(0, {directory!r})\n"
+     "import matterid_core\n"
+     "assert 'PyQt6.QtWidgets' not in sys.modules, 'the core imported Qt widgets'\n"),
+)
+
+def run_startup_benchmark(runs=5):
+    """Median import time of each scenario, each run in a fresh interpreter"""
+    path = os.path.abspath(__file__)
+    results = []
+    for name, code in STARTUP_BENCHMARK_SCENARIOS:
+        script = ("import sys, time\nstart = time.perf_counter()\n"
+                  + code.format(path=path, directory=os.path.dirname(path))
+                  + "print(time.perf_counter() - start)\n")
+        timings = []
+        for _ in range(runs):
+            output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+            timings.append(float(output.stdout.strip().splitlines()[-1]))
+        timings.sort()
+        results.append((name, timings[len(timings) // 2]))
+    return results
+
+def add_startup_benchmark_arguments(parser):
+    parser.add_argument("--runs", type=int, default=5)
+
+def run_startup_benchmark_command(args):
+    for name, seconds in run_startup_benchmark(args.runs):
+        print(f"{name:<40} {seconds * 1000:8.1f} ms (median of {args.runs})")
+    return 0
+
+def add_benchmark_arguments(parser):
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(BENCHMARK_SIZES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--op-limit", type=float, default=BENCHMARK_OP_LIMIT_S,
+                        help="Skip an operation at larger sizes once it takes longer than this many seconds")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulated Firestore round trip in milliseconds")
+    parser.add_argument("-o", "--output", help="Write the report as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="Flag regressions against an earlier report")
+
+def run_benchmark_command(args):
+    def show(size, name, result):
+        timing = f"{result['median_ms']:10.1f} ms" if "median_ms" in result else f"  skipped: {result['skipped']}"
+        print(f"{size:>7} rows  {name:<24}{timing}", flush=True)
+
+    report = run_benchmark_suite(args.sizes, args.repeat, args.op_limit, args.latency / 1000, progress=show)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            comparison = compare_benchmark_reports(report, json.load(baseline_file))
+        for size, name, before, after, regressed in comparison:
+            print(f"{size:>7} rows  {name:<24}{before:10.1f} → {after:10.1f} ms"
+                  f"  {after / before if before else 0:5.2f}x{'  REGRESSION' if regressed else ''}")
+        return 1 if any(row[-1] for row in comparison) else 0
+    return 0
+
+# Commands that need the widgets; everything else runs from matterid_core without Qt
+GUI_CLI_COMMANDS = (
+    ("startup-benchmark", "Time the app module import with and without the eager Firebase SDK import",
+     add_startup_benchmark_arguments, run_startup_benchmark_command),
+    ("benchmark", "Time load, render, search, filter, analytics, export and save batching on synthetic data",
+     add_benchmark_arguments, run_benchmark_command),
+)
 
 # Main Execution
 def main():
-    global LOGIN_TOKEN
+    if set(sys.argv[1:]) & (set(CLI_COMMANDS) | {name for name, *_ in GUI_CLI_COMMANDS}):
+        sys.exit(run_cli(sys.argv[1:], GUI_CLI_COMMANDS))
 
+    startup_timer = StartupTimer()
     app = QApplication(sys.argv)
     logging.info("MatterID - Manager v2.5 application starting…")
 
     config_manager = ConfigManager()
-
-    # Show MatterID splash screen
-    show_matterid_splash_screen(app)
-
-    download_splash = DownloadSplashScreen(config_manager)
-    if download_splash.exec() != QDialog.DialogCode.Accepted:
-        logging.warning("Key download failed. Continuing in demo mode.")
+    collection_name = config_manager.get_config().get("collection_name", "registrations")
+    if config_manager.get_config().get("log_file"):
+        enable_log_file(config_manager.get_config()["log_file"])
+
+    # --fake-firestore runs every data path against seeded in-memory data, without keys or login
+    fake_client = fake_firestore_from_args(sys.argv[1:], collection_name)
+    # --hub makes this a check-in station: data and attendance go through the hub, no keys or login
+    hub_client = hub_client_from_args(sys.argv[1:])
+    if fake_client is not None:
+        use_fake_firestore(fake_client)
+        logging.info("Using the in-memory Firestore; nothing is read from or written to Firebase.")
+    elif hub_client is not None:
+        use_sync_hub(hub_client)
+        logging.info(f"Check-in station of the sync hub at {hub_client.url}.")
+    else:
+        # The splash stays up only while the keys download and Firebase initialises
+        splash = show_matterid_splash_screen(app)
+        with startup_timer.phase("key download and Firebase init"):
+            download_splash = DownloadSplashScreen(config_manager)
+            keys_accepted = download_splash.exec() == QDialog.DialogCode.Accepted
+        splash.close()
+        if not keys_accepted:
+            logging.warning("Key download failed. Continuing in demo mode.")
 
     # Skip login for demo mode, otherwise show login
+    prefetch = None
     if db is not None:
-        login_dialog = WebLoginDialog()
-        result = login_dialog.exec()
-        if result != QDialog.DialogCode.Accepted or LOGIN_TOKEN is None:
+        # Load the conference data while the user completes the browser login
+        prefetch = DataPrefetchThread(db.for_feature("Data load"), collection_name, startup_timer)
+        prefetch.start()
+
+    if db is not None and fake_client is None:
+        # Tokens are verified locally against cached signing certificates
+        token_verifier = CachedTokenVerifier(firebase_admin.get_app('auth').project_id)
+        token_verifier.warm_up()
+
+        login_start = time.perf_counter()
+        login_token = run_login_dialog(config_manager)
+        if login_token is None:
             logging.warning("Login failed or canceled. Continuing in demo mode.")
-            LOGIN_TOKEN = "demo_token"
+            login_token = "demo_token"
+        startup_timer.record("login", time.perf_counter() - login_start)
 
         # Verify token if we have one and database connection
-        if LOGIN_TOKEN != "demo_token":
+        verify_start = time.perf_counter()
+        if login_token != "demo_token":
             max_retries = 1
             decoded = None
 
             while max_retries >= 0:
                 try:
-                    # Use the auth app for token verification
-                    decoded = auth.verify_id_token(
-                        LOGIN_TOKEN,
-                        app=firebase_admin.get_app('auth')
-                    )
+                    decoded = token_verifier.verify(login_token)
                     break
 
-                except ExpiredIdTokenError:
+                except auth.ExpiredIdTokenError:
                     if max_retries > 0:
                         QMessageBox.information(
                             None, "Session Expired",
                             "Your login token has expired. Click OK to log in again."
                         )
                         max_retries -= 1
-                        LOGIN_TOKEN = None
-                        login_dialog = WebLoginDialog()
-                        ret = login_dialog.exec()
-                        if ret != QDialog.DialogCode.Accepted or LOGIN_TOKEN is None:
+                        login_token = run_login_dialog(config_manager)
+                        if login_token is None:
                             logging.warning("Re‐login failed or was cancelled. Continuing in demo mode.")
-                            LOGIN_TOKEN = "demo_token"
+                            login_token = "demo_token"
                             break
                         continue
                     else:
                         QMessageBox.warning(None, "Auth Error", "Your login has expired. Continuing in demo mode.")
-                        LOGIN_TOKEN = "demo_token"
+                        login_token = "demo_token"
                         break
 
-                except InvalidIdTokenError as invalid_err:
+                except auth.InvalidIdTokenError as invalid_err:
                     logging.error(f"Invalid ID token: {invalid_err}")
                     QMessageBox.warning(None, "Auth Error", "Invalid ID token detected. Continuing in demo mode.")
-                    LOGIN_TOKEN = "demo_token"
+                    login_token = "demo_token"
                     break
 
                 except Exception as e:
                     logging.error(f"Token verification failed: {e}")
                     QMessageBox.warning(None, "Auth Error", "An error occurred verifying your token. Continuing in demo mode.")
-                    LOGIN_TOKEN = "demo_token"
+                    login_token = "demo_token"
                     break
 
-            if LOGIN_TOKEN != "demo_token" and decoded:
+            if login_token != "demo_token" and decoded:
                 uid = decoded.get("uid")
                 if uid:
                     logging.info(f"User {uid} successfully authenticated.")
                 else:
                     logging.warning("Could not extract UID from token. Continuing in demo mode.")
+        startup_timer.record("token verification", time.perf_counter() - verify_start)
 
     try:
-        window = MainWindow(config_manager)
+        with startup_timer.phase("main window and data load"):
+            window = MainWindow(config_manager, prefetch)
 
         # MatterID Color Scheme Stylesheet
         stylesheet = f"""
@@ -3199,6 +4412,7 @@ def main():
         app.setStyleSheet(stylesheet)
 
         window.show()
+        QTimer.singleShot(0, startup_timer.log_summary)
         exit_code = app.exec()
         logging.info(f"MatterID - Manager v2.5 application exiting with code {exit_code}.")
         sys.exit(exit_code)
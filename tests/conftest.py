@@ -0,0 +1,85 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def console_log_stream():
+    """The log listener outlives pytest's captured stdout; its exit-time summary needs a real stream"""
+    yield
+    if "matterid_core" in sys.modules:
+        sys.modules["matterid_core"]._console_handler.setStream(sys.__stdout__)
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """The desktop app module; its file name is not importable as is"""
+    pytest.importorskip("PyQt6.QtWidgets")
+    spec = importlib.util.spec_from_file_location("matterid_app", os.path.join(ROOT, "matterv2.5-Stable.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["matterid_app"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def qapp(app_module):
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def config_manager(app_module):
+    """A ConfigManager that never touches the user's saved settings"""
+    import matterid_core
+    manager = app_module.ConfigManager()
+    manager.settings = matterid_core._MemorySettings()
+    return manager
+
+
+@pytest.fixture
+def dialogs(app_module, monkeypatch):
+    """Answers every QMessageBox without blocking; records (kind, title) per dialog"""
+    shown = []
+    box = app_module.QMessageBox
+
+    def record(kind, answer=None):
+        def show(parent, title, text, *args, **kwargs):
+            shown.append((kind, title))
+            return answer
+        return show
+
+    monkeypatch.setattr(box, "information", record("information"))
+    monkeypatch.setattr(box, "warning", record("warning"))
+    monkeypatch.setattr(box, "critical", record("critical"))
+    monkeypatch.setattr(box, "question", record("question", box.StandardButton.Yes))
+    return shown
+
+
+@pytest.fixture
+def slot_errors(monkeypatch):
+    """Exceptions raised in Qt slots; PyQt6 aborts the process on them unless sys.excepthook is replaced"""
+    errors = []
+    monkeypatch.setattr(sys, "excepthook", lambda kind, value, tb: errors.append(value))
+    return errors
+
+
+@pytest.fixture
+def fake_window(app_module, qapp, config_manager, dialogs, monkeypatch):
+    """MainWindow over a seeded in-memory Firestore"""
+    import matterid_core
+    delegates = matterid_core.DemoDataGenerator.generate_demo_delegates(12, seed=7)
+    attendance = matterid_core.DemoDataGenerator.generate_demo_attendance(delegates.keys(), seed=7)
+    client = matterid_core.FakeFirestore.with_data({"registrations": delegates, "attendance": attendance})
+    monkeypatch.setattr(app_module, "db", matterid_core.MeteredClient(client))
+    window = app_module.MainWindow(config_manager)
+    window.fake_client = client
+    yield window
+    window.unsaved_changes.clear()
+    window.close()
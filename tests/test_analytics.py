@@ -0,0 +1,14 @@
+from matterid_core import ATTENDANCE_DAYS, ColumnarStore, compute_analytics
+
+
+def test_empty_attendance_counts_as_absent_every_day():
+    registrations = {"a": {"finalCommittee": "UNSC"}, "b": {"school": "DPS"}, "c": None}
+    attendance = {"a": {ATTENDANCE_DAYS[0]: True}, "b": {}, "c": None}
+
+    result = compute_analytics(ColumnarStore(registrations), attendance)
+
+    assert result.total_registrations == 3
+    absent = "A" * len(ATTENDANCE_DAYS)
+    present_first = "P" + "A" * (len(ATTENDANCE_DAYS) - 1)
+    assert dict(result.pattern_counts) == {absent: 2, present_first: 1}
+    assert dict(result.day_stats)[ATTENDANCE_DAYS[0]] == 1
@@ -0,0 +1,34 @@
+import json
+
+import matterid_core
+
+
+def seeded_client():
+    return matterid_core.FakeFirestore.with_data({
+        "registrations_2026": {"d1": {"name": "Ada"}},
+        "registrations": {"old": {"name": "Old"}},
+        "attendance": {"d1": {"day1": True}},
+    })
+
+
+def test_backup_defaults_to_the_configured_collection(tmp_path, monkeypatch):
+    monkeypatch.setattr(matterid_core.ConfigManager, "get_config",
+                        lambda self: {"collection_name": "registrations_2026"})
+    path = str(tmp_path / "backup.ndjson.gz")
+
+    counts = matterid_core.write_backup(seeded_client(), path)
+
+    assert counts == {"registrations_2026": 1, "attendance": 1}
+    assert [record[:2] for record in matterid_core.iter_backup_records(path)] == [
+        ("registrations_2026", "d1"), ("attendance", "d1")]
+
+
+def test_restore_past_a_stale_checkpoint_reports_nothing_restored(tmp_path):
+    client = seeded_client()
+    path = str(tmp_path / "backup.ndjson.gz")
+    matterid_core.write_backup(client, path, ["registrations_2026"])
+    state_path = path + ".restore-state.json"
+    with open(state_path, "w", encoding="utf-8") as state_file:
+        json.dump({"committed": 10}, state_file)
+
+    assert matterid_core.restore_backup(client, path, state_path=state_path) == 0
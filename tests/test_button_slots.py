@@ -0,0 +1,60 @@
+"""Buttons wired to decorated slots must survive a click.
+
+PERF.traced, FIRESTORE_METER.feature and LOG_RATE_LIMITER.batch wrap methods in
+*args wrappers, so a direct clicked.connect passes the checked flag through and
+PyQt6 aborts the process on the resulting TypeError.
+"""
+
+
+def test_save_all_changes_button(fake_window, slot_errors, dialogs):
+    fake_window.tab_widget.setCurrentWidget(fake_window.spreadsheet_tab)
+    doc_id = fake_window.table.item(0, 0).text()
+    fake_window.table.item(0, 1).setText("Renamed Delegate")  # column 1 is "First Name"
+    assert doc_id in fake_window.unsaved_changes
+
+    fake_window.save_all_button.click()
+
+    assert slot_errors == []
+    assert ("information", "Save All Complete") in dialogs
+    stored = fake_window.fake_client.collection("registrations").document(doc_id).get().to_dict()
+    assert stored["name"] == "Renamed Delegate"
+
+
+def test_save_all_attendance_button(fake_window, slot_errors, dialogs):
+    fake_window.tab_widget.setCurrentWidget(fake_window.attendance_view)
+    fake_window.attendance_view.save_attendance_btn.click()
+    assert slot_errors == []
+    assert ("information", "Success") in dialogs
+
+
+def test_test_database_button(fake_window, slot_errors, dialogs):
+    fake_window.attendance_view.test_db_btn.click()
+    assert slot_errors == []
+    assert ("information", "Database Connection Test") in dialogs
+
+
+def test_delete_selected_button(fake_window, slot_errors):
+    fake_window.tab_widget.setCurrentWidget(fake_window.spreadsheet_tab)
+    doc_id = fake_window.table.item(0, 0).text()
+    fake_window.table.selectRow(0)
+    assert fake_window.delete_button.isEnabled()
+
+    fake_window.delete_button.click()
+
+    assert slot_errors == []
+    assert not fake_window.fake_client.collection("registrations").document(doc_id).get().exists
+    assert doc_id not in fake_window.all_loaded_data
+
+
+def test_save_all_changes_logs_one_batch_summary(fake_window, slot_errors, caplog):
+    fake_window.tab_widget.setCurrentWidget(fake_window.spreadsheet_tab)
+    for row in range(3):
+        fake_window.table.item(row, 1).setText(f"Renamed {row}")
+
+    with caplog.at_level("INFO"):
+        fake_window.save_all_button.click()
+
+    assert slot_errors == []
+    assert not fake_window.unsaved_changes
+    summaries = [record for record in caplog.records if record.getMessage().startswith("Save all rows:")]
+    assert len(summaries) == 1
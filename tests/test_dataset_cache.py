@@ -0,0 +1,25 @@
+import os
+import stat
+
+import matterid_core
+
+
+def test_saved_datasets_are_readable_by_this_user_only(tmp_path):
+    directory = tmp_path / "datasets"
+    directory.mkdir(mode=0o755)
+    cache = matterid_core.DatasetCache(capacity=1, directory=str(directory))
+    dataset = matterid_core.cached_dataset("https://example.com/key", "registrations",
+                                           {"d1": {"name": "Ada", "email": "ada@example.com"}}, {"d1": {"day1": True}})
+
+    old_umask = os.umask(0o022)
+    try:
+        cache.save(dataset)
+    finally:
+        os.umask(old_umask)
+
+    path = cache.path(dataset.key_url, dataset.collection_name)
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    loaded = cache.load(dataset.key_url, dataset.collection_name)
+    assert loaded.registrations == dataset.registrations
+    assert loaded.attendance == dataset.attendance
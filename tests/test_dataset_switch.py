@@ -0,0 +1,55 @@
+def test_cancelled_switch_keeps_saving_to_the_loaded_collection(fake_window, dialogs, monkeypatch, app_module):
+    monkeypatch.setattr(app_module.QMessageBox, "question", lambda *args, **kwargs: app_module.QMessageBox.StandardButton.No)
+    fake_window.tab_widget.setCurrentWidget(fake_window.spreadsheet_tab)
+    assert fake_window.dataset_key is not None
+    doc_id = fake_window.table.item(0, 0).text()
+    fake_window.table.item(0, 1).setText("Kept Delegate")
+
+    config = fake_window.config_manager.get_config()
+    config["collection_name"] = "registrations_2027"
+    fake_window.config_manager.save_config(config)
+    fake_window.on_config_changed()
+
+    assert fake_window.config_manager.get_config()["collection_name"] == "registrations"
+    assert fake_window.config_tab.collection_edit.text() == "registrations"
+    assert doc_id in fake_window.unsaved_changes
+
+    fake_window.save_all_button.click()
+
+    client = fake_window.fake_client
+    assert client.collection("registrations").document(doc_id).get().to_dict()["name"] == "Kept Delegate"
+    assert not client.collection("registrations_2027").document(doc_id).get().exists
+
+
+def test_cancelled_reload_keeps_the_loaded_dataset(fake_window, monkeypatch, app_module):
+    monkeypatch.setattr(app_module.QMessageBox, "question", lambda *args, **kwargs: app_module.QMessageBox.StandardButton.No)
+    loaded_key, loaded_data, version = fake_window.dataset_key, fake_window.all_loaded_data, fake_window.data_version
+    fake_window.unsaved_changes.add(next(iter(loaded_data)))
+
+    config = fake_window.config_manager.get_config()
+    config["collection_name"] = "registrations_2027"
+    fake_window.config_manager.save_config(config)
+    fake_window.load_data(reload_all=True)
+
+    assert fake_window.dataset_key == loaded_key
+    assert fake_window.all_loaded_data is loaded_data
+    assert fake_window.data_version == version
+    assert (loaded_key[0], "registrations_2027") not in fake_window.dataset_cache.entries
+    assert fake_window.config_manager.get_config()["collection_name"] == "registrations"
+
+
+def test_fixed_config_after_a_failed_load_loads_again(fake_window, dialogs, monkeypatch, app_module):
+    def unreachable(client, collection_name):
+        raise ConnectionError("unreachable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(app_module, "load_conference_data", unreachable)
+        fake_window.load_data(reload_all=True)
+    assert fake_window.demo_mode and fake_window.dataset_key is None
+
+    fake_window.on_config_changed()
+
+    assert not fake_window.demo_mode
+    assert fake_window.dataset_key is not None
+    stored = {doc.id for doc in fake_window.fake_client.collection("registrations").stream()}
+    assert set(fake_window.all_loaded_data) == stored
@@ -0,0 +1,44 @@
+def test_resolution_deletes_duplicates_with_their_attendance(fake_window, dialogs):
+    keep, duplicate = list(fake_window.all_loaded_data)[:2]
+    client = fake_window.fake_client
+    assert client.collection("attendance").document(duplicate).get().exists
+
+    fake_window.apply_duplicate_resolution({keep: {"phone": "9876543210"}}, [duplicate])
+
+    assert dialogs == []
+    assert client.collection("registrations").document(keep).get().to_dict()["phone"] == "9876543210"
+    assert not client.collection("registrations").document(duplicate).get().exists
+    assert not client.collection("attendance").document(duplicate).get().exists
+    assert duplicate not in fake_window.attendance_data
+
+
+def test_resolution_larger_than_one_batch_is_refused(fake_window, dialogs, app_module):
+    doc_ids = list(fake_window.all_loaded_data)
+    updates = {doc_id: {"note": "x"} for doc_id in doc_ids}
+    deletes = [f"missing-{i}" for i in range(app_module.FIRESTORE_BATCH_LIMIT // 2)]
+
+    fake_window.apply_duplicate_resolution(updates, deletes)
+
+    assert dialogs == [("warning", "Duplicate Resolution Too Large")]
+    stored = fake_window.fake_client.collection("registrations").document(doc_ids[0]).get().to_dict()
+    assert "note" not in stored
+    assert set(doc_ids) <= set(fake_window.all_loaded_data)
+
+
+def test_merge_carries_the_duplicates_check_ins_to_the_kept_record(fake_window, dialogs):
+    keep, duplicate = list(fake_window.all_loaded_data)[:2]
+    client = fake_window.fake_client
+    attendance_ref = client.collection("attendance")
+    attendance_ref.document(keep).set({"day1": False, "day2": False, "day3": True})
+    attendance_ref.document(duplicate).set({"day1": True, "day2": False, "day3": False})
+    fake_window.attendance_data[keep] = {"day1": False, "day2": False, "day3": True}
+    fake_window.attendance_data[duplicate] = {"day1": True, "day2": False, "day3": False}
+
+    fake_window.apply_duplicate_resolution({}, [duplicate], {keep: [duplicate]})
+
+    assert dialogs == []
+    stored = attendance_ref.document(keep).get().to_dict()
+    assert (stored["day1"], stored["day2"], stored["day3"]) == (True, False, True)
+    assert not attendance_ref.document(duplicate).get().exists
+    assert fake_window.attendance_data[keep]["day1"] is True
+    assert duplicate not in fake_window.attendance_data
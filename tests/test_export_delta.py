@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+
+from matterid_core import (
+    CHANGE_ADDED, CHANGE_CHANGED, compute_export_delta, FakeFirestore, fetch_export_delta_source, ids_updated_at
+)
+
+T0 = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+
+
+def export(client, state):
+    candidates, current_ids = fetch_export_delta_source(client, "registrations", state)
+    changes, watermark = compute_export_delta(candidates, current_ids, state)
+    next_state = {"watermark": watermark, "ids": current_ids, "boundary_ids": ids_updated_at(candidates, watermark)}
+    return [(change, doc_id) for change, doc_id, _ in changes], next_state
+
+
+def test_rows_sharing_the_watermark_timestamp_are_exported_once():
+    client = FakeFirestore.with_data({"registrations": {"a": {"name": "A", "updatedAt": T0}}})
+    changes, state = export(client, None)
+    assert changes == [(CHANGE_ADDED, "a")]
+
+    # Written after the export, but stamped with the same server time
+    client.collection("registrations").document("b").set({"name": "B", "updatedAt": T0})
+    client.collection("registrations").document("c").set({"name": "C", "updatedAt": T0})
+    state["ids"] |= {"b"}  # pretend b was exported earlier, so only its timestamp decides
+    changes, state = export(client, state)
+    assert sorted(changes) == [(CHANGE_ADDED, "c"), (CHANGE_CHANGED, "b")]
+    assert state["boundary_ids"] == {"a", "b", "c"}
+
+    changes, state = export(client, state)
+    assert changes == []
+
+    client.collection("registrations").document("a").set({"name": "A3", "updatedAt": T0 + timedelta(seconds=1)})
+    changes, _ = export(client, state)
+    assert changes == [(CHANGE_CHANGED, "a")]
@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+
+def service_account(project_id):
+    rsa = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.rsa")
+    from cryptography.hazmat.primitives import serialization
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                            serialization.NoEncryption()).decode()
+    return {"type": "service_account", "project_id": project_id, "private_key_id": "test", "private_key": pem,
+            "client_email": f"test@{project_id}.iam.gserviceaccount.com", "client_id": "1",
+            "token_uri": "https://oauth2.googleapis.com/token"}
+
+
+def test_rejected_cached_key_is_downloaded_again(app_module, qapp, config_manager, dialogs, monkeypatch, tmp_path):
+    import matterid_core
+    monkeypatch.setenv("HOME", str(tmp_path))
+    key_url = config_manager.get_config().get("key_url", "https://api.eliomatters.com/sangammun.json")
+    stale = {"type": "service_account", "project_id": "stale"}  # no private key: Firebase rejects it
+    matterid_core.save_cached_json(key_url, stale, {})
+    matterid_core.save_cached_json("https://api.eliomatters.com/eliomatter.json", stale, {})
+
+    fresh = service_account("fresh-project")
+    downloads = []
+    monkeypatch.setattr(app_module, "fetch_json", lambda url, **kwargs: downloads.append(url) or fresh)
+    monkeypatch.setattr(app_module, "revalidate_cached_json", lambda urls: None)
+    monkeypatch.setattr(app_module, "db", None)
+
+    splash = app_module.DownloadSplashScreen(config_manager)
+    try:
+        deadline = time.monotonic() + 10
+        while splash.result() != app_module.QDialog.DialogCode.Accepted and time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.01)
+
+        assert splash.result() == app_module.QDialog.DialogCode.Accepted
+        assert key_url in downloads
+        assert dialogs == []
+        assert app_module.db is not None
+        assert sorted(splash.firebase_app_names) == ["[DEFAULT]", "auth"]
+        assert matterid_core.load_cached_json(key_url) is None  # fetched without revalidating the stale copy
+    finally:
+        splash.thread.wait()
+        for name in splash.firebase_app_names:
+            app_module.firebase_admin.delete_app(app_module.firebase_admin.get_app(name))
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+from conftest import ROOT
+
+FAKE_MODE_SCRIPT = """
+import sys
+from datetime import datetime, timezone
+import matterid_core as core
+
+client = core.MeteredClient(core.FakeFirestore.with_data({"registrations": {"a": {"name": "A"}}}))
+core.write_attendance(client, "a", "day1", True)
+core.bulk_set_attendance(client, "day2", True, ["a"])
+core.commit_import_chunk(client, "registrations", [(2, {}, "b", {"name": "B", "email": "b@example.com"})])
+state = {"watermark": datetime(2020, 1, 1, tzinfo=timezone.utc), "ids": {"a"}, "boundary_ids": set()}
+candidates, _ = core.fetch_export_delta_source(client, "registrations", state)
+assert set(candidates) == {"b"}, candidates
+assert isinstance(client.collection("attendance").document("a").get().to_dict()["updatedAt"], datetime)
+encoded = core.encode_backup_value({"a": {"name": "A", "tags": [1, 2.5, None], "at": datetime(2020, 1, 1), "raw": b"x"}})
+assert encoded["a"]["at"] == {"__type__": "timestamp", "value": "2020-01-01T00:00:00"}, encoded
+assert "firebase_admin" not in sys.modules, "fake mode imported the Firebase SDK"
+"""
+
+
+def test_fake_mode_writes_and_queries_without_the_sdk():
+    result = subprocess.run([sys.executable, "-c", FAKE_MODE_SCRIPT], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
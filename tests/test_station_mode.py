@@ -0,0 +1,50 @@
+import pytest
+
+import matterid_core
+
+
+@pytest.fixture
+def station_window(app_module, qapp, config_manager, dialogs, monkeypatch):
+    """MainWindow of a check-in station whose hub serves seeded in-memory data"""
+    delegates = matterid_core.DemoDataGenerator.generate_demo_delegates(6, seed=5)
+    client = matterid_core.FakeFirestore.with_data({"registrations": delegates})
+    sync_hub = matterid_core.SyncHub(matterid_core.MeteredClient(client), "registrations", flush_interval=60)
+    sync_hub.load()
+    _, port = sync_hub.serve("127.0.0.1", 0)
+    station = matterid_core.HubClient(f"127.0.0.1:{port}")
+    monkeypatch.setattr(app_module, "hub", station)
+    monkeypatch.setattr(app_module, "db", None)
+    window = app_module.MainWindow(config_manager)
+    window.sync_hub = sync_hub
+    yield window
+    window.close()
+    station.close()
+    sync_hub.stop()
+
+
+def test_station_registrations_are_read_only(station_window, dialogs, app_module):
+    window = station_window
+    assert window.is_station()
+    assert window.table.editTriggers() == app_module.QAbstractItemView.EditTrigger.NoEditTriggers
+    assert not window.save_all_button.isEnabled()
+    assert not window.import_button.isEnabled()
+    assert not window.duplicates_button.isEnabled()
+    window.tab_widget.setCurrentWidget(window.spreadsheet_tab)
+    window.table.selectRow(0)
+    assert not window.delete_button.isEnabled()
+
+
+def test_station_refuses_local_only_changes(station_window, dialogs):
+    window = station_window
+    window.tab_widget.setCurrentWidget(window.spreadsheet_tab)
+    doc_id = window.table.item(0, 0).text()
+    other_id = window.table.item(1, 0).text()
+
+    window.table.selectRow(0)
+    window.delete_selected_documents()
+    window.apply_duplicate_resolution({doc_id: {"phone": "1"}}, [other_id])
+    window.edit_user(doc_id)
+
+    assert dialogs == [("information", "Check-in Station")] * 3
+    assert doc_id in window.all_loaded_data and other_id in window.all_loaded_data
+    assert window.all_loaded_data[doc_id].get("phone") != "1"
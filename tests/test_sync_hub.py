@@ -0,0 +1,79 @@
+import http.client
+import logging
+
+import pytest
+
+from matterid_core import (DemoDataGenerator, FakeFirestore, HUB_MAX_BODY_BYTES, HubClient, HubError, MeteredClient,
+                           SyncHub)
+
+
+@pytest.fixture
+def make_hub():
+    hubs = []
+
+    def make(host, token=None):
+        delegates = DemoDataGenerator.generate_demo_delegates(5, seed=3)
+        client = MeteredClient(FakeFirestore.with_data({"registrations": delegates}))
+        hub = SyncHub(client, "registrations", flush_interval=60, token=token)
+        hub.load()
+        _, port = hub.serve(host, 0)
+        hubs.append(hub)
+        return hub, port, sorted(delegates)
+
+    yield make
+    for hub in hubs:
+        hub.stop()
+
+
+def test_hub_on_the_network_requires_a_generated_token(make_hub):
+    hub, port, _ = make_hub("0.0.0.0")
+    assert hub.token
+
+    with pytest.raises(HubError, match="403"):
+        HubClient(f"127.0.0.1:{port}").load_conference_data()
+    collection, registrations, _ = HubClient(f"127.0.0.1:{port}", token=hub.token).load_conference_data()
+    assert collection == "registrations" and len(registrations) == 5
+
+
+def test_loopback_hub_needs_no_token(make_hub):
+    hub, port, _ = make_hub("127.0.0.1")
+    assert hub.token is None
+    assert HubClient(f"127.0.0.1:{port}").status()["delegates"] == 5
+
+
+def test_check_ins_for_unknown_delegates_are_rejected(make_hub):
+    hub, port, doc_ids = make_hub("127.0.0.1")
+    station = HubClient(f"127.0.0.1:{port}")
+
+    with pytest.raises(HubError, match="400"):
+        station.write_attendance("not-a-delegate", "day1", True)
+    assert station.write_attendance(doc_ids[0], "day1", True) == 1
+    assert set(hub.pending) == {doc_ids[0]}
+
+
+def test_check_ins_for_delegates_registered_after_load_are_accepted(make_hub):
+    hub, port, _ = make_hub("127.0.0.1")
+    hub.client.collection("registrations").document("late-delegate").set({"name": "Late"})
+    station = HubClient(f"127.0.0.1:{port}")
+
+    assert station.write_attendance("late-delegate", "day1", True) == 1
+    assert "late-delegate" in station.load_conference_data()[1]
+
+
+def test_oversized_posts_are_refused_unread(make_hub):
+    _, port, _ = make_hub("127.0.0.1")
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    connection.putrequest("POST", "/attendance")
+    connection.putheader("Content-Length", str(HUB_MAX_BODY_BYTES + 1))
+    connection.endheaders()
+
+    response = connection.getresponse()
+    assert response.status == 413
+    assert response.getheader("Connection") == "close"
+    connection.close()
+
+
+def test_network_hub_warns_that_it_serves_plain_http(make_hub, caplog):
+    with caplog.at_level(logging.WARNING):
+        make_hub("0.0.0.0")
+    assert any("plain HTTP" in record.getMessage() for record in caplog.records)
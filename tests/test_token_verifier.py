@@ -0,0 +1,144 @@
+"""CachedTokenVerifier against locally signed tokens and a local certificate endpoint"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+jwt = pytest.importorskip("jwt")
+pytest.importorskip("cryptography")
+pytest.importorskip("firebase_admin")
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+import matterid_core
+from matterid_core import auth, CachedTokenVerifier
+
+PROJECT_ID = "matterid-test"
+
+
+class SigningKey:
+    def __init__(self, kid):
+        self.kid = kid
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, kid)])
+        now = datetime.now(timezone.utc)
+        cert = (x509.CertificateBuilder().subject_name(name).issuer_name(name)
+                .public_key(self.private_key.public_key()).serial_number(x509.random_serial_number())
+                .not_valid_before(now - timedelta(days=1)).not_valid_after(now + timedelta(days=1))
+                .sign(self.private_key, hashes.SHA256()))
+        self.cert_pem = cert.public_bytes(serialization.Encoding.PEM).decode()
+
+    def sign(self, **overrides):
+        now = int(time.time())
+        claims = {"iss": f"https://securetoken.google.com/{PROJECT_ID}", "aud": PROJECT_ID, "sub": "user-1",
+                  "iat": now - 10, "exp": now + 3600, "auth_time": now - 10}
+        claims.update(overrides)
+        return jwt.encode(claims, self.private_key, algorithm="RS256", headers={"kid": self.kid})
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return SigningKey("key-1"), SigningKey("key-2")
+
+
+@pytest.fixture
+def cert_server(monkeypatch, tmp_path):
+    """Serves {kid: cert} with Cache-Control like Google's endpoint; the key cache lives under tmp_path"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    server_state = {"certs": {}, "max_age": 3600, "requests": 0, "down": False}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            server_state["requests"] += 1
+            if server_state["down"]:
+                self.send_response(503)
+                self.end_headers()
+                return
+            body = json.dumps(server_state["certs"]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", f"public, max-age={server_state['max_age']}")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server_state["url"] = f"http://127.0.0.1:{server.server_address[1]}/certs"
+    yield server_state
+    server.shutdown()
+    server.server_close()
+
+
+def verifier_for(cert_server, certs, **kwargs):
+    cert_server["certs"] = {key.kid: key.cert_pem for key in certs}
+    return CachedTokenVerifier(PROJECT_ID, cert_url=cert_server["url"], **kwargs)
+
+
+def test_valid_token_uses_cached_certificates(cert_server, keys):
+    verifier = verifier_for(cert_server, keys[:1])
+    assert verifier.verify(keys[0].sign())["uid"] == "user-1"
+    assert verifier.verify(keys[0].sign(sub="user-2"))["uid"] == "user-2"
+    assert cert_server["requests"] == 1  # the second token is checked against the cached copy
+
+
+def test_expired_token(cert_server, keys):
+    verifier = verifier_for(cert_server, keys[:1])
+    with pytest.raises(auth.ExpiredIdTokenError):
+        verifier.verify(keys[0].sign(exp=int(time.time()) - 60))
+
+
+def test_wrong_audience(cert_server, keys):
+    verifier = verifier_for(cert_server, keys[:1])
+    with pytest.raises(auth.InvalidIdTokenError):
+        verifier.verify(keys[0].sign(aud="another-project"))
+
+
+def test_wrong_issuer(cert_server, keys):
+    verifier = verifier_for(cert_server, keys[:1])
+    with pytest.raises(auth.InvalidIdTokenError, match="issuer"):
+        verifier.verify(keys[0].sign(iss="https://securetoken.google.com/another-project"))
+
+
+def test_rotated_key_refreshes_cached_certificates(cert_server, keys):
+    old_key, new_key = keys
+    verifier = verifier_for(cert_server, [old_key])
+    verifier.verify(old_key.sign())
+
+    cert_server["certs"] = {key.kid: key.cert_pem for key in (old_key, new_key)}
+    assert verifier.verify(new_key.sign())["uid"] == "user-1"
+    assert cert_server["requests"] == 2
+
+
+def test_token_from_unknown_key_is_rejected(cert_server, keys):
+    verifier = verifier_for(cert_server, keys[:1])
+    with pytest.raises(auth.InvalidIdTokenError):
+        verifier.verify(keys[1].sign())
+
+
+def test_expired_certificates_are_not_used_by_default(cert_server, keys):
+    cert_server["max_age"] = 0
+    verifier = verifier_for(cert_server, keys[:1])
+    verifier.verify(keys[0].sign())
+
+    cert_server["down"] = True
+    with pytest.raises(auth.InvalidIdTokenError):
+        verifier.verify(keys[0].sign())
+
+    lenient = CachedTokenVerifier(PROJECT_ID, cert_url=cert_server["url"], stale_grace=timedelta(hours=1))
+    assert lenient.verify(keys[0].sign())["uid"] == "user-1"
+
+
+def test_cache_expiry_follows_cache_control(cert_server, keys):
+    verifier = verifier_for(cert_server, keys[:1])
+    verifier.verify(keys[0].sign())
+    expires = datetime.fromisoformat(matterid_core.load_cached_json(cert_server["url"])["expires"])
+    assert timedelta(minutes=59) < expires - datetime.now(timezone.utc) <= timedelta(hours=1)
@@ -0,0 +1,88 @@
+"""The web login against a fake auth page, with the configured login port already taken"""
+import socket
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+
+@pytest.fixture
+def busy_port():
+    blocker = socket.socket()
+    blocker.bind(("127.0.0.1", 0))
+    blocker.listen()
+    yield blocker.getsockname()[1]
+    blocker.close()
+
+
+@pytest.fixture
+def auth_page():
+    """Redirects to redirect_uri with a token, or to the given fixed URL when honor_redirect is false"""
+    page = {"honor_redirect": True, "fixed_redirect": None}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            params = parse_qs(urlparse(self.path).query)
+            target = params["redirect_uri"][0] if page["honor_redirect"] else page["fixed_redirect"]
+            self.send_response(302)
+            self.send_header("Location", f"{target}?token=fake-id-token")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    page["url"] = f"http://127.0.0.1:{server.server_address[1]}/auth.html"
+    yield page
+    server.shutdown()
+    server.server_close()
+
+
+def browser(url):
+    """Follows the auth page's redirect the way a browser tab would, without blocking the GUI thread"""
+    def visit():
+        try:
+            urllib.request.urlopen(url, timeout=2).read()
+        except OSError:
+            pass
+    threading.Thread(target=visit, daemon=True).start()
+
+
+def wait_for_result(qapp, dialog, seconds=5):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        qapp.processEvents()
+        if dialog.result() == dialog.DialogCode.Accepted or dialog.login_btn.isEnabled():
+            return
+        time.sleep(0.01)
+
+
+def test_login_on_fallback_port(app_module, qapp, dialogs, auth_page, busy_port):
+    dialog = app_module.WebLoginDialog(login_url=auth_page["url"], port=busy_port, open_browser=browser)
+    dialog.start_web_login()
+    assert dialog.server.port != busy_port
+
+    wait_for_result(qapp, dialog)
+
+    assert dialog.result() == app_module.QDialog.DialogCode.Accepted
+    assert dialog.token == "fake-id-token"
+    assert dialogs == []
+
+
+def test_login_times_out_when_redirect_uri_is_ignored(app_module, qapp, dialogs, auth_page, busy_port):
+    auth_page["honor_redirect"] = False
+    auth_page["fixed_redirect"] = f"http://127.0.0.1:{busy_port}/callback"
+    dialog = app_module.WebLoginDialog(login_url=auth_page["url"], port=busy_port, open_browser=browser,
+                                       timeout_ms=300)
+    dialog.start_web_login()
+
+    wait_for_result(qapp, dialog)
+
+    assert dialog.result() != app_module.QDialog.DialogCode.Accepted
+    assert dialog.token is None
+    assert dialogs == [("critical", "Login Timed Out")]
+    assert dialog.server is None and dialog.login_btn.isEnabled()